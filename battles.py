@@ -0,0 +1,211 @@
+"""
+Headless battles for balancing GUN_STATS
+
+Battles are simulated without a display: GameObjects are headless (no images are loaded, rotated or blitted) and
+step_world is called with a fixed dt as fast as the CPU allows. A battle is a dict of run_battle's keyword arguments,
+so it can be pickled to worker processes and written out next to its result. The same battle always plays out the
+same way, in any process, as long as its physics backend is the same (see physics.py).
+
+Battles fight with the game's GUN_STATS and fleets. Its guns reload once a minute (FIRERATE is in seconds), so few
+battles end within the default 10 minutes, and nothing slows ships down, so at full thrust they mostly fly past each
+other. Faster reloads and gentler thrust are explicit overrides:
+
+    python battles.py --battles 200 --ships 5 --workers 8
+    python battles.py --ships 5,3 --gun-stat FIGHTER_GUN_MK1.DAMAGE=40     # Can 3 stronger guns beat 5?
+    python battles.py --gun-stat FIGHTER_GUN_MK1.FIRERATE=0.5 --thrust 0.001
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+# SDL traps SIGINT and SIGTERM once pygame is initialized, workers have to stay killable by the pool (and Ctrl+C)
+os.environ.setdefault("SDL_NO_SIGNAL_HANDLERS", "1")
+
+from gameplay import GameObject
+from gameplay import reset_world
+from gameplay import step_world
+from typing import Dict, Iterable, Iterator, List
+
+# Fleet defaults, fleets given to run_battle only need to name what differs
+FLEET = {
+    "count": 5,
+    "gun": "FIGHTER_GUN_MK1",
+    "stats": (100, 1, (10, 60)),    # Health, mass, turn
+    "thrust": 0.05,
+    "target_types": [],
+}
+
+
+def spawn_fleet(team, fleet: Dict, arena, rng: random.Random, teams) -> List[GameObject]:
+
+    # Each team starts spread over its own vertical band of the arena
+    band = arena[0] / teams
+    ships = []
+    for _ in range(fleet["count"]):
+        ship = GameObject(
+            team,
+            GameObject.ACTIVE,
+            GameObject.FIGHTER,
+            target_types=list(fleet["target_types"]),
+            stats=fleet["stats"],
+            sprite_path="fighter_sprite_turretless.png",
+            sprite_size=(None, 30),
+            turrets=[[(0.5, 0.5), fleet["gun"], False, 0, 60, True]],
+            thrusters=[[(0.5, 1), fleet["thrust"], False]]
+        )
+        ship.rel_pos = (0, rng.uniform(band * team, band * (team + 1)), 0, rng.uniform(0, arena[1]))
+        ship.rot = rng.uniform(-180, 180)
+        ships.append(ship)
+
+    return ships
+
+
+def run_battle(fleets=(FLEET, FLEET), seed=0, dt=1000/60, max_time=600000, arena=(1200, 750), gun_stats=None,
+               physics=False) -> Dict:
+    """
+    Fights fleets (one per team, dicts overriding FLEET) until one team is left or max_time milliseconds passed.
+    gun_stats overrides GUN_STATS for this battle only, as {gun: {stat: value}}
+    """
+
+    rng = random.Random(seed)
+    default_gun_stats = GameObject.GUN_STATS
+    headless = GameObject.headless
+
+    GameObject.headless = True
+    if gun_stats:
+        GameObject.GUN_STATS = {gun: dict(default_gun_stats.get(gun, {}), **gun_stats.get(gun, {}))
+                                for gun in set(default_gun_stats) | set(gun_stats)}
+    if physics:
+        import physics as physics_module
+        physics_module.enable()
+
+    try:
+        reset_world()
+        ships = [spawn_fleet(team, dict(FLEET, **fleet), arena, rng, len(fleets)) for team, fleet in enumerate(fleets)]
+
+        started = time.perf_counter()
+        steps = 0
+        teams_left = len(fleets)
+        while teams_left > 1 and steps * dt < max_time:
+            step_world(dt)
+            steps += 1
+            teams_left = len({game_object.team for game_object in GameObject.GAME_OBJECTS})
+        wall_time = time.perf_counter() - started
+
+        if physics:
+            GameObject.physics_world.sync()
+
+        survivors = [[ship for ship in team_ships if ship.alive()] for team_ships in ships]
+        winners = [team for team, alive in enumerate(survivors) if alive]
+
+        return {
+            "seed": seed,
+            "winner": winners[0] if len(winners) == 1 else None,   # None = draw, no team wiped out the others in time
+            "time_ms": steps * dt,
+            "steps": steps,
+            "wall_s": wall_time,
+            "teams": [{
+                "survivors": len(alive),
+                "health": sum(ship.health for ship in alive),
+                "shots": sum(ship.shots_fired for ship in team_ships),
+                "damage": sum(ship.damage_dealt for ship in team_ships),
+            } for team_ships, alive in zip(ships, survivors)],
+        }
+
+    finally:
+        reset_world()
+        if physics:
+            physics_module.disable()
+        GameObject.GUN_STATS = default_gun_stats
+        GameObject.headless = headless
+
+
+def run_battle_config(config: Dict) -> Dict:
+
+    return run_battle(**config)
+
+
+def run_battles(configs: Iterable, workers=None, ordered=True, run=run_battle_config) -> Iterator:
+    """
+    Runs battles given as run_battle keyword arguments across a pool of worker processes (os.cpu_count() by default),
+    yielding results as they finish, in the order of configs if ordered. workers=1 runs them in this process.
+    run is called with each config in the workers, a module level function wrapping run_battle (e.g. sweep.py's)
+    """
+
+    if workers == 1:
+        yield from map(run, configs)
+        return
+
+    # Workers are spawned rather than forked, so they start from a clean pygame state on every platform
+    with multiprocessing.get_context("spawn").Pool(workers) as pool:
+        results = pool.imap if ordered else pool.imap_unordered
+        yield from results(run, configs)
+
+
+def summarize(results: List[Dict], teams) -> Dict:
+
+    battles = len(results)
+    return {
+        "battles": battles,
+        "win_rate": [sum(result["winner"] == team for result in results) / battles for team in range(teams)],
+        "draw_rate": sum(result["winner"] is None for result in results) / battles,
+        "mean_time_ms": sum(result["time_ms"] for result in results) / battles,
+        "mean_survivors": [sum(result["teams"][team]["survivors"] for result in results) / battles
+                           for team in range(teams)],
+        "simulated_per_wall_second": sum(result["time_ms"] / 1000 for result in results)
+                                     / max(sum(result["wall_s"] for result in results), 1e-9),
+    }
+
+
+def parse_gun_stats(assignments: List[str]) -> Dict[str, Dict[str, float]]:
+    """GUN.STAT=VALUE assignments as run_battle's gun_stats"""
+
+    gun_stats = {}
+    for assignment in assignments:
+        name, value = assignment.split("=", 1)
+        gun, stat = name.rsplit(".", 1)
+        gun_stats.setdefault(gun, {})[stat] = float(value)
+    return gun_stats
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--battles", type=int, default=100)
+    parser.add_argument("--ships", default="5,5", help="Comma separated ship count of each team")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first battle, the rest count up from it")
+    parser.add_argument("--dt", type=float, default=1000 / 60, help="Milliseconds per simulation step")
+    parser.add_argument("--max-time", type=float, default=600, help="Simulated seconds before a battle is a draw")
+    parser.add_argument("--gun-stat", action="append", default=[], metavar="GUN.STAT=VALUE",
+                        help="Override a GUN_STATS entry for every battle, may be repeated")
+    parser.add_argument("--thrust", type=float, default=None, help="Thrust of every ship (default: FLEET's)")
+    parser.add_argument("--physics", action="store_true", help="Integrate ships with the vectorized PhysicsWorld")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--results", action="store_true", help="Print every battle's result, not just the summary")
+    args = parser.parse_args()
+
+    fleets = [{"count": int(count)} for count in args.ships.split(",")]
+    if args.thrust is not None:
+        for fleet in fleets:
+            fleet["thrust"] = args.thrust
+    gun_stats = parse_gun_stats(args.gun_stat)
+    configs = [{"fleets": fleets, "seed": args.seed + i, "dt": args.dt, "max_time": args.max_time * 1000,
+                "gun_stats": gun_stats, "physics": args.physics} for i in range(args.battles)]
+
+    results = []
+    for result in run_battles(configs, args.workers):
+        results.append(result)
+        if args.results:
+            print(json.dumps(result))
+
+    json.dump(summarize(results, len(fleets)), sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+"""Headless benchmarks, run from the repository root with python -m bench (the suite) or python -m bench.<module>"""
+
+import os
+import pygame
+
+
+def init_headless(size=(1200, 750)):
+    """Opens a display on SDL's dummy video driver so surfaces can be converted without a window"""
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    return pygame.display.set_mode(size)
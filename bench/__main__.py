@@ -0,0 +1,177 @@
+"""
+Headless benchmark suite: runs parameterized scenarios for a fixed number of frames and reports frame time
+percentiles, per-phase timings and allocations as JSON
+
+    python -m bench                                     # Every scenario at its default sizes
+    python -m bench ships sidebar --ships 50,200 --frames 300 --output baseline.json
+    python -m bench --baseline baseline.json            # Exits with 1 if a median frame time regressed
+
+Phases are those of pyoneer3.profiler: events (dispatch of scripted input), simulate (step_world / animations),
+layout and compose (Screen.render) and present (Screen.present). Allocations are counted in a second, untimed pass:
+surfaces replaced on elements each frame and the Python heap peak per frame (tracemalloc).
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from bench import init_headless
+
+display = init_headless()
+
+import pygame
+from bench.scenarios import SCENARIOS
+from pyoneer3.graphics import Screen, UIElement
+from pyoneer3.profiler import PHASES, Profiler
+
+DEFAULT_SIZES = {"ships": "50,200", "sidebar": "7,50", "animations": "100,1000"}
+
+
+def percentiles(samples):
+
+    ordered = sorted(samples)
+    pick = lambda p: ordered[min(int(p / 100 * len(ordered)), len(ordered) - 1)]
+    return {"mean": sum(ordered) / len(ordered), "p50": pick(50), "p90": pick(90), "p99": pick(99), "max": ordered[-1]}
+
+
+def run_frame(screen, scenario, frame, dt):
+
+    profiler = screen.profiler
+    profiler.begin_frame()
+    for event in scenario.events(frame):
+        screen.dispatcher.dispatch(event, tick=dt)
+    profiler.lap("events")
+    scenario.simulate(dt)
+    profiler.lap("simulate")
+    screen.render((0, 0, 0))
+    screen.present()
+    profiler.end_frame()
+
+
+def run(scenario, frames, warmup, allocation_frames, dt, dirty_rects, retained):
+
+    UIElement.retained = retained
+    screen = Screen(display, dirty_rects=dirty_rects)
+    screen.profiler = profiler = Profiler(capacity=frames)
+    scenario.build(screen)
+
+    frame = 0
+    for _ in range(warmup):
+        run_frame(screen, scenario, frame, dt)
+        frame += 1
+
+    profiler.frames.clear()
+    for _ in range(frames):
+        run_frame(screen, scenario, frame, dt)
+        frame += 1
+    timings = {"frame": [total for _, total, _ in profiler.frames]}
+    for i, phase in enumerate(PHASES):
+        timings[phase] = [times[i] for _, _, times in profiler.frames]
+
+    # Allocation pass, tracing slows frames down so it is kept apart from the timed frames (and is not profiled)
+    profiler.enabled = False
+    elements = [element for scene in screen.scenes for element in scene.iter_descendants()]
+    surfaces = 0
+    heap_peaks = []
+    tracemalloc.start()
+    for _ in range(allocation_frames):
+        before = [element.surf for element in elements]
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+
+        run_frame(screen, scenario, frame, dt)
+        frame += 1
+
+        heap_peaks.append((tracemalloc.get_traced_memory()[1] - current) / 1024)
+        surfaces += sum(element.surf is not surf for element, surf in zip(elements, before))
+    tracemalloc.stop()
+
+    scenario.teardown()
+    UIElement.retained = False
+
+    return {
+        "scenario": scenario.name,
+        "params": dict(scenario.params(), dirty_rects=dirty_rects, retained=retained),
+        "frames": frames,
+        "frame_ms": percentiles(timings["frame"]),
+        "phases_ms": {phase: percentiles(timings[phase]) for phase in PHASES},
+        "allocations": {
+            "surfaces_per_frame": surfaces / allocation_frames if allocation_frames else None,
+            "heap_peak_kb_per_frame": sum(heap_peaks) / allocation_frames if allocation_frames else None,
+        },
+    }
+
+
+def compare(results, baseline_path, tolerance):
+    """Regressions of median frame time against a previous report, matched by scenario and parameters"""
+
+    with open(baseline_path) as baseline_file:
+        baseline = {(r["scenario"], json.dumps(r["params"], sort_keys=True)): r
+                    for r in json.load(baseline_file)["results"]}
+
+    regressions = []
+    for result in results:
+        old = baseline.get((result["scenario"], json.dumps(result["params"], sort_keys=True)))
+        if old and result["frame_ms"]["p50"] > old["frame_ms"]["p50"] * (1 + tolerance):
+            regressions.append({"scenario": result["scenario"], "params": result["params"],
+                                "p50_ms": result["frame_ms"]["p50"], "baseline_p50_ms": old["frame_ms"]["p50"]})
+    return regressions
+
+
+def main():
+
+    parser = argparse.ArgumentParser(prog="python -m bench", description=__doc__.split("\n\n")[0])
+    parser.add_argument("scenarios", nargs="*", help="Scenarios to run: %s (all by default)" % ", ".join(SCENARIOS))
+    for name, sizes in DEFAULT_SIZES.items():
+        parser.add_argument("--" + name, default=sizes, help="Comma separated %s counts (default %s)" % (name, sizes))
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--allocation-frames", type=int, default=30)
+    parser.add_argument("--dt", type=float, default=1000 / 60, help="Milliseconds simulated per frame")
+    parser.add_argument("--full-redraw", action="store_true", help="Redraw the whole screen instead of dirty rects")
+    parser.add_argument("--retained", action="store_true", help="Use retained compositing")
+    parser.add_argument("--output", help="Write the report to this file instead of stdout")
+    parser.add_argument("--baseline", help="Report from an earlier run to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed median frame time increase (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error("unknown scenarios: %s" % ", ".join(unknown))
+
+    results = []
+    for name in args.scenarios or list(SCENARIOS):
+        for count in (int(size) for size in getattr(args, name).split(",")):
+            results.append(run(SCENARIOS[name](count), args.frames, args.warmup, args.allocation_frames, args.dt,
+                               not args.full_redraw, args.retained))
+            print("%-12s %6d  p50 %8.3f ms  p99 %8.3f ms" % (name, count, results[-1]["frame_ms"]["p50"],
+                                                             results[-1]["frame_ms"]["p99"]), file=sys.stderr)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+    regressions = compare(results, args.baseline, args.tolerance) if args.baseline else []
+    if args.baseline:
+        report["regressions"] = regressions
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
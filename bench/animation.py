@@ -0,0 +1,51 @@
+"""
+Cost of advancing many concurrent Translations per frame, per animation updates against the batched service
+
+    python -m bench.animation [frames]
+"""
+
+import random
+import sys
+import time
+from pyoneer3.animation import AnimationService, Translation
+from pyoneer3.interpolation import LinearInterpolator
+
+
+def populate(service, count, seed=0):
+
+    rng = random.Random(seed)
+    for _ in range(count):
+        start = [rng.uniform(0, 1000), rng.uniform(0, 1000)]
+        end = [rng.uniform(0, 1000), rng.uniform(0, 1000)]
+        translation = Translation(start, end, rng.uniform(500, 5000), LinearInterpolator(200), lambda: None)
+        translation.start()
+        service.add_animation(translation)
+
+
+def time_frames(service, frames, delta=1000/60):
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        service.update(delta)
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+
+    print("%8s %16s %16s %10s" % ("tweens", "scalar ms/frame", "batched ms/frame", "speedup"))
+    for count in (100, 1000, 10000):
+        scalar = AnimationService()
+        populate(scalar, count)
+        batched = AnimationService(batched=True)
+        populate(batched, count)
+
+        scalar_time = time_frames(scalar, frames)
+        batched_time = time_frames(batched, frames)
+        print("%8d %16.3f %16.3f %9.1fx" % (count, scalar_time * 1000, batched_time * 1000,
+                                             scalar_time / batched_time))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Projectile collision cost per simulation step, naive pairwise rect checks against the grid broad phase
+
+    python -m bench.collision [steps]
+
+Every projectile moves one step's worth of its flight (a short segment) and is tested against every ship's rect in the
+naive check, or against the ships in the grid cells it passes through. Both use the same mask narrow phase and have to
+agree on every hit.
+"""
+
+import math
+import random
+import sys
+import time
+from bench import init_headless
+
+init_headless((1, 1))
+
+import pygame
+from gameplay import GameObject
+from pyoneer3.collision import BroadPhase
+
+SHOT_STEP = 10      # Pixels a projectile moves per step (600 px/s at 60 steps per second)
+
+
+def spawn(count, seed=0):
+
+    GameObject.GAME_OBJECTS.empty()
+    rng = random.Random(seed)
+    world = 80 * count ** 0.5       # Keeps density constant across counts
+
+    ships = []
+    for i in range(count):
+        ship = GameObject(
+            i % 2,
+            GameObject.ACTIVE,
+            GameObject.FIGHTER,
+            target_types=[],
+            stats=(100, 1, (10, 60)),
+            sprite_path="fighter_sprite_turretless.png",
+            sprite_size=(None, 30)
+        )
+        ship.rel_pos = (0, rng.uniform(0, world), 0, rng.uniform(0, world))
+        ship.rot = rng.uniform(-180, 180)
+        ships.append(ship)
+    return ships, world
+
+
+def shots(count, world, seed=1):
+
+    rng = random.Random(seed)
+    segments = []
+    for i in range(count):
+        x, y, angle = rng.uniform(0, world), rng.uniform(0, world), rng.uniform(0, 2 * math.pi)
+        segments.append((i % 2, x, y, x + math.cos(angle) * SHOT_STEP, y + math.sin(angle) * SHOT_STEP))
+    return segments
+
+
+def bounds(left, top, right, bottom) -> pygame.Rect:
+
+    # Padded by a pixel, so rounding never drops a touching pair and segments along an axis still have an area
+    return pygame.Rect(math.floor(left) - 1, math.floor(top) - 1, math.ceil(right - left) + 3,
+                       math.ceil(bottom - top) + 3)
+
+
+def naive_hits(bodies, segments):
+
+    rects = [bounds(body.x - body.radius, body.y - body.radius, body.x + body.radius, body.y + body.radius)
+             for body in bodies]
+
+    hits = []
+    for team, x0, y0, x1, y1 in segments:
+        rect = bounds(min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1))
+        hit, hit_t = None, None
+        for body, body_rect in zip(bodies, rects):
+            if body.group != team and rect.colliderect(body_rect):
+                t = body.segment_entry(x0, y0, x1, y1)
+                if t is not None and (hit is None or t < hit_t):
+                    hit, hit_t = body, t
+        hits.append(hit and hit.item)
+    return hits
+
+
+def grid_hits(broad_phase, bodies, segments):
+
+    broad_phase.rebuild(bodies)
+    hits = []
+    for team, x0, y0, x1, y1 in segments:
+        hit, _ = broad_phase.first_hit(x0, y0, x1, y1, team)
+        hits.append(hit and hit.item)
+    return hits
+
+
+def time_steps(steps, check, *args):
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        hits = check(*args)
+    return (time.perf_counter() - start) / steps, hits
+
+
+def main():
+
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print("%8s %8s %16s %16s %10s %6s" % ("ships", "shots", "naive ms/step", "grid ms/step", "speedup", "hits"))
+    for ship_count, shot_count in ((50, 1000), (200, 5000), (500, 10000)):
+        ships, world = spawn(ship_count)
+        segments = shots(shot_count, world)
+
+        # Bodies (and their masks) are built once per step in both cases, so they are left out of the timings
+        bodies = [ship.collision_body() for ship in ships]
+
+        naive, expected = time_steps(steps, naive_hits, bodies, segments)
+        grid, hits = time_steps(steps, grid_hits, BroadPhase(), bodies, segments)
+        assert hits == expected
+
+        print("%8d %8d %16.2f %16.2f %9.1fx %6d" % (ship_count, shot_count, naive * 1000, grid * 1000, naive / grid,
+                                                     sum(hit is not None for hit in hits)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Surface allocations and frame time per frame with and without retained compositing
+
+    python -m bench.compositing [frames]
+"""
+
+import sys
+import time
+from bench import init_headless
+
+display = init_headless()
+
+import pygame
+from gameplay import GameObject
+from pyoneer3.graphics import Image, Scene, Screen, Text, UIElement
+
+
+def build_sidebar(screen, blocks):
+    """Deep static hierarchy shaped like the game.py sidebar: background -> block -> image/text"""
+
+    scene = Scene(screen, active=True)
+    font = pygame.font.Font(None, 24)
+
+    background = UIElement((0, 10, 0, 10), pygame.Surface((280, 100 * blocks + 20)))
+    background.set_parent(scene)
+    background.surf.fill((255, 255, 255))
+    background.update()
+
+    for i in range(blocks):
+        block = UIElement((0, 10, 0, 10 + 100 * i), pygame.Surface((260, 100)))
+        block.set_parent(background)
+        block.surf.fill((230, 230, 230))
+        block.update()
+
+        block_pic = Image((0, 10, 0, 10), "fighter_icon.png", size=(80, 80))
+        block_pic.set_parent(block)
+        block_pic.update()
+
+        block_text = Text((0, 100, 0, 4), (150, 20), "FIGHTER", (0, 0, 0), font, True, (255, 255, 255))
+        block_text.set_parent(block)
+        block_text.update()
+
+    return scene
+
+
+def build_fleet(screen, ships):
+    """Ships with turrets, stationary so only turret rotation changes their composite"""
+
+    scene = Scene(screen, active=True)
+
+    for i in range(ships):
+        ship = GameObject(
+            i % 2,
+            GameObject.ACTIVE,
+            GameObject.FIGHTER,
+            target_types=[],
+            stats=(100, 1, (10, 60)),
+            sprite_path="fighter_sprite_turretless.png",
+            sprite_size=(None, 40),
+            turrets=[[(0.5, 0.5), "FIGHTER_GUN_MK1", True, 0, 60, False]]    # Gimbal locked turrets
+        )
+        ship.set_parent(scene)
+        ship.rel_pos = (0, 40 * (i % 25), 0, 30 * (i // 25))
+        ship.update()
+
+    return scene
+
+
+def elements(scene):
+
+    return scene.get_descendants()
+
+
+def run(scene_builder, count, retained, frames):
+
+    UIElement.retained = retained
+    GameObject.GAME_OBJECTS.empty()
+
+    screen = Screen(display)
+    scene = scene_builder(screen, count)
+    screen.render((0, 0, 0))      # Warm up, first frame always composes everything
+
+    allocations = 0
+    start = time.perf_counter()
+    for _ in range(frames):
+        surfaces = {id(e): e.surf for e in elements(scene)}
+        screen.render((0, 0, 0))
+
+        # Every element whose surface object was replaced allocated a new surface this frame
+        allocations += sum(e.surf is not surfaces[id(e)] for e in elements(scene))
+    elapsed = time.perf_counter() - start
+
+    UIElement.retained = False
+    return allocations / frames, elapsed / frames * 1000
+
+
+def main():
+
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print("%-20s %10s %16s %12s" % ("scenario", "mode", "allocs/frame", "ms/frame"))
+    for name, builder, count in (("sidebar, 7 blocks", build_sidebar, 7),
+                                 ("fleet, 300 ships", build_fleet, 300)):
+        for retained in (False, True):
+            allocations, frame_time = run(builder, count, retained, frames)
+            print("%-20s %10s %16.1f %12.3f" % (name, "retained" if retained else "copy", allocations, frame_time))
+
+
+if __name__ == "__main__":
+    main()
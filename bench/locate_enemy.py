@@ -0,0 +1,76 @@
+"""
+Nearest enemy lookup cost per simulation step, linear scan against the spatial hash
+
+    python -m bench.locate_enemy [queries]
+
+The linear scan is O(n) per query, so at large unit counts only a sample of units is queried and the step cost is
+extrapolated from the mean query time.
+"""
+
+import random
+import sys
+import time
+from bench import init_headless
+
+init_headless((1, 1))
+
+from gameplay import GameObject, UnitIndex
+
+
+def spawn(count, seed=0):
+
+    GameObject.GAME_OBJECTS.empty()
+    rng = random.Random(seed)
+    world = 40 * count ** 0.5       # Keeps density constant across counts
+
+    units = []
+    for i in range(count):
+        unit = GameObject(
+            i % 2,
+            GameObject.ACTIVE,
+            GameObject.FIGHTER,
+            target_types=[],
+            stats=(100, 1, (10, 60)),
+            sprite_path="fighter_sprite_turretless.png",
+            sprite_size=(None, 8)
+        )
+        unit.rel_pos = (0, rng.uniform(0, world), 0, rng.uniform(0, world))
+        units.append(unit)
+    return units
+
+
+def time_queries(units, sample, locate):
+
+    start = time.perf_counter()
+    for unit in sample:
+        locate(unit)
+    return (time.perf_counter() - start) / len(sample)
+
+
+def main():
+
+    queries = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print("%8s %18s %18s %18s %10s" % ("units", "linear ms/step", "rebuild ms/step", "hash ms/step", "speedup"))
+    for count in (100, 1000, 10000):
+        units = spawn(count)
+        sample = random.Random(1).sample(units, min(queries, count))
+
+        linear = time_queries(units, sample, GameObject.locate_enemy_linear) * count
+
+        index = UnitIndex()
+        start = time.perf_counter()
+        index.rebuild(units)
+        rebuild = time.perf_counter() - start
+
+        hashed = rebuild + time_queries(units, sample, index.nearest_enemy) * count
+
+        # Both methods have to agree on the distance to the nearest enemy
+        for unit in sample:
+            assert abs(unit.locate_enemy_linear()[1] - index.nearest_enemy(unit)[1]) < 1e-6
+
+        print("%8d %18.2f %18.2f %18.2f %9.1fx" % (count, linear * 1000, rebuild * 1000, hashed * 1000, linear / hashed))
+
+
+if __name__ == "__main__":
+    main()
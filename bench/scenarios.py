@@ -0,0 +1,217 @@
+"""Parameterized scenes for the benchmark harness (python -m bench), built on an already initialized display"""
+
+import random
+import pygame
+from gameplay import GameObject
+from gameplay import reset_world
+from gameplay import set_render_alpha
+from gameplay import step_world
+from pyoneer3.animation import AnimationService
+from pyoneer3.animation import Tween
+from pyoneer3.fonts import FONTS
+from pyoneer3.graphics import Image, Option, Scene, Screen, ScrollingFrame, Text, UIElement
+from pyoneer3.graphics import clamp_color
+from pyoneer3.interpolation import QuadInterpolator
+
+
+def brighten(uie, event):
+
+    uie.surf.fill(clamp_color([c + 15 for c in uie.fill_color]))
+    uie.update()
+
+
+def restore(uie, event):
+
+    uie.surf.fill(uie.fill_color)
+    uie.update()
+
+
+class Scenario:
+    """A scene driven for a number of frames: scripted input events, a simulation step, then rendering"""
+
+    name = None
+
+    def __init__(self, count, seed=0):
+
+        self.count = count
+        self.rng = random.Random(seed)
+
+    def params(self):
+
+        return {"count": self.count}
+
+    def build(self, screen: Screen):
+
+        raise NotImplementedError()
+
+    def events(self, frame):
+
+        return []
+
+    def simulate(self, dt):
+        pass
+
+    def teardown(self):
+
+        # GameObjects, their index and timers are global
+        reset_world()
+
+
+class Ships(Scenario):
+    """count ships of two teams with automatic turrets, fighting through step_world"""
+
+    name = "ships"
+
+    def build(self, screen):
+
+        scene = Scene(screen, active=True)
+        width, height = screen.screen.get_size()
+
+        for i in range(self.count):
+            ship = GameObject(
+                i % 2,
+                GameObject.ACTIVE,
+                GameObject.FIGHTER,
+                target_types=[],
+                stats=(100, 1, (10, 60)),
+                sprite_path="fighter_sprite_turretless.png",
+                sprite_size=(None, 30),
+                turrets=[[(0.5, 0.5), "FIGHTER_GUN_MK1", False, 0, 60, True]],
+                thrusters=[[(0.5, 1), 0.05, False]]
+            )
+            ship.set_parent(scene)
+            ship.rel_pos = (0, self.rng.uniform(0, width), 0, self.rng.uniform(0, height))
+            ship.rot = self.rng.uniform(-180, 180)
+            ship.update()
+
+    def simulate(self, dt):
+
+        step_world(dt)
+        set_render_alpha(1)
+
+
+class Sidebar(Scenario):
+    """The game.py sidebar with count blocks in its scrolling frame, hovered and scrolled by scripted input"""
+
+    name = "sidebar"
+
+    def __init__(self, count, seed=0, depth=3):
+        super().__init__(count, seed)
+
+        self.depth = depth      # Extra frames nested between each block and its contents
+
+    def params(self):
+
+        return {"count": self.count, "depth": self.depth}
+
+    def build(self, screen):
+
+        scene = Scene(screen, active=True)
+        font = FONTS.get(None, 24)
+        height = screen.screen.get_height()
+
+        background = UIElement((0, 10, 0, 10), pygame.Surface((280, height - 20)))
+        background.set_parent(scene)
+        background.surf.fill((255, 255, 255))
+        background.update()
+
+        for i in range(4):
+            tab = Option((i * 0.25, 0, 0, 0), pygame.Surface((70, 40)), fill_color=(230, 230, 230))
+            tab.set_parent(background)
+            tab.surf.fill(tab.fill_color)
+            tab.bind_menter(brighten)
+            tab.bind_mexit(restore)
+            tab.update()
+
+            tab_img = Image((0.5, -12, 0, 7), "fighter_icon.png", size=(25, 25))
+            tab_img.set_parent(tab)
+            tab_img.update()
+
+        self.frame = ScrollingFrame((0, 0, 0, 40), (280, 100 * self.count + 20), (1, 0, 1, -40))
+        self.frame.set_parent(background)
+        self.frame.scroll_speed = 20
+        self.frame.update()
+
+        for i in range(self.count):
+            block = UIElement((0, 10, 0, 10 + 100 * i), pygame.Surface((260, 100)), fill_color=(230, 230, 230))
+            block.set_parent(self.frame)
+            block.surf.fill(block.fill_color)
+            block.bind_menter(brighten)
+            block.bind_mexit(restore)
+            block.update()
+
+            parent = block
+            for _ in range(self.depth):
+                nested = UIElement((0, 0, 0, 0), pygame.Surface((260, 100), pygame.SRCALPHA))
+                nested.set_parent(parent)
+                nested.update()
+                parent = nested
+
+            block_pic = Image((0, 10, 0, 10), "fighter_icon.png", size=(None, 80))
+            block_pic.set_parent(parent)
+            block_pic.update()
+
+            block_text = Text((0, 100, 0, 4), (150, 20), "FIGHTER %d" % i, (0, 0, 0), font, True, (255, 255, 255))
+            block_text.set_parent(parent)
+            block_text.update()
+
+    def events(self, frame):
+
+        # Sweep the mouse down across the tabs and blocks, scrolling every few frames
+        y = 20 + frame * 7 % 700
+        events = [pygame.event.Event(pygame.MOUSEMOTION, pos=(40 + frame % 4 * 70, y), rel=(0, 7), buttons=(0, 0, 0))]
+        if frame % 10 == 0:
+            button = 5 if frame // 100 % 2 == 0 else 4
+            events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(100, 300), button=button))
+        return events
+
+
+class Animations(Scenario):
+    """count images tweened back and forth across the screen, each with an offset and an alpha tween"""
+
+    name = "animations"
+
+    def __init__(self, count, seed=0, batched=True):
+        super().__init__(count, seed)
+
+        self.batched = batched
+        self.service = None
+
+    def params(self):
+
+        return {"count": self.count, "batched": self.batched}
+
+    def build(self, screen):
+
+        scene = Scene(screen, active=True)
+        width, height = screen.screen.get_size()
+        self.service = AnimationService(batched=self.batched)
+
+        for i in range(self.count):
+            image = Image((0, self.rng.uniform(0, width), 0, self.rng.uniform(0, height)), "fighter_icon.png",
+                          size=(20, 20))
+            image.set_parent(scene)
+            image.update()
+
+            end = (self.rng.uniform(0, width), self.rng.uniform(0, height))
+            duration = self.rng.uniform(500, 2000)
+            self.ping_pong(Tween(image, "offset", end, duration, QuadInterpolator(1)))
+            self.ping_pong(Tween(image, "alpha", 64, duration, QuadInterpolator(1)))
+
+    def ping_pong(self, tween):
+
+        # Restarting from the callback keeps the tween in its service
+        def bounce():
+            tween.reverse()
+            tween.start()
+
+        tween.callback = bounce
+        tween.start()
+        self.service.add_animation(tween)
+
+    def simulate(self, dt):
+
+        self.service.update(dt)
+
+
+SCENARIOS = {scenario.name: scenario for scenario in (Ships, Sidebar, Animations)}
@@ -1,13 +1,25 @@
+import math
 import pygame
+from pyoneer3.fonts import FONTS
 pygame.init()
 
 screen = pygame.display.set_mode((2000, 1000))
 
-fonts = sorted(pygame.font.get_fonts())
-font_objs = [(pygame.font.SysFont(f, 12), f) for f in fonts]
+fonts = FONTS.system_fonts()
+
+# Samples are laid out in columns of 40, fonts are only opened once their sample is first displayed
+text_surfs = {}
+text_rects = {}
+shown = range(min(len(fonts), math.ceil(screen.get_width() / 300) * 40))     # Fonts in columns that fit on screen
+
+
+def sample(i):
+
+    if i not in text_surfs:
+        text_surfs[i] = FONTS.get(fonts[i], 12).render("FIGHTER | " + fonts[i][:10], True, (255, 255, 255))
+        text_rects[i] = text_surfs[i].get_rect(topleft=(int(i / 40) * 300, i * 25 % 1000))
+    return text_surfs[i], text_rects[i]
 
-text_surfs = [font_obj[0].render("FIGHTER | " + font_obj[1][:10], True, (255, 255, 255)) for font_obj in font_objs]
-text_rects = [text_surf.get_rect(topleft=(int(i / 40) * 300, i * 25 % 1000)) for i, text_surf in enumerate(text_surfs)]
 
 text = "fighter"
 
@@ -26,11 +38,11 @@ while run:
         elif e.type == pygame.MOUSEBUTTONDOWN:
             if e.button == 1:
                 if not focused:
-                    for i, r in enumerate(text_rects):
+                    for i, r in text_rects.items():
                         if r.collidepoint(e.pos):
                             focused = True
                             selected_font = fonts[i]
-                            f_surf = pygame.font.SysFont(selected_font, 96).render("FIGHTER | " + selected_font, True, (255, 255, 255))
+                            f_surf = FONTS.get(selected_font, 96).render("FIGHTER | " + selected_font, True, (255, 255, 255))
                             break
                 else:
                     focused = False
@@ -46,8 +58,8 @@ while run:
     screen.fill((0, 0, 0))
 
     if not focused:
-        for i, font_obj in enumerate(font_objs):
-            screen.blit(text_surfs[i], text_rects[i])
+        for i in shown:
+            screen.blit(*sample(i))
     else:
         screen.blit(f_surf, (screen.get_width()/2-f_surf.get_width()/2,screen.get_height()/2- f_surf.get_height()/2))
 
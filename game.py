@@ -1,6 +1,8 @@
 import pygame
 from pyoneer3.animation import AnimationService
 from pyoneer3.animation import Translation
+from pyoneer3.assets import ASSETS
+from pyoneer3.fonts import FONTS
 from pyoneer3.interpolation import LinearInterpolator
 from pyoneer3.graphics import Option
 from pyoneer3.graphics import Screen
@@ -10,14 +12,19 @@ from pyoneer3.graphics import Text
 from pyoneer3.graphics import UIElement
 from pyoneer3.graphics import Image
 from pyoneer3.graphics import clamp_color
-from gameplay import GameObject
+from gameplay import set_render_alpha
+from gameplay import step_world
+from pyoneer3.simulation import FixedTimestep
+from pyoneer3.profiler import Profiler
+from pyoneer3.profiler import ProfilerOverlay
+from pyoneer3.trace import TRACER
 from typing import Dict, List, Tuple
 
 
 def render():
 
     screen.render(BLACK)
-    pygame.display.flip()
+    screen.present()
 
 
 def mainloop():
@@ -25,20 +32,31 @@ def mainloop():
 
     while running:
         tick = CLOCK.tick(FPS_CAP)
+        profiler.begin_frame()
 
         for e in pygame.event.get():
             if e.type == pygame.QUIT:
                 running = False
 
-            # Have all of the event listeners in the currently active scene(s) handle their respective events
+            # F3 toggles the frame time graph, F4 saves the profiled frames
+            elif e.type == pygame.KEYDOWN and e.key == pygame.K_F3:
+                profiler_overlay.active = not profiler_overlay.active
+            elif e.type == pygame.KEYDOWN and e.key == pygame.K_F4:
+                profiler.export(PROFILE_PATH)
+
+            # Have the event listeners under the mouse (and universal listeners) handle their respective events
             else:
-                for scene in screen.scenes:                             # For each scene
-                        for c in scene.get_descendants():               # For each element in scene
-                            if any(c.handlers.values()):                # If element has any active bound listeners
-                                c.handle_event(e, tick=tick)                       # Handle event
-                            if isinstance(c, GameObject):
-                                c.tick(tick)
+                screen.dispatcher.dispatch(e, tick=tick)
+        profiler.lap("events")
+
+        # Simulate in fixed steps independent of input, drawing ships between their last two steps
+        simulation.advance(tick)
+        set_render_alpha(simulation.alpha)
+        profiler.lap("simulate")
+        profiler_overlay.refresh()
+
         render()
+        profiler.end_frame()
 
 
 def text_menter(brightness=15):
@@ -142,16 +160,22 @@ if __name__ == "__main__":
     GREEN      = (0,   255, 0)
     BLUE       = (0,   0,   255)
 
-    DIGITALL_86P = pygame.font.Font("Digitall.ttf", 86)
-    DIGITALL_36P = pygame.font.Font("Digitall.ttf", 36)
-    SIMPLE_36P = pygame.font.SysFont("twcencondensedextrafranklingothicdemi", 24)
+    DIGITALL_86P = FONTS.get("Digitall.ttf", 86)
+    DIGITALL_36P = FONTS.get("Digitall.ttf", 36)
+    SIMPLE_36P = FONTS.get("twcencondensedextrafranklingothicdemi", 24)
 
     CLOCK = pygame.time.Clock()
     FPS_CAP = 90
 
+    simulation = FixedTimestep(step_world, dt=1000/60, max_steps=5)
+
     # Graphics and TODO: Animations
     s = pygame.display.set_mode((1200, 750))
-    screen = Screen(s)
+    screen = Screen(s, dirty_rects=True)
+
+    # Load every image once up front, elements share the loaded surfaces
+    ASSETS.preload([(path, (25, 25)) for path in ["turret00.png", "bolt00.png", "fighter.png", "brick.png"]]
+                   + [("fighter_icon.png", (None, 80))])
 
     # Start scene
     start_scene = Scene(screen, active=True)
@@ -207,9 +231,8 @@ if __name__ == "__main__":
         tab.bind_mbd(tab_mbd)
         tab.update()
 
-        tab_img = Image((0.5, -12, 0, 7), tab_rsrc[i])
+        tab_img = Image((0.5, -12, 0, 7), tab_rsrc[i], size=(25, 25))
         tab_img.set_parent(tab)
-        tab_img.surf = pygame.transform.smoothscale(tab_img.surf, (25, 25))
         tab_img.update()
 
         tab_sf = ScrollingFrame((0, 0, 0, 40), (280, 800), (1, 0, 1, -40), scroll_fill=(235, 235, 245))
@@ -231,10 +254,9 @@ if __name__ == "__main__":
             block.surf.fill(LG_00)
             block.update()
 
-            block_pic = Image((0, 10, 0, 10), selections[0])
+            block_pic = Image((0, 10, 0, 10), selections[0], size=(None, 80))
             block_pic.set_parent(block)
-            pic_width = int((block_pic.surf.get_width() / block_pic.surf.get_height()) * 80)
-            block_pic.surf = pygame.transform.smoothscale(block_pic.surf, (pic_width, 80))
+            pic_width = block_pic.surf.get_width()
             block_pic.update()
 
             block_text = Text((0, pic_width+20, 0, 4), (260-pic_width-25, 20), selections[1], (0, 0, 0), SIMPLE_36P, True, WHITE)       # TODO CHANGE instead of selections[1] do selections[1].name or something
@@ -246,5 +268,17 @@ if __name__ == "__main__":
 
     select_tab(tabs[0])
 
+    # Frame profiling, the overlay is created last so it is drawn above every other scene
+    PROFILE_PATH = "profile.json"
+    profiler = Profiler()
+    screen.profiler = profiler
+    profiler_overlay = ProfilerOverlay(screen, profiler)
+
     running = True
-    mainloop()
+    try:
+        mainloop()
+
+    # Leave the latest traced records behind for a post-mortem
+    except Exception:
+        TRACER.dump()
+        raise
@@ -10,34 +10,166 @@ BASIC FIGHTER
 import math
 import pygame
 from pyoneer3 import vmath
+from pyoneer3.assets import ASSETS
+from pyoneer3.assets import XYResize
 from pyoneer3.graphics import XYSimple, XYComplex
 from pyoneer3.graphics import Sprite
+from pyoneer3.cache import LRUCache
+from pyoneer3.cache import ROTATION_CACHE
+from pyoneer3.cache import surface_bytes
+from pyoneer3.collision import MASKS
+from pyoneer3.collision import Body
+from pyoneer3.collision import BroadPhase
+from pyoneer3.pool import POOLS
+from pyoneer3.pool import Pool
 from pyoneer3.graphics import extract_offsets
-from typing import Callable, List, Tuple, Union
+from pyoneer3.spatial import PointHash
+from pyoneer3.timers import SCHEDULER
+from pyoneer3.timers import Scheduler
+from pyoneer3.timers import TimerHandle
+from pyoneer3.trace import DEBUG
+from pyoneer3.trace import TRACER
+from typing import Dict, Iterable, List, Tuple, Union
 
 
 pygame.init()
 
-XYResize = Tuple[Union[int, None], Union[int, None]]   # Used to store resize target sizes, None = keep aspect ratio
 XYRatio = Tuple[float, float]       # Tuple with numbers always between 0 and 1 (xScale, yScale)
 
+# Trace channels, enable with TRACER.set_level("gameplay", DEBUG) and TRACER.echo()
+CONTROLS = TRACER.channel("gameplay.controls")
+WEAPONS = TRACER.channel("gameplay.weapons")
 
-def resize(surf: pygame.Surface, size: XYResize):
-    aspect_ratio = surf.get_width() / surf.get_height()
-    target_size = list(size)
+# Hulls with their turrets drawn on, by (hull, turrets' images, positions and quantized rotations). Ships that look the
+# same share a composite, and so its rotated frames in ROTATION_CACHE
+TURRET_COMPOSITES = LRUCache(16 * 2**20, surface_bytes)
 
-    if size[0] is None and size[1] is None:
-        return surf
 
-    # Keep aspect ratio, resize width
-    if size[0] is None:
-        target_size[0] = int(size[1] * aspect_ratio)
+class UnitIndex:
+    """
+    Spatial hashes of GameObjects per (team, unit_type), rebuilt from their positions once per simulation step. The
+    index is only current while step_world ticks, GameObjects ticked on their own scan for enemies linearly instead
+    """
 
-    # Keep aspect ratio, resize height
-    elif size[1] is None:
-        target_size[1] = int(size[0] / aspect_ratio)
+    def __init__(self, cell_size=128):
 
-    return pygame.transform.smoothscale(surf, target_size)
+        self.cell_size = cell_size
+        self.hashes: Dict[Tuple[int, int], PointHash] = {}
+        self.current = False            # Set by step_world while GameObjects are ticked from this rebuild
+
+    def rebuild(self, game_objects: Iterable):
+
+        for point_hash in self.hashes.values():
+            point_hash.clear()
+
+        for game_object in game_objects:
+            key = (game_object.team, game_object.unit_type)
+            if key not in self.hashes:
+                self.hashes[key] = PointHash(self.cell_size)
+            self.hashes[key].insert(game_object, game_object.rel_pos[1], game_object.rel_pos[3])
+
+    def enemy_hashes(self, game_object) -> List[PointHash]:
+        """Hashes of other teams' units of the types game_object targets (all types if it has none)"""
+
+        return [point_hash for (team, unit_type), point_hash in self.hashes.items()
+                if team != game_object.team
+                and (len(game_object.target_types) == 0 or unit_type in game_object.target_types)]
+
+    def nearest_enemy(self, game_object):
+        """Nearest living enemy as of the last rebuild and its current distance, or (None, 0)"""
+
+        x, y = game_object.rel_pos[1], game_object.rel_pos[3]
+
+        # Units destroyed since the rebuild are still in the hashes
+        target, target_dist = None, math.inf
+        for point_hash in self.enemy_hashes(game_object):
+            candidate, dist = point_hash.nearest(x, y, target_dist, accept=pygame.sprite.Sprite.alive)
+            if candidate is not None:
+                target, target_dist = candidate, dist
+
+        if target is None:
+            return None, 0
+
+        return target, math.hypot(target.rel_pos[1] - x, target.rel_pos[3] - y)
+
+    def enemies_in_range(self, game_object, radius) -> List[Tuple["GameObject", float]]:
+        """Living enemies within radius of game_object as of the last rebuild, as (enemy, distance) pairs"""
+
+        x, y = game_object.rel_pos[1], game_object.rel_pos[3]
+        return [(enemy, dist) for point_hash in self.enemy_hashes(game_object)
+                for enemy, dist in point_hash.query_radius(x, y, radius) if enemy.alive()]
+
+
+class Projectile:
+
+    __slots__ = ("owner", "team", "x", "y", "vx", "vy", "life", "damage")
+
+
+class Projectiles:
+    """
+    Projectiles in flight, moved and collided with GameObjects once per simulation step. Spent projectiles go back to
+    a pool and are reused, so sustained fire does not allocate
+    """
+
+    def __init__(self, capacity=256, cell_size=64):
+
+        self.active: List[Projectile] = []
+        self.pool = Pool(Projectile, capacity)
+        self.broad_phase = BroadPhase(cell_size)
+
+        self.hits = 0
+
+    def spawn(self, owner, x, y, vx, vy, life, damage) -> Projectile:
+        """Fires a projectile from (x, y) moving (vx, vy) pixels per second for life milliseconds"""
+
+        projectile = self.pool.acquire()
+        projectile.owner = owner
+        projectile.team = owner.team
+        projectile.x, projectile.y = x, y
+        projectile.vx, projectile.vy = vx, vy
+        projectile.life = life
+        projectile.damage = damage
+
+        self.active.append(projectile)
+        return projectile
+
+    def step(self, tick, game_objects: Iterable):
+        """Moves every projectile, damaging the first enemy it passed through this step"""
+
+        if not self.active:
+            return
+
+        self.broad_phase.rebuild(game_object.collision_body() for game_object in game_objects)
+        seconds = tick / 1000
+
+        in_flight = []
+        for projectile in self.active:
+            x, y = projectile.x + projectile.vx * seconds, projectile.y + projectile.vy * seconds
+            body, _ = self.broad_phase.first_hit(projectile.x, projectile.y, x, y, projectile.team)
+
+            # Ships destroyed earlier in the step are still in the broad phase, projectiles fly through their wrecks
+            if body is not None and body.item.alive():
+                self.hits += 1
+                projectile.owner.damage_dealt += projectile.damage
+                body.item.take_damage(projectile.damage)
+
+            elif projectile.life > tick:
+                projectile.x, projectile.y = x, y
+                projectile.life -= tick
+                in_flight.append(projectile)
+                continue
+
+            projectile.owner = None
+            self.pool.release(projectile)
+
+        self.active = in_flight
+
+    def clear(self):
+
+        for projectile in self.active:
+            projectile.owner = None
+            self.pool.release(projectile)
+        self.active = []
 
 
 class GameObject(Sprite):
@@ -54,15 +186,26 @@ class GameObject(Sprite):
     GUN_STATS = {
          "FIGHTER_GUN_MK1": {
              "DAMAGE":25,
-             "FIRERATE": 60,
+             "FIRERATE": 60,    # Seconds between shots
              "TURRET_IMAGE": "fighter_turret.png",
              "TURRET_SIZE" : (None, 120),
              "SHOT_IMAGE": None,
+             "SHOT_SPEED": 600, # Pixels per second, None = hitscan
              "RANGE": 250       # Unit in pixels
         }   # TODO: Shot image
     }
 
     GAME_OBJECTS = pygame.sprite.Group()
+    unit_index: Union[UnitIndex, None] = None      # Set by step_world, enemies are scanned linearly outside of it
+    physics_world = None        # physics.PhysicsWorld integrating all GameObjects at once, None = per object physics
+    scheduler: Scheduler = SCHEDULER        # Timers of every GameObject, advanced by step_world
+    projectiles = Projectiles()             # Shots of every GameObject's turrets, stepped by step_world
+
+    # Fraction of the latest simulation step that is rendered, ships are drawn between their last two positions
+    render_alpha = 1
+
+    # Headless GameObjects load no sprite or turret images and are never drawn, only simulated (see battles.py)
+    headless = False
 
     def __init__(self,
                  team,
@@ -76,9 +219,12 @@ class GameObject(Sprite):
                  thrusters=None,
                  timers=None):
 
-        super().__init__((0, 0, 0, 0), sprite_path)
+        super().__init__((0, 0, 0, 0), None if GameObject.headless else sprite_path, size=sprite_size)
         GameObject.GAME_OBJECTS.add(self)
-        self.surf = resize(self.surf, sprite_size)
+
+        # Headless GameObjects collide as circles, sized like the sprite would have been
+        sizes = self.surf.get_size() if self.surf is not None else [size for size in sprite_size or () if size]
+        self.hit_radius = min(sizes) / 2 if sizes else 0
 
         self.team = team
         self.category = category
@@ -86,12 +232,18 @@ class GameObject(Sprite):
         self.target_types = target_types
 
         self.health = stats[0]
+        self.max_health = stats[0]
         self.mass = stats[1]
         self.vel = (0, 0)               # Speed/heading
         self.rot_locked = False         # TODO: confine rotation between -180 and 180? necessary or not?
         self.rot_vel = 0                # Current rate of rotation
+        self.prev_position = None       # Position offsets before the latest physics step, for render interpolation
         self.turn_rate = stats[2][0]    # How fast the ship can change rotational velocity
         self.max_turn_rate = stats[2][1]
+        self.target = None              # Enemy controls last aimed at, turrets fire at it
+
+        self.shots_fired = 0
+        self.damage_dealt = 0
 
         # List containing tuples storing:
         #  - Position of turret
@@ -105,70 +257,165 @@ class GameObject(Sprite):
         self.thrusters: List[List[XYRatio, int, bool]] \
             = thrusters if thrusters else []  # List of position of thruster, thrust, and active
 
-        # List of timers (current tick, duration, whether to automatically reset current tick after reaching duration callback)
-        self.timers: List[List[int, int, bool, Callable]] = timers if timers else []
+        # Timers registered with the scheduler, given as (duration, callback, whether to repeat), callbacks take no arguments
+        self.timers: List[TimerHandle] = [self.add_timer(*timer) for timer in timers] if timers else []
+        self.turret_timers: Dict[int, TimerHandle] = {}    # Reload timer by turret index, a turret is loaded once it expired
+
+        self._turret_rotations = None   # Turret rotations last composited onto self.surf
 
-        self.load_turret_images()
+        if not GameObject.headless:
+            self.load_turret_images()
         self.set_turret_timers()
 
+        if GameObject.physics_world is not None:
+            GameObject.physics_world.add(self)
+
     def load_turret_images(self):
 
         for turret in self.turrets:
 
             go_reference = GameObject.GUN_STATS[turret[0][1]]    # Turret stats reference
-            turret[1] = resize(pygame.image.load(go_reference["TURRET_IMAGE"]).convert_alpha(), go_reference["TURRET_SIZE"])
+            turret[1] = ASSETS.load(go_reference["TURRET_IMAGE"], go_reference["TURRET_SIZE"])
+
+    def add_timer(self, duration, callback, repeat=False) -> TimerHandle:
+
+        return GameObject.scheduler.schedule(duration, callback, duration if repeat else None)
+
+    def cancel_timers(self):
 
-    def set_turret_timers(self):        # TODO THIS AND NEXT FUNCTION, flag to set whether turret should be shot based off of angle
+        for timer in self.timers + list(self.turret_timers.values()):
+            timer.cancel()
+
+    def set_turret_timers(self):
 
         for i, turret in enumerate(self.turrets):
 
             turret_stats = turret[0]
             gun_stats = GameObject.GUN_STATS[turret[0][1]]
 
+            # Automatic turrets reload on a timer without a callback, they fire once it expired and they are aimed
             if turret_stats[-1]:
-                self.timers.append([0, gun_stats["FIRERATE"]*1000, False, self.turret_fire_callback(i, len(self.timers))])
+                self.turret_timers[i] = GameObject.scheduler.schedule(gun_stats["FIRERATE"]*1000)
 
-    def turret_fire_callback(self, turret_index, timer_index):
+    def fire_turrets(self):
 
-        def callback(current_tick, duration):
+        for i, timer in self.turret_timers.items():
+            if self.turrets[i][2] and not timer.pending:
+                if __debug__ and WEAPONS.level <= DEBUG:
+                    WEAPONS.debug("%s fired turret %d", self, i)
+                timer.reset()
+                self.shots_fired += 1
 
-            turret = self.turrets[turret_index]
-            if turret[2]:
-                print("PEW")
+                gun_stats = GameObject.GUN_STATS[self.turrets[i][0][1]]
+                if gun_stats.get("SHOT_SPEED"):
+                    self.fire_projectile(self.turrets[i], gun_stats)
 
-                self.timers[timer_index][0] = 0
+                # Hitscan shots hit the target the turret was aimed at unless it was destroyed since
+                elif self.target is not None and self.target.alive():
+                    self.damage_dealt += gun_stats["DAMAGE"]
+                    self.target.take_damage(gun_stats["DAMAGE"])
 
-        return callback
+    def fire_projectile(self, turret, gun_stats):
 
-    def offset_ship(self, offset: XYSimple):
+        # Shots leave from the ship's center along the turret's heading and fly as far as the gun's range
+        angle = math.radians(self.rot + turret[0][3])
+        speed = gun_stats["SHOT_SPEED"]
+        GameObject.projectiles.spawn(self, self.rel_pos[1], self.rel_pos[3], -math.sin(angle) * speed,
+                                     -math.cos(angle) * speed, gun_stats["RANGE"] / speed * 1000, gun_stats["DAMAGE"])
 
-        self.offset((0, offset[0], 0, offset[1]))
+    def collision_body(self) -> Body:
 
-    def tick(self, tick):
+        # Ships collide by the mask of their hull (turrets excluded), headless ones as circles
+        if self.shared_surf is None:
+            return Body(self, self.team, self.rel_pos[1], self.rel_pos[3], self.hit_radius)
+        return Body(self, self.team, self.rel_pos[1], self.rel_pos[3], mask=MASKS.rotated(self.shared_surf, self.rot))
 
-        # Update timers
-        for timer in self.timers:
-            print("Updating timer")
+    def take_damage(self, damage):
 
-            timer[0] += tick
+        self.health -= damage
+        if self.health <= 0:
+            if __debug__ and WEAPONS.level <= DEBUG:
+                WEAPONS.debug("%s destroyed", self)
+            self.destroy()
 
-            # If time reached call callback
-            if timer[0] >= timer[1]:
-                print("Calling timer callback")
-                timer[3](tick)
+    def destroy(self):
+        """Removes self from the world: its timers, physics slot, GAME_OBJECTS and the UI tree"""
 
-                if timer[2]:
-                    timer[0] = 0
+        self.cancel_timers()
+        if GameObject.physics_world is not None:
+            GameObject.physics_world.remove(self)
+        self.kill()
+        self.detach()
+
+    def retire(self):
+        """Takes self out of the world like destroy but leaves it in the UI tree, for an ElementPool to respawn"""
+
+        self.cancel_timers()
+        if GameObject.physics_world is not None:
+            GameObject.physics_world.remove(self)
+        self.kill()
+        self.target = None
+
+    def respawn(self, team, position: XYSimple, rot=0):
+        """Puts a retired self back into the world as a new ship of team, as an ElementPool's acquire hook"""
+
+        self.team = team
+        self.rel_pos = (0, position[0], 0, position[1])
+        self.prev_position = None
+        self.rot = rot
+        self.vel = (0, 0)
+        self.rot_vel = 0
+        self.health = self.max_health
+        self.shots_fired = 0
+        self.damage_dealt = 0
+
+        for turret in self.turrets:
+            turret[0][3] = 0
+            turret[2] = False
+        for thruster in self.thrusters:
+            thruster[2] = False
+
+        # Timers restart from their full delay, turrets have to reload first like those of a new ship
+        for timer in self.timers + list(self.turret_timers.values()):
+            timer.reset()
+
+        GameObject.GAME_OBJECTS.add(self)
+        if GameObject.physics_world is not None:
+            GameObject.physics_world.add(self)
+
+    def offset_ship(self, offset: XYSimple):
+
+        self.offset((0, offset[0], 0, offset[1]))
+
+    def tick(self, tick, physics=True):
+
+        # Timers are advanced for every GameObject at once by step_world, loaded turrets fire if they were aimed
+        if self.turret_timers:
+            self.fire_turrets()
 
         self.update_ship_controls(tick)
 
+        # Actually update ship position, rotation (step_world moves all ships at once after controls instead)
+        if physics and GameObject.physics_world is None:
+            self.update_ship_physics(tick)
+
     def update_ship_controls(self, tick):
 
         # If this unit actively seeks out enemy units
         if self.category == GameObject.ACTIVE:
 
-            # Find nearest enemy of type
+            # Thrusters burn for one step at a time, controls reactivate them for as long as they are needed
+            for thruster in self.thrusters:
+                thruster[2] = False
+
+            # Find nearest enemy of type, without one there is nothing to steer or aim at
             target, target_dist = self.locate_enemy()
+            self.target = target
+            if target is None:
+                for turret in self.turrets:
+                    turret[2] = False
+                return
+
             target_local_pos = vmath.sub(
                 extract_offsets(target.rel_pos),
                 extract_offsets(self.rel_pos)
@@ -183,15 +430,18 @@ class GameObject(Sprite):
                 target_local_pos,
                 precomp_dist=target_dist
             )
-            print("RV:", list(map(lambda x: round(x, 4), right_vector)), "\tH:", list(map(lambda x: round(x, 4), heading)), "\tD:", vmath.dot(right_vector, heading))
-            #print("S:", round(slope, 2), "\tH:", list(map(lambda x: round(x, 4), heading)), "\tP:", round(projection, 4), "\tR:", int(self.rot), "\tT:", int(target_angle))
+            if __debug__ and CONTROLS.level <= DEBUG:
+                CONTROLS.debug("RV: %.4f %.4f\tH: %.4f %.4f\tP: %.4f\tR: %d\tT: %d", right_vector[0], right_vector[1],
+                               heading[0], heading[1], projection, self.rot, target_angle)
 
             # Determine where the target is relative to self, either to the left or to the right by dotting to right_vector
             right_projection = vmath.dot(right_vector, target_local_pos)
+            if right_projection < 0:
+                target_angle = -target_angle
 
             # Turn the ship towards target_angle
-            # If target_angle is positive, target is to left of ship, negative = right of ship
-            if target_angle > 10:        # Turn left
+            # If target_angle is positive, target is to right of ship, negative = left of ship
+            if target_angle > 10:        # Turn right
                 self.rot_vel = max(-self.max_turn_rate*tick/1000, self.rot_vel - self.turn_rate*tick/1000)  # TODO: make turn rate magnitude based off of target_angle (larger angles = larger turn velocities)
 
             elif target_angle < -10:
@@ -200,15 +450,15 @@ class GameObject(Sprite):
             elif 0 < target_angle < 10:
                 self.rot_vel = max(-target_angle*tick/1000, self.rot_vel - self.turn_rate*tick/1000)
 
-            elif -10 > target_angle > 0:
-                self.rot_vel = min(target_angle*tick/1000, self.rot_vel + self.turn_rate * tick / 1000)
+            elif -10 < target_angle < 0:
+                self.rot_vel = min(-target_angle*tick/1000, self.rot_vel + self.turn_rate * tick / 1000)
 
             # Calculate ship heading (where it's going)
             speed = vmath.magnitude(self.vel)
 
             # Only calculate ship heading if ship is traveling
             if speed > 0:
-                d_heading = vmath.normalize((self.vel[1], self.vel[0]))
+                d_heading = vmath.normalize(self.vel)
                 _, d_projection, heading_angle = vmath.angle_between(
                     d_heading,
                     target_local_pos,
@@ -216,26 +466,34 @@ class GameObject(Sprite):
                 )
 
                 # If ship isn't traveling towards target and ship is pointed at target, activate engine
-                if -10 < heading_angle < 10 and -10 < target_angle < 10:
+                if not -10 < heading_angle < 10 and -10 < target_angle < 10:
                     self.activate_thrusters()
 
             else:
                 self.activate_thrusters()
 
+            # Enemies within each turret range, turrets with the same range share one query
+            in_range: Dict[float, List] = {}
+
             # Turn the turrets, NOT BASED OFF OF TURRET POSITION, BASED OFF OF SHIP POSITION
             for turret in self.turrets:
 
-                turret_slope = math.tan(math.radians(90 + self.rot + turret[0][3]))
-                turret_heading = vmath.normalize((1/turret_slope, -1))
+                # Same convention as calculate_ship_heading, valid on both sides of +-90 degrees
+                turret_angle = math.radians(self.rot + turret[0][3])
+                turret_heading = (-math.sin(turret_angle), -math.cos(turret_angle))
 
                 _, t_projection, t_angle = vmath.angle_between(
                     turret_heading,
                     target_local_pos,
                     precomp_dist=target_dist
                 )
+                if vmath.dot((-turret_heading[1], turret_heading[0]), target_local_pos) < 0:
+                    t_angle = -t_angle
 
                 # Update turret rotations if not gimbal locked
                 if not turret[0][2]:
+                    turret_rot = turret[0][3]
+
                     if t_angle  > turret[0][4]:
                         turret[0][3] -= turret[0][4]
 
@@ -243,26 +501,33 @@ class GameObject(Sprite):
                         turret[0][3] += turret[0][4]
 
                     else:
-                        turret[0][3] -= turret[0][3]
+                        turret[0][3] -= t_angle
 
-                # Set fire marker if t_angle within certain bounds and in range
+                    # Turrets are drawn onto the ship surface, so the ship has to be redrawn
+                    if turret[0][3] != turret_rot:
+                        self.mark_dirty()
+
+                # Set fire marker if t_angle within certain bounds and in range (turret[0][2] is the gimbal lock)
                 turret_range = GameObject.GUN_STATS[turret[0][1]]["RANGE"]
-                if -10 < t_angle < 10 and target_dist <= turret_range:
-                    turret[0][2] = True
+                if turret_range not in in_range:
+                    in_range[turret_range] = [enemy for enemy, _ in self.enemies_in_range(turret_range)]
 
-                else:
-                    turret[0][2] = False
+                if -10 < t_angle < 10 and target in in_range[turret_range]:
+                    turret[2] = True
 
-        self.update_ship_physics(tick)  # Actually update ship position, rotation
+                else:
+                    turret[2] = False
 
     def update_ship_physics(self, tick):
 
+        self.prev_position = extract_offsets(self.rel_pos)
+
         # Rotate the ship (self.rot, not the sprite)
         if not self.rot_locked:
             self.rot += self.rot_vel
 
             if self.rot <= -180:
-                self.rot = 360 - self.rot
+                self.rot = 360 + self.rot
 
             elif self.rot > 180:
                 self.rot = self.rot - 360
@@ -275,11 +540,20 @@ class GameObject(Sprite):
             for thruster in self.thrusters:
 
                 if thruster[2]:
-                    self.vel = vmath.add(self.vel, (thruster[1]/self.mass*heading))
+                    self.vel = vmath.add(self.vel, [thruster[1]/self.mass*h for h in heading])
 
         # Update ship position based off of velocity
         self.offset_ship(self.vel)
 
+    def draw_offset(self) -> XYSimple:
+
+        if self.prev_position is None or GameObject.render_alpha == 1:
+            return XYSimple(0, 0)
+
+        # Lag behind rel_pos by the part of the step that has not been reached yet
+        lag = GameObject.render_alpha - 1
+        return XYSimple((self.rel_pos[1] - self.prev_position[0]) * lag, (self.rel_pos[3] - self.prev_position[1]) * lag)
+
     def calculate_ship_heading(self):
 
         # Calculate ship direction (where it's pointed)
@@ -294,6 +568,31 @@ class GameObject(Sprite):
 
     def locate_enemy(self):
 
+        # Positions in the index are stale unless self is ticked by step_world
+        if GameObject.unit_index is not None and GameObject.unit_index.current:
+            return GameObject.unit_index.nearest_enemy(self)
+
+        return self.locate_enemy_linear()
+
+    def enemies_in_range(self, radius) -> List[Tuple["GameObject", float]]:
+        """Enemies of the types self targets within radius, as (enemy, distance) pairs"""
+
+        # Positions in the index are stale unless self is ticked by step_world
+        if GameObject.unit_index is not None and GameObject.unit_index.current:
+            return GameObject.unit_index.enemies_in_range(self, radius)
+
+        x, y = self.rel_pos[1], self.rel_pos[3]
+        in_range = []
+        for gobject in GameObject.GAME_OBJECTS:
+            if gobject.team != self.team:
+                if len(self.target_types) == 0 or gobject.unit_type in self.target_types:
+                    dist = math.hypot(gobject.rel_pos[1] - x, gobject.rel_pos[3] - y)
+                    if dist <= radius:
+                        in_range.append((gobject, dist))
+        return in_range
+
+    def locate_enemy_linear(self):
+
         target = None
         target_dist = 0
 
@@ -317,23 +616,140 @@ class GameObject(Sprite):
         for thruster in self.thrusters:
             thruster[2] = True
 
-    def draw_seq(self):
-
-        self.surf = self.c_surf.copy()
+    def draw_turrets(self, surf: pygame.Surface):
 
-        # Draw turrets and thrusters
         for turret in self.turrets:
             turret_position = turret[0][0]
-            turret_rotated_surface = pygame.transform.rotate(turret[1], turret[0][3])
-            self.surf.blit(turret_rotated_surface, (turret_position[0]*self.surf.get_width()-turret_rotated_surface.get_width()/2, turret_position[1]*self.surf.get_height()-turret_rotated_surface.get_height()/2)) # Blit at center
+            misses = ROTATION_CACHE.cache.misses
+            turret_rotated_surface = ROTATION_CACHE.rotate(turret[1], turret[0][3])[0]
+            if self.counters is not None:
+                self.counters.rotations += ROTATION_CACHE.cache.misses - misses
+            surf.blit(turret_rotated_surface, (turret_position[0]*surf.get_width()-turret_rotated_surface.get_width()/2, turret_position[1]*surf.get_height()-turret_rotated_surface.get_height()/2)) # Blit at center
 
         # TODO: Draw flames coming from fire as thrusters
 
-        self.draw_children(False)
+    def composite(self) -> pygame.Surface:
+        """c_surf with the turrets drawn on at their current rotations, from TURRET_COMPOSITES"""
+
+        key = (self.c_surf, tuple((turret[1], turret[0][0], ROTATION_CACHE.quantize(turret[0][3]))
+                                  for turret in self.turrets))
+
+        composite = TURRET_COMPOSITES.get(key)
+        if composite is None:
+            composite = self.c_surf.copy()
+            if self.counters is not None:
+                self.counters.copies += 1
+            self.draw_turrets(composite)
+            TURRET_COMPOSITES.put(key, composite)
+
+        return composite
+
+    def composited(self) -> bool:
+        """Whether self is drawn as its shared composite, rotated through the cache, instead of drawn onto"""
+
+        return bool(self.turrets) and self.rotation_cache is not None and not self.children and self.c_surf is not None
+
+    def rotated_surface(self):
+
+        if not self.composited():
+            return super().rotated_surface()
+
+        misses = self.rotation_cache.cache.misses
+        rotated = self.rotation_cache.rotate(self.composite(), self.rot)
+        if self.counters is not None:
+            self.counters.rotations += self.rotation_cache.cache.misses - misses
+        return rotated
+
+    def draw_seq(self):
+
+        # Parked ships (see retire) are not composited at all
+        if not self.visible:
+            return
+
+        if GameObject.physics_world is not None:
+            GameObject.physics_world.sync()
+
+        # Ships that can't share composites have their turrets drawn onto self.surf, in retained mode only when it was
+        # updated or a turret turned
+        if not self.composited():
+            turret_rotations = tuple(turret[0][3] for turret in self.turrets)
+            if not self.retained or self.stale or turret_rotations != self._turret_rotations:
+                self._turret_rotations = turret_rotations
+                self.stale = True
+                self.reset_surf()
+                self.draw_turrets(self.surf)
+
+            self.draw_children(False)
+
         self.draw()
 
         self.update_rect()
 
+POOLS.register(GameObject.projectiles.pool)
+
+
+def step_world(tick):
+    """Advances every GameObject by one simulation step"""
+
+    if GameObject.unit_index is None:
+        GameObject.unit_index = UnitIndex()
+    # Controls read ship state, so results of the previous physics step have to be written back first
+    if GameObject.physics_world is not None:
+        GameObject.physics_world.sync()
+
+    GameObject.unit_index.rebuild(GameObject.GAME_OBJECTS)
+    GameObject.scheduler.advance(tick)
+
+    # Objects destroyed earlier in the step are skipped
+    GameObject.unit_index.current = True
+    try:
+        for game_object in GameObject.GAME_OBJECTS:
+            if game_object.alive():
+                game_object.tick(tick, physics=False)
+    finally:
+        GameObject.unit_index.current = False
+
+    # Every ship is moved after all of them decided, so none steers towards where another one already moved this step
+    if GameObject.physics_world is not None:
+        GameObject.physics_world.step(tick)
+    else:
+        for game_object in GameObject.GAME_OBJECTS:
+            game_object.update_ship_physics(tick)
+
+    # Projectiles are collided with where ships are after this step
+    if GameObject.projectiles.active:
+        if GameObject.physics_world is not None:
+            GameObject.physics_world.sync()
+        GameObject.projectiles.step(tick, GameObject.GAME_OBJECTS)
+
+
+def reset_world():
+    """Destroys every GameObject and resets the state they share, e.g. between battles"""
+
+    for game_object in GameObject.GAME_OBJECTS:
+        game_object.destroy()
+
+    GameObject.unit_index = None
+    GameObject.render_alpha = 1
+    GameObject.scheduler.clear()
+    GameObject.projectiles.clear()
+
+
+def set_render_alpha(alpha):
+    """Sets how far between simulation steps ships are drawn, marking ships that will be drawn elsewhere"""
+
+    if GameObject.physics_world is not None:
+        GameObject.physics_world.sync()
+
+    if alpha == GameObject.render_alpha:
+        return
+
+    GameObject.render_alpha = alpha
+    for game_object in GameObject.GAME_OBJECTS:
+        if game_object.prev_position is not None and game_object.prev_position != extract_offsets(game_object.rel_pos):
+            game_object.mark_dirty()
+
+
 # Actual unit declarations
 # [[energy_cost, material_Cost, desc, icon_image, icon_size], [args], [kwargs]]
 fighter_unit = (
@@ -0,0 +1,181 @@
+"""
+Structure-of-arrays physics for GameObjects
+
+Ship state lives in NumPy arrays so one vectorized step integrates every ship. Controls still run per GameObject and
+only set rot_vel and thrusters, which are gathered before each step; results are written back to the GameObjects
+lazily, on the next sync (before controls and before rendering). Positions, velocities and rotations assigned to a
+GameObject from outside (e.g. when spawning) are picked up by the next gather.
+
+Steps match per object physics (step_world moves those ships after all controls too), but are not guaranteed to be
+bit-identical: NumPy's tan can round a heading differently in the last place than math.tan. Battles are chaotic, so
+in the rare battle where that happens the two backends can play out differently from that step on.
+
+    physics.enable()        # Every existing and future GameObject is integrated by the world
+"""
+
+from gameplay import GameObject
+from pyoneer3.graphics import XYSimple
+
+try:
+    import numpy as np
+    from pyoneer3 import storage, vmath_batch
+except ImportError:     # NumPy is optional, GameObjects fall back to per object physics without it
+    np = None
+
+
+class PhysicsWorld:
+
+    ARRAYS = ("pos", "prev_pos", "vel", "rot", "rot_vel", "mass", "thrust", "rot_locked", "active")
+
+    def __init__(self, capacity=64):
+
+        assert np is not None, "PhysicsWorld requires numpy"
+
+        self.objects = []           # GameObject in each slot, slots [0, len(objects)) are in use
+        self.slots = {}             # GameObject : slot
+        self.written = []           # (rel_pos, vel, rot) objects of each slot's GameObject the arrays last agreed with
+        self.stale = False          # Whether arrays hold results not yet written back to the GameObjects
+
+        self.pos = np.zeros((capacity, 2))
+        self.prev_pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.rot = np.zeros(capacity)
+        self.rot_vel = np.zeros(capacity)
+        self.mass = np.ones(capacity)
+        self.thrust = np.zeros(capacity)                    # Summed thrust of active thrusters
+        self.rot_locked = np.zeros(capacity, dtype=bool)
+        self.active = np.zeros(capacity, dtype=bool)        # Whether the ship's category is ACTIVE (thrusters work)
+
+    def add(self, game_object):
+
+        if game_object in self.slots:
+            return
+
+        self.sync()
+
+        slot = len(self.objects)
+        if slot == len(self.rot):
+            storage.grow_arrays(self, PhysicsWorld.ARRAYS)
+
+        self.objects.append(game_object)
+        self.slots[game_object] = slot
+        self.written.append((game_object.rel_pos, game_object.vel, game_object.rot))
+
+        self.pos[slot] = (game_object.rel_pos[1], game_object.rel_pos[3])
+        self.prev_pos[slot] = self.pos[slot]
+        self.vel[slot] = game_object.vel
+        self.rot[slot] = game_object.rot
+        self.rot_vel[slot] = game_object.rot_vel
+        self.mass[slot] = game_object.mass
+        self.active[slot] = game_object.category == GameObject.ACTIVE
+
+    def remove(self, game_object):
+        """Frees game_object's slot by moving the last slot into it"""
+
+        slot = self.slots.pop(game_object, None)
+        if slot is None:
+            return
+
+        self.sync()
+
+        last = len(self.objects) - 1
+        if slot != last:
+            moved = self.objects[last]
+            self.objects[slot] = moved
+            self.slots[moved] = slot
+            self.written[slot] = self.written[last]
+            for name in PhysicsWorld.ARRAYS:
+                array = getattr(self, name)
+                array[slot] = array[last]
+
+        self.objects.pop()
+        self.written.pop()
+
+    def gather(self):
+        """Reads what controls decided this step (rotation velocity, thrust, rotation locks) and outside changes"""
+
+        for slot, game_object in enumerate(self.objects):
+
+            # Anything that isn't the object sync wrote was assigned from outside and overrides the arrays
+            written = self.written[slot]
+            if game_object.rel_pos is not written[0]:
+                self.pos[slot] = (game_object.rel_pos[1], game_object.rel_pos[3])
+            if game_object.vel is not written[1]:
+                self.vel[slot] = game_object.vel
+            if game_object.rot is not written[2]:
+                self.rot[slot] = game_object.rot
+            self.written[slot] = (game_object.rel_pos, game_object.vel, game_object.rot)
+
+            self.mass[slot] = game_object.mass
+            self.rot_vel[slot] = game_object.rot_vel
+            self.rot_locked[slot] = game_object.rot_locked
+            self.thrust[slot] = sum(thruster[1] for thruster in game_object.thrusters if thruster[2])
+
+    def step(self, tick):
+        """Integrates every ship by one step, mirroring GameObject.update_ship_physics"""
+
+        n = len(self.objects)
+        if not n:
+            return
+
+        self.gather()
+
+        pos, vel, rot = self.pos[:n], self.vel[:n], self.rot[:n]
+        self.prev_pos[:n] = pos
+
+        # Rotate ships that aren't rotation locked, wrapping the same way update_ship_physics does
+        unlocked = ~self.rot_locked[:n]
+        rotated = rot + self.rot_vel[:n]
+        low = rotated <= -180
+        high = ~low & (rotated > 180)
+        rotated = np.where(low, 360 + rotated, np.where(high, rotated - 360, rotated))
+        rot[unlocked] = rotated[unlocked]
+
+        # Accelerate active ships along their heading (see calculate_ship_heading)
+        accelerating = self.active[:n] & (self.thrust[:n] != 0)
+        if accelerating.any():
+            heading = vmath_batch.ship_headings(rot)
+            acceleration = (self.thrust[:n] / self.mass[:n])[:, None] * heading
+            vel[accelerating] += acceleration[accelerating]
+
+        pos += vel
+        self.stale = True
+
+    def sync(self):
+        """Writes results of the last step back to the GameObjects, does nothing if they are current"""
+
+        if not self.stale:
+            return
+        self.stale = False
+
+        n = len(self.objects)
+        for slot, (game_object, (x, y), (prev_x, prev_y), (vx, vy), rot) in enumerate(zip(
+                self.objects, self.pos[:n].tolist(), self.prev_pos[:n].tolist(), self.vel[:n].tolist(),
+                self.rot[:n].tolist())):
+
+            rel_pos = game_object.rel_pos
+            game_object.prev_position = XYSimple(prev_x, prev_y)
+            game_object.rel_pos = (rel_pos[0], x, rel_pos[2], y)
+            game_object.vel = (vx, vy)
+            game_object.rot = rot
+
+            self.written[slot] = (game_object.rel_pos, game_object.vel, game_object.rot)
+
+
+def enable(capacity=64) -> PhysicsWorld:
+    """Moves every GameObject, existing and future, onto a shared PhysicsWorld"""
+
+    if GameObject.physics_world is None:
+        GameObject.physics_world = PhysicsWorld(capacity)
+        for game_object in GameObject.GAME_OBJECTS:
+            GameObject.physics_world.add(game_object)
+
+    return GameObject.physics_world
+
+
+def disable():
+    """Writes back pending results and returns GameObjects to per object physics"""
+
+    if GameObject.physics_world is not None:
+        GameObject.physics_world.sync()
+        GameObject.physics_world = None
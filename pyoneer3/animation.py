@@ -1,23 +1,222 @@
+import math
 from . import interpolation
-from typing import List
+from typing import Dict, List
+
+try:
+    import numpy as np
+    from . import storage
+except ImportError:     # NumPy is optional, batched services fall back to per animation updates without it
+    np = None
 
 
 class AnimationService:
 
-    def __init__(self):
+    def __init__(self, batched=False):
 
         self.animations: List[Animation] = []
+        self.tweens: Dict[Tween, None] = {}     # Tweens bound to element properties (dict used as an ordered set)
+
+        # Translations are advanced together in one vectorized step when batched
+        self.batch = TranslationBatch() if batched and np is not None else None
 
     def add_animation(self, animation):
 
-        self.animations.append(animation)
+        if isinstance(animation, Tween):
+            self.tweens[animation] = None
+
+        if self.batch is not None and self.batch.accepts(animation):
+            self.batch.add(animation)
+        else:
+            self.animations.append(animation)
 
     def update(self, delta):
 
+        if self.batch is not None:
+            self.batch.update(delta)
+
         self.animations = [animation for animation in self.animations if animation.state != Animation.FINISHED]
         for animation in self.animations:
             animation.update(delta)
 
+        if self.tweens:
+            self.apply_tweens()
+
+    def apply_tweens(self):
+        """
+        Writes the values of playing tweens (and the final values of ones that just finished) to their elements,
+        gathering every property of an element first so it is changed once per frame however many tweens it has
+        """
+
+        staged: Dict[object, Dict[str, List[float]]] = {}
+        for tween in list(self.tweens):
+            if tween.state == Animation.FINISHED:
+                del self.tweens[tween]
+            elif tween.state != Animation.PLAYING:
+                continue
+
+            # Later tweens of the same property override earlier ones
+            staged.setdefault(tween.element, {})[tween.property] = tween.pos
+
+        for element, values in staged.items():
+            element.apply_properties(values)
+
+
+class TranslationBatch:
+    """
+    Start, change, position, elapsed time, duration, direction and easing curve of every batched Translation in
+    contiguous arrays, advanced in one vectorized step. Each slot indexes a row of the stacked easing lookup tables and
+    its position is evaluated in closed form, but only copied into its Translation when pos or t is read. Finished slots
+    are compacted in place (keeping order) and their callbacks fired together after the step.
+    """
+
+    ARRAYS = ("start", "change", "pos", "elapsed", "duration", "direction", "curve", "playing")
+
+    def __init__(self, capacity=64):
+
+        assert np is not None, "TranslationBatch requires numpy"
+
+        self.animations: List[Translation] = []     # Translation in each slot, slots [0, len(animations)) are in use
+        self.slots: Dict[Translation, int] = {}
+
+        self.start = np.zeros((capacity, 2))
+        self.change = np.zeros((capacity, 2))
+        self.pos = np.zeros((capacity, 2))
+        self.elapsed = np.zeros(capacity)
+        self.duration = np.zeros(capacity)
+        self.direction = np.ones(capacity)
+        self.curve = np.zeros(capacity, dtype=int)         # Row of tables holding the slot's easing curve
+        self.playing = np.zeros(capacity, dtype=bool)
+
+        self.tables = np.zeros((0, interpolation.LUT_SIZE))
+        self.curves: Dict[tuple, int] = {}                  # Lookup table : row of tables
+
+    @staticmethod
+    def accepts(animation):
+
+        return (isinstance(animation, Translation)
+                and animation.interpolator.table is not None
+                and len(animation.start_pos) == 2)
+
+    def curve_row(self, table):
+
+        row = self.curves.get(table)
+        if row is None:
+            row = self.curves[table] = len(self.tables)
+            self.tables = np.vstack((self.tables, table))
+        return row
+
+    def add(self, animation):
+
+        if animation in self.slots or animation.state == Animation.FINISHED:
+            return
+
+        slot = len(self.animations)
+        if slot == len(self.elapsed):
+            storage.grow_arrays(self, TranslationBatch.ARRAYS)
+
+        self.animations.append(animation)
+        self.slots[animation] = slot
+
+        self.start[slot] = animation.start_pos
+        self.change[slot] = animation.change
+        self.duration[slot] = animation.end_t
+        self.direction[slot] = animation.direction
+        self.curve[slot] = self.curve_row(animation.interpolator.table)
+        self.playing[slot] = animation.state == Animation.PLAYING
+
+        animation.batch = self
+        self.write(animation)
+
+    def read(self, animation):
+        """Copies animation's position and elapsed time out of the arrays"""
+
+        slot = self.slots[animation]
+        animation._pos[:] = self.pos[slot].tolist()
+        animation._t = float(self.elapsed[slot])
+
+    def write(self, animation):
+        """Copies animation's position and elapsed time into the arrays, after they were assigned from outside"""
+
+        slot = self.slots[animation]
+        self.pos[slot] = animation._pos
+        self.elapsed[slot] = animation._t
+
+    def remove(self, animation):
+
+        slot = self.slots.get(animation)
+        if slot is None:
+            return
+
+        self.read(animation)
+        keep = np.ones(len(self.animations), dtype=bool)
+        keep[slot] = False
+        self._compact(keep)
+        animation.batch = None
+
+    def set_playing(self, animation, playing):
+
+        slot = self.slots.get(animation)
+        if slot is not None:
+            self.playing[slot] = playing
+
+    def set_direction(self, animation, direction):
+
+        slot = self.slots.get(animation)
+        if slot is not None:
+            self.direction[slot] = direction
+
+    def _compact(self, keep):
+        """Moves the slots keep is True for to the front, in order, without reallocating the arrays"""
+
+        n = len(self.animations)
+        kept = int(keep.sum())
+        for name in TranslationBatch.ARRAYS:
+            array = getattr(self, name)
+            array[:kept] = array[:n][keep]
+
+        self.animations = [animation for animation, k in zip(self.animations, keep.tolist()) if k]
+        self.slots = {animation: slot for slot, animation in enumerate(self.animations)}
+
+    def update(self, delta):
+
+        n = len(self.animations)
+        if not n:
+            return
+
+        playing, forward = self.playing[:n], self.direction[:n] > 0
+        elapsed, duration = self.elapsed[:n], self.duration[:n]
+        elapsed += delta * playing * self.direction[:n]
+
+        progress = np.ones(n)
+        np.divide(elapsed, duration, out=progress, where=duration > 0)
+        np.clip(progress, 0, 1, out=progress)
+
+        # Linearly interpolated lookup of every slot's easing table, indexed into the flattened tables
+        scaled = progress * (interpolation.LUT_SIZE - 1)
+        lo = np.minimum(scaled.astype(int), interpolation.LUT_SIZE - 2)
+        index = self.curve[:n] * interpolation.LUT_SIZE + lo
+        flat = self.tables.ravel()
+        eased = flat[index] + (flat[index + 1] - flat[index]) * (scaled - lo)
+
+        pos = self.pos[:n]
+        np.multiply(self.change[:n], eased[:, None], out=pos)
+        pos += self.start[:n]
+
+        done = playing & np.where(forward, elapsed >= duration, elapsed <= 0)
+        if done.any():
+            finished = [self.animations[slot] for slot in np.flatnonzero(done).tolist()]
+            for animation in finished:
+                self.read(animation)
+            self._compact(~done)
+
+            for animation in finished:
+                animation.batch = None
+                animation.end()
+
+                # Callbacks may have started the animation again (e.g. to play it back in reverse)
+                if animation.state == Animation.PLAYING:
+                    self.add(animation)
+
 
 class Animation:
 
@@ -29,17 +228,25 @@ class Animation:
 
         self.callback = callback
         self.state = Animation.STOPPED      # State of playback: -1 = finished, 0 = not playing, 1 = playing
+        self.batch = None                   # TranslationBatch advancing this animation, if any
 
     def start(self):
 
         self.state = Animation.PLAYING
+        if self.batch is not None:
+            self.batch.set_playing(self, True)
 
     def pause(self):
 
         self.state = Animation.STOPPED
+        if self.batch is not None:
+            self.batch.set_playing(self, False)
 
     def end(self):
 
+        if self.batch is not None:
+            self.batch.remove(self)
+
         self.state = Animation.FINISHED
         self.callback()
 
@@ -55,34 +262,111 @@ class Translation(Animation):
         super().__init__(callback)
 
         self.start_pos = start_pos
-        self.pos = start_pos
+        self.pos = list(start_pos)
         self.end_pos = end_pos
 
+        # Path from start_pos to end_pos, positions are evaluated along it directly from the time
+        self.change = [end - start for start, end in zip(start_pos, end_pos)]
+        self.length = math.sqrt(sum(c ** 2 for c in self.change))
+
         self.t = 0              # Current time step in milliseconds
+        self.direction = 1      # 1 = playing towards end_pos, -1 = playing back towards start_pos
         # If animation duration isn't specified, calculate
         if duration is None:
-            self.end_t = interpolator.compute_duration(start_pos, end_pos)
+            self.end_t = interpolator.compute_duration(self.length)
+            self.rate = interpolator.coefficients
 
-        # Otherwise, calculate the coefficients needed to complete animation in time
+        # Otherwise, calculate the rate needed to complete animation in time
         else:
             self.end_t = duration   # End time step in milliseconds - can be "None"
-            interpolator.compute_coefficients(duration)
+            self.rate = interpolator.compute_coefficients(duration, self.length)
 
         self.interpolator = interpolator
 
+    # Batched translations live in their batch's arrays, assign pos and t instead of mutating pos in place
+    @property
+    def pos(self):
+
+        if self.batch is not None:
+            self.batch.read(self)
+        return self._pos
+
+    @pos.setter
+    def pos(self, pos):
+
+        self._pos = pos
+        if self.batch is not None:
+            self.batch.write(self)
+
+    @property
+    def t(self):
+
+        if self.batch is not None:
+            self.batch.read(self)
+        return self._t
+
+    @t.setter
+    def t(self, t):
+
+        self._t = t
+        if self.batch is not None:
+            self.batch.write(self)
+
     def update(self, delta):
-        super().update(delta)
 
-        self.t += delta
+        if self.state != Animation.PLAYING:
+            return
 
-        if self.t >= self.end_t:
+        self.t += delta * self.direction
+
+        if self.t >= self.end_t if self.direction > 0 else self.t <= 0:
             self.end()
 
         else:
-            self.interpolator.interpolate(self, delta)
+            self.interpolator.interpolate(self)
+
+    def seek(self, t):
+        """Jumps to t milliseconds into the animation"""
+
+        self.t = min(max(t, 0), self.end_t)
+        self.interpolator.interpolate(self)
+
+    def reverse(self):
+        """Plays the animation in the opposite direction from where it currently is"""
+
+        self.direction = -self.direction
+        if self.batch is not None:
+            self.batch.set_direction(self, self.direction)
 
     def end(self):
+
+        # Settle on the final position before the callback, which may restart or reverse the animation
+        forward = self.direction > 0
+        if self.batch is not None:
+            self.batch.remove(self)
+        self.t = self.end_t if forward else 0
+        self.pos = list(self.end_pos if forward else self.start_pos)
+
         super().end()
 
-        self.pos = self.end_pos
 
+class Tween(Translation):
+    """
+    Translation of one of a UIElement's animatable properties (see UIElement.apply_properties) from start, the
+    property's current value by default, to end. Values may be numbers or sequences, the AnimationService playing
+    the tween writes them to the element every frame
+    """
+
+    def __init__(self, element, property_name, end, duration, interpolator: interpolation.Interpolator,
+                 callback=lambda: None, start=None):
+
+        start = element.get_property(property_name) if start is None else start
+        super().__init__(Tween.components(start), Tween.components(end), duration, interpolator, callback)
+
+        self.element = element
+        self.property = property_name
+
+    @staticmethod
+    def components(value) -> List[float]:
+
+        return list(value) if isinstance(value, (list, tuple)) else [value]
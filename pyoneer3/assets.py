@@ -0,0 +1,98 @@
+import pygame
+from typing import Dict, Iterable, Tuple, Union
+from .cache import surface_bytes
+
+XYResize = Tuple[Union[int, None], Union[int, None]]   # Used to store resize target sizes, None = keep aspect ratio
+
+
+def resize(surf: pygame.Surface, size: XYResize):
+    aspect_ratio = surf.get_width() / surf.get_height()
+    target_size = list(size)
+
+    if size[0] is None and size[1] is None:
+        return surf
+
+    # Keep aspect ratio, resize width
+    if size[0] is None:
+        target_size[0] = int(size[1] * aspect_ratio)
+
+    # Keep aspect ratio, resize height
+    elif size[1] is None:
+        target_size[1] = int(size[0] / aspect_ratio)
+
+    return pygame.transform.smoothscale(surf, target_size)
+
+
+class AssetManager:
+    """
+    Loads every (image path, target size) once and hands out the same surface to every caller. Shared surfaces
+    must never be drawn on, copy them first.
+    """
+
+    def __init__(self):
+
+        self.surfaces: Dict[Tuple[str, Union[XYResize, None]], pygame.Surface] = {}
+
+        self.loads = 0      # Images read from disk
+        self.scales = 0     # Images resized
+        self.hits = 0
+
+    @staticmethod
+    def key(path, size: XYResize = None):
+
+        if size is None or (size[0] is None and size[1] is None):
+            return path, None
+        return path, tuple(size)
+
+    def load(self, path, size: XYResize = None) -> pygame.Surface:
+        """Shared surface of the image at path, resized like resize() if size is given"""
+
+        key = AssetManager.key(path, size)
+
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.hits += 1
+            return surf
+
+        if key[1] is None:
+            surf = pygame.image.load(path).convert_alpha()
+            self.loads += 1
+        else:
+            surf = resize(self.load(path), size)
+            self.scales += 1
+
+        self.surfaces[key] = surf
+        return surf
+
+    def preload(self, assets: Iterable[Union[str, Tuple[str, XYResize]]]):
+        """Loads paths or (path, size) pairs ahead of time, e.g. while a loading screen is up"""
+
+        for asset in assets:
+            if isinstance(asset, str):
+                self.load(asset)
+            else:
+                self.load(*asset)
+
+    def unload(self, path):
+        """Forgets every size of path, surfaces already handed out stay valid"""
+
+        for key in [key for key in self.surfaces if key[0] == path]:
+            del self.surfaces[key]
+
+    def clear(self):
+
+        self.surfaces.clear()
+
+    def memory(self) -> int:
+        """Bytes of pixel data held by loaded surfaces"""
+
+        return sum(surface_bytes(surf) for surf in self.surfaces.values())
+
+    def stats(self) -> Dict[str, int]:
+
+        return {"surfaces": len(self.surfaces), "bytes": self.memory(),
+                "loads": self.loads, "scales": self.scales, "hits": self.hits}
+
+
+# Process-wide asset manager
+ASSETS = AssetManager()
@@ -0,0 +1,112 @@
+import pygame
+from collections import OrderedDict
+from typing import Callable, Hashable, Tuple
+
+
+def surface_bytes(surf: pygame.Surface) -> int:
+
+    return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+
+class LRUCache:
+    """Least recently used cache capped by the total size of its values, measured with size_of"""
+
+    def __init__(self, max_size, size_of: Callable = lambda value: 1):
+
+        self.max_size = max_size
+        self.size_of = size_of
+        self.size = 0
+        self.entries: OrderedDict = OrderedDict()    # Key : (value, size), least recently used first
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value):
+
+        old = self.entries.pop(key, None)
+        if old:
+            self.size -= old[1]
+
+        size = self.size_of(value)
+        self.entries[key] = (value, size)
+        self.size += size
+
+        # Evict least recently used entries, always keeping the newest one
+        while self.size > self.max_size and len(self.entries) > 1:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.size -= evicted_size
+
+    def discard(self, key):
+
+        entry = self.entries.pop(key, None)
+        if entry:
+            self.size -= entry[1]
+
+    def clear(self):
+
+        self.entries.clear()
+        self.size = 0
+
+    def hit_rate(self):
+
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0
+
+    def __len__(self):
+
+        return len(self.entries)
+
+    def __contains__(self, key: Hashable):
+
+        return key in self.entries
+
+
+class RotationCache:
+    """
+    Rotated copies of surfaces keyed by (source surface, angle quantized to resolution degrees) along with their
+    rects. Sources are keyed by identity, so they must not be drawn on after being rotated through the cache.
+    """
+
+    def __init__(self, resolution=1, max_bytes=64 * 2**20):
+
+        self.resolution = resolution            # Angular resolution in degrees, None = exact angles
+        self.cache = LRUCache(max_bytes, lambda entry: surface_bytes(entry[0]))
+
+    def quantize(self, angle):
+
+        if not self.resolution:
+            return angle
+        return round(angle / self.resolution) * self.resolution % 360
+
+    def rotate(self, surf: pygame.Surface, angle) -> Tuple[pygame.Surface, pygame.Rect]:
+        """surf rotated by angle and the rect of the result at (0, 0), the rect must be copied before moving it"""
+
+        angle = self.quantize(angle)
+        key = (surf, angle)
+
+        entry = self.cache.get(key)
+        if entry is None:
+            rotated = pygame.transform.rotate(surf, angle)
+            entry = (rotated, rotated.get_rect())
+            self.cache.put(key, entry)
+
+        return entry
+
+    def clear(self):
+
+        self.cache.clear()
+
+
+# Shared by every Sprite and turret
+ROTATION_CACHE = RotationCache()
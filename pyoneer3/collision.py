@@ -0,0 +1,171 @@
+"""
+Collision detection for many small, fast movers (projectiles) against fewer large bodies (ships)
+
+The broad phase is a uniform grid over the bodies' bounding boxes, rebuilt once per step, so a query only looks at the
+few bodies in the cells it passes through instead of every body. The narrow phase tests the exact shape: the mask of
+the body's rotated frame, cached per (source surface, angle) at the rotation cache's resolution so every ship of a type
+shares its masks, or a circle for bodies without surfaces (headless simulation).
+"""
+
+import math
+import pygame
+from typing import Dict, Hashable, Iterable, List, Tuple, Union
+from .cache import LRUCache
+from .cache import ROTATION_CACHE
+from .cache import RotationCache
+
+Cell = Tuple[int, int]
+
+MASK_STEP = 2       # Pixels between the points tested along a segment crossing a mask
+
+
+class MaskCache:
+    """Masks of rotated frames, keyed like the rotation cache's frames"""
+
+    def __init__(self, rotation_cache: RotationCache = ROTATION_CACHE, max_bytes=16 * 2**20):
+
+        self.rotation_cache = rotation_cache
+        self.cache = LRUCache(max_bytes, lambda entry: entry[0].get_size()[0] * entry[0].get_size()[1] // 8)
+
+    def rotated(self, surf: pygame.Surface, angle) -> pygame.mask.Mask:
+        """Mask of surf rotated by angle, the same frame ROTATION_CACHE draws"""
+
+        angle = self.rotation_cache.quantize(angle)
+        key = (surf, angle)
+
+        entry = self.cache.get(key)
+        if entry is None:
+            entry = (pygame.mask.from_surface(self.rotation_cache.rotate(surf, angle)[0]),)
+            self.cache.put(key, entry)
+
+        return entry[0]
+
+    def clear(self):
+
+        self.cache.clear()
+
+
+# Shared by every body with a surface
+MASKS = MaskCache()
+
+
+class Body:
+    """A collidable item at (x, y) for one step, shaped by a mask centered on it or else a circle of radius"""
+
+    __slots__ = ("item", "group", "x", "y", "radius", "mask", "left", "top")
+
+    def __init__(self, item: Hashable, group, x, y, radius=0, mask: pygame.mask.Mask = None):
+
+        self.item = item
+        self.group = group          # Queries skip bodies of the querying group (e.g. a projectile's team)
+        self.x = x
+        self.y = y
+        self.mask = mask
+
+        if mask is not None:
+            width, height = mask.get_size()
+            self.left = x - width / 2
+            self.top = y - height / 2
+            self.radius = math.hypot(width, height) / 2      # Bounding circle of the mask
+        else:
+            self.left = self.top = None
+            self.radius = radius
+
+    def segment_entry(self, x0, y0, x1, y1) -> Union[float, None]:
+        """Fraction of the segment from (x0, y0) to (x1, y1) at which it enters self, None if it misses"""
+
+        t = circle_entry(self.x, self.y, self.radius, x0, y0, x1, y1)
+        if t is None or self.mask is None:
+            return t
+
+        # Walk the segment through the mask from where it enters the bounding circle
+        mask = self.mask
+        width, height = mask.get_size()
+        dx, dy = x1 - x0, y1 - y0
+        steps = max(int(math.hypot(dx, dy) * (1 - t) / MASK_STEP), 1)
+        for i in range(steps + 1):
+            s = t + (1 - t) * i / steps
+            mx, my = int(x0 + dx * s - self.left), int(y0 + dy * s - self.top)
+            if 0 <= mx < width and 0 <= my < height and mask.get_at((mx, my)):
+                return s
+
+        return None
+
+
+def circle_entry(cx, cy, radius, x0, y0, x1, y1) -> Union[float, None]:
+    """Fraction of the segment at which it enters the circle (0 if it starts inside), None if it misses"""
+
+    fx, fy = x0 - cx, y0 - cy
+    c = fx * fx + fy * fy - radius * radius
+    if c <= 0:
+        return 0
+
+    dx, dy = x1 - x0, y1 - y0
+    a = dx * dx + dy * dy
+    b = fx * dx + fy * dy
+    if a == 0 or b >= 0:
+        return None
+
+    discriminant = b * b - a * c
+    if discriminant < 0:
+        return None
+
+    t = (-b - math.sqrt(discriminant)) / a
+    return t if t <= 1 else None
+
+
+class BroadPhase:
+    """Uniform grid over the bounding boxes of bodies, cleared and refilled every step"""
+
+    def __init__(self, cell_size=64):
+
+        self.cell_size = cell_size
+        self.cells: Dict[Cell, List[Body]] = {}
+        self.bodies: List[Body] = []
+
+    def rebuild(self, bodies: Iterable[Body]):
+
+        self.cells.clear()
+        self.bodies = list(bodies)
+
+        size = self.cell_size
+        cells = self.cells
+        for body in self.bodies:
+            r = body.radius
+            for cx in range(int((body.x - r) // size), int((body.x + r) // size) + 1):
+                for cy in range(int((body.y - r) // size), int((body.y + r) // size) + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket is None:
+                        cells[(cx, cy)] = [body]
+                    else:
+                        bucket.append(body)
+
+    def candidates(self, x0, y0, x1, y1) -> Iterable[Body]:
+        """Bodies whose cells overlap the bounding box of the segment, each once"""
+
+        size = self.cell_size
+        left, right = int(min(x0, x1) // size), int(max(x0, x1) // size)
+        top, bottom = int(min(y0, y1) // size), int(max(y0, y1) // size)
+
+        # Short segments usually stay inside one cell, whose bodies are unique already
+        if left == right and top == bottom:
+            return self.cells.get((left, top), ())
+
+        found = {}
+        for cx in range(left, right + 1):
+            for cy in range(top, bottom + 1):
+                for body in self.cells.get((cx, cy), ()):
+                    found[body] = None
+        return found
+
+    def first_hit(self, x0, y0, x1, y1, group=None) -> Tuple[Union[Body, None], float]:
+        """Body the segment enters first, skipping bodies of group, and the fraction of the segment it entered at"""
+
+        hit, hit_t = None, None
+        for body in self.candidates(x0, y0, x1, y1):
+            if body.group == group and group is not None:
+                continue
+            t = body.segment_entry(x0, y0, x1, y1)
+            if t is not None and (hit is None or t < hit_t):
+                hit, hit_t = body, t
+        return hit, hit_t
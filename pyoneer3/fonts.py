@@ -0,0 +1,85 @@
+import os
+import pygame
+from typing import Dict, List, Tuple, Union
+
+FontKey = Tuple[Union[str, None], int, bool, bool]     # (face, size, bold, italic)
+
+
+class FontRegistry:
+    """
+    Opens every (face, size, bold, italic) once and hands out the same Font to every caller, so Text elements
+    sharing a font also share rendered text in TEXT_CACHE. Faces are font file paths, system font names or None
+    for pygame's default font. Shared fonts must not have their style changed, request another style instead.
+    """
+
+    def __init__(self):
+
+        self.fonts: Dict[FontKey, pygame.font.Font] = {}
+        self.matches: Dict[Tuple[str, bool, bool], Tuple[Union[str, None], bool, bool]] = {}   # Resolved system fonts
+        self._system_fonts: Union[List[str], None] = None
+
+        self.opened = 0
+
+    def get(self, face: Union[str, None], size: int, bold=False, italic=False) -> pygame.font.Font:
+
+        key = (face, size, bold, italic)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = self._open(face, size, bold, italic)
+            self.opened += 1
+        return font
+
+    def _open(self, face, size, bold, italic) -> pygame.font.Font:
+
+        # Files and the default font only have synthetic styles
+        if face is None or os.path.isfile(face):
+            path, fake_bold, fake_italic = face, bold, italic
+        else:
+            path, fake_bold, fake_italic = self.match(face, bold, italic)
+
+        font = pygame.font.Font(path, size)
+        font.set_bold(fake_bold)
+        font.set_italic(fake_italic)
+        return font
+
+    def match(self, name: str, bold=False, italic=False) -> Tuple[Union[str, None], bool, bool]:
+        """
+        Resolves a system font name to (file path, synthetic bold, synthetic italic) the way SysFont does, falling
+        back on the default font when the name is not installed. Results are cached per (name, bold, italic)
+        """
+
+        key = (name, bold, italic)
+        match = self.matches.get(key)
+        if match is None:
+            path = pygame.font.match_font(name, bold, italic)
+            plain = pygame.font.match_font(name) if bold or italic else path
+
+            # match_font falls back on the plain face when the styled one is missing, so fake the style instead
+            if path is None or path == plain:
+                match = (path, bold, italic)
+            else:
+                match = (path, False, False)
+            self.matches[key] = match
+
+        return match
+
+    def system_fonts(self) -> List[str]:
+        """Names of every installed system font, sorted"""
+
+        if self._system_fonts is None:
+            self._system_fonts = sorted(pygame.font.get_fonts())
+        return self._system_fonts
+
+    def clear(self):
+
+        self.fonts.clear()
+        self.matches.clear()
+        self._system_fonts = None
+
+    def __len__(self):
+
+        return len(self.fonts)
+
+
+# Shared by every font user, fonts are only opened on first use so this is safe before pygame.font.init
+FONTS = FontRegistry()
@@ -1,8 +1,18 @@
 import pygame
 from collections import namedtuple
-from typing import List, Union
+from itertools import count
+from typing import Dict, Iterator, List, Sequence, Union
+from .assets import ASSETS
+from .cache import ROTATION_CACHE
+from .spatial import RectGrid
+from .text import GLYPH_ATLAS
+from .text import TEXT_CACHE
+from .trace import DEBUG
+from .trace import TRACER
 pygame.init()
 
+EVENTS = TRACER.channel("pyoneer3.events")
+
 
 XYComplex = namedtuple('XYComplex', 'xScale xOffset yScale yOffset')
 XYSimple = namedtuple('XYSimple', 'xOffset yOffset')
@@ -43,73 +53,483 @@ def clamp_color(rgb):
     return r, g, b
 
 
+def insert_by_priority(children: list, element):
+    """Inserts element after all children of lower or equal priority, keeping children sorted for drawing"""
+
+    low, high = 0, len(children)
+    while low < high:
+        mid = (low + high) // 2
+        if element.priority < children[mid].priority:
+            high = mid
+        else:
+            low = mid + 1
+
+    children.insert(low, element)
+
+
+def merge_rects(rects: List[pygame.Rect]) -> List[pygame.Rect]:
+    """Merges overlapping rects into their unions so no screen area is redrawn twice"""
+
+    merged: List[pygame.Rect] = []
+    for rect in rects:
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect = rect.union(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class EventDispatcher:
+    """Routes events to elements with bound handlers, using a grid over their rects for mouse events"""
+
+    def __init__(self, cell_size=64):
+
+        self.grid = RectGrid(cell_size)
+        self.elements: Dict[UIElement, int] = {}        # Registered element : registration order, used as call order
+        self.universal: Dict[UIElement, None] = {}      # Elements with universal handlers, they receive every event
+        self.inside: Dict[UIElement, None] = {}         # Elements the mouse is inside of, they need mexit events
+        self._order = count()
+
+    def register(self, element):
+
+        if element not in self.elements:
+            self.elements[element] = next(self._order)
+
+        if element.handlers['uevent']:
+            self.universal[element] = None
+        else:
+            self.universal.pop(element, None)
+
+        self.move(element)
+
+    def unregister(self, element):
+
+        self.elements.pop(element, None)
+        self.universal.pop(element, None)
+        self.inside.pop(element, None)
+        self.grid.remove(element)
+
+    def move(self, element):
+        """Reindexes element at its current rect"""
+
+        if element.rect is not None and element in self.elements:
+            self.grid.move(element, element.rect)
+
+    def dispatch(self, event, tick=None):
+
+        targets = set(self.universal)
+
+        # Mouse events only reach elements under the cursor and elements the mouse may have just exited
+        if event.type == pygame.MOUSEBUTTONDOWN or event.type == pygame.MOUSEMOTION:
+            targets.update(element for element in self.grid.query_point(event.pos)
+                           if element.rect.collidepoint(event.pos))
+
+            if event.type == pygame.MOUSEMOTION:
+                targets.update(self.inside)
+
+        for element in sorted(targets, key=lambda e: self.elements.get(e, -1)):
+            element.handle_event(event, tick=tick)
+
+            if element.mouse_inside and element in self.elements:
+                self.inside[element] = None
+            else:
+                self.inside.pop(element, None)
+
+
 class Screen:
 
-    def __init__(self, screen):
+    def __init__(self, screen, dirty_rects=False):
 
         self.screen = screen
         self.scenes: List[Scene] = []
+        self.dispatcher = EventDispatcher()
+
+        # Dirty-rect mode: only areas covered by changed elements are redrawn and presented
+        self.dirty_rects = dirty_rects
+        self.updated_rects: Union[List[pygame.Rect], None] = None     # None = whole screen was redrawn
+        self._active_scenes = None      # Scene activity on the last render, a change forces a full redraw
+
+        self.profiler = None            # profiler.Profiler, render and present lap layout, compose and present into it
 
     def render(self, background_color):
 
-        self.screen.fill(background_color)
+        active_scenes = tuple(scene for scene in self.scenes if scene and scene.active)
+
+        if not self.dirty_rects or active_scenes != self._active_scenes:
+            self._active_scenes = active_scenes
+            self.updated_rects = None
+            if self.profiler:
+                self.profiler.lap("layout")
 
-        for scene in self.scenes:
-            if scene and scene.active:
+            self.screen.fill(background_color)
+            for scene in active_scenes:
                 scene.draw()
 
+            # Everything was just drawn, so pending changes have been presented
+            if self.dirty_rects:
+                for scene in active_scenes:
+                    scene.collect_dirty([])
+            if self.profiler:
+                self.profiler.lap("compose")
+            return
+
+        # Gather the old and new rects of every changed element
+        rects: List[pygame.Rect] = []
+        for scene in active_scenes:
+            scene.collect_dirty(rects)
+
+        screen_rect = self.screen.get_rect()
+        self.updated_rects = [rect for rect in merge_rects([screen_rect.clip(r) for r in rects]) if rect.w and rect.h]
+        if self.profiler:
+            self.profiler.lap("layout")
+
+        # Redraw only the changed areas, clipping so nothing outside of them is touched
+        for rect in self.updated_rects:
+            self.screen.set_clip(rect)
+            self.screen.fill(background_color)
+            for scene in active_scenes:
+                scene.draw(rect)
+        self.screen.set_clip(None)
+        if self.profiler:
+            self.profiler.lap("compose")
+
+    def present(self):
+        """Pushes the last render to the display, only updating changed areas in dirty-rect mode"""
+
+        if self.updated_rects is None:
+            pygame.display.flip()
+
+        elif self.updated_rects:
+            pygame.display.update(self.updated_rects)
+
+        if self.profiler:
+            self.profiler.lap("present")
+
 
 class Scene:
 
     def __init__(self, screen, active=False):
 
         self.active = active
+        self.screen: Screen = screen
         self.surf = screen.screen
         self.children = []
+        self.subtree_dirty = False      # Whether any descendant changed since the last dirty-rect render
+        self.removed_rects: List[pygame.Rect] = []      # Areas of children detached since the last render
+
+        # Flattened descendants, kept up to date by UIElement.set_scene (dicts are used as ordered sets)
+        self.descendants: Dict[UIElement, None] = {}
+        self.handled: Dict[UIElement, None] = {}        # Descendants with bound handlers
+        self.views: Dict[type, Dict[UIElement, None]] = {}      # Descendants by type, created on first use
 
         screen.scenes.append(self)
 
+    def track(self, element):
+
+        self.descendants[element] = None
+        for kind, view in self.views.items():
+            if isinstance(element, kind):
+                view[element] = None
+
+    def untrack(self, element):
+
+        self.descendants.pop(element, None)
+        self.handled.pop(element, None)
+        for view in self.views.values():
+            view.pop(element, None)
+
+    def view(self, kind) -> Dict:
+        """Descendants that are instances of kind, maintained incrementally after the first call"""
+
+        if kind not in self.views:
+            self.views[kind] = {element: None for element in self.descendants if isinstance(element, kind)}
+        return self.views[kind]
+
+    def iter_descendants(self, kind=None) -> Iterator:
+        """Iterates descendants (of kind) without copying, elements must not be attached or detached meanwhile"""
+
+        return iter(self.descendants if kind is None else self.view(kind))
+
     def get_descendants(self):
 
-        descendants = self.children[:]
-        for child in self.children:
-            descendants.extend(child.get_descendants())
-        return descendants
+        return list(self.descendants)
 
-    def draw(self):
+    def collect_dirty(self, rects: List[pygame.Rect]):
+
+        if self.subtree_dirty:
+            self.subtree_dirty = False
+
+            rects.extend(self.removed_rects)
+            self.removed_rects.clear()
+
+            for child in self.children:
+                child.collect_dirty(rects)
+
+    def draw(self, area: pygame.Rect = None):
+        """Draws children, if area is given only children overlapping it are drawn"""
 
-        self.children.sort(key=lambda c: c.priority)
+        # Children are kept in priority order by set_parent and UIElement.priority
         for child in self.children:
-            child.draw_seq()
+            if area is None or child.rect is None or area.colliderect(child.rect):
+                child.draw_seq()
 
 
 class UIElement:
     # TODO: XYComplex position
 
+    # Retained compositing: keep the composite of self and its children in a persistent backbuffer and only
+    # recompose it when something in the subtree changed, instead of copying c_surf every frame
+    retained = False
+
+    # Animatable rel_pos components by property name (see apply_properties), as indices into rel_pos
+    REL_POS_PROPERTIES = {"x_scale": (0,), "x_offset": (1,), "y_scale": (2,), "y_offset": (3,),
+                          "scale": (0, 2), "offset": (1, 3)}
+
     def __init__(self, pos: XYComplex, surf, fill_color=None, render_priority=1):
         super().__init__()
 
-        self.rel_pos = pos               # Tuple in Roblox UDim2 format (xScale, xOffset, yScale, yOffset)
+        self._rel_pos = pos              # Tuple in Roblox UDim2 format (xScale, xOffset, yScale, yOffset)
+        self._abs_pos = None             # Cached absolute position, None when it has to be recalculated
 
         self.surf = surf
         self.c_surf = None               # MANDATORY update call before drawing!
+        self.shared_surf = None          # Surface shared with other elements (e.g. an asset), never drawn on
         self.rect = None
         self.fill_color = fill_color if fill_color else (0, 0, 0)       # *NO FUNCTIONALITY, SIMPLY A MARKER*
-        self.priority = render_priority  # Prioritizes which elements get rendered first. Higher numbers take precedence
-        self.visible = True
+        self._priority = render_priority  # Prioritizes which elements get rendered first. Higher numbers take precedence
+        self._visible = True
+        self._alpha = 255                # Opacity self is drawn with, 0 - 255
 
         # Dictionary of all handler functions (functions that take in/handle events)
         self.active = True          # Determines whether events will be handled
         self.handlers = {'mbd': None, 'mover': None,  'menter': None, 'mexit': None, 'uevent': []}
         self.mouse_inside = False       # Event flag used for mouse-enter and mouse-exit events
 
+        self.scene: Union[Scene, None] = None       # Scene self is drawn in, its screen dispatches events to self
         self.parent = None
         self.children = []
 
+        # Dirty-rect tracking (see Screen.render)
+        self.dirty = True               # Surface, position or visibility changed since last presented
+        self.subtree_dirty = False      # Whether any descendant is dirty
+        self.presented_rect = None      # Screen area covered by self when last presented
+
+        # Retained compositing
+        self.stale = True               # Whether the composite in self.surf has to be rebuilt
+        self._backbuffer = None         # Surface children are composited onto, reused between frames
+        self.revision = 0               # Incremented whenever self.surf is updated or reset for compositing
+
+        # Opt-in draw, surface copy and rotation counts (profiler.ElementCounters), see Profiler.watch
+        self.counters = None
+
+    @property
+    def rel_pos(self):
+
+        return self._rel_pos
+
+    @rel_pos.setter
+    def rel_pos(self, value):
+
+        self._rel_pos = value
+        self.mark_dirty()
+        self.invalidate_position()
+
+    @property
+    def priority(self):
+
+        return self._priority
+
+    @priority.setter
+    def priority(self, value):
+
+        if value == self._priority:
+            return
+
+        self._priority = value
+
+        # Move self to its new place in the parent's draw order
+        if self.parent is not None:
+            self.parent.children.remove(self)
+            insert_by_priority(self.parent.children, self)
+            self.mark_dirty()
+
+    @property
+    def visible(self):
+
+        return self._visible
+
+    @visible.setter
+    def visible(self, value):
+
+        if value != self._visible:
+            self._visible = value
+            self.mark_dirty()
+
+    @property
+    def alpha(self):
+
+        return self._alpha
+
+    @alpha.setter
+    def alpha(self, value):
+
+        if value != self._alpha:
+            self._alpha = value
+            self.mark_dirty()
+
+    def get_property(self, name) -> List[float]:
+        """Current value of an animatable property as a list of components"""
+
+        if name in UIElement.REL_POS_PROPERTIES:
+            return [self.rel_pos[i] for i in UIElement.REL_POS_PROPERTIES[name]]
+        elif name == "fill":
+            return list(self.fill_color)
+        return [getattr(self, name)]
+
+    def apply_properties(self, values: Dict[str, Sequence[float]]):
+        """
+        Sets several animatable properties at once: rel_pos components (REL_POS_PROPERTIES), rot, alpha and fill.
+        rel_pos is assigned once for all its components and only fill redraws the surface, so self is marked dirty
+        once without a surface update unless its fill changed
+        """
+
+        rel_pos = None
+        for name, value in values.items():
+            indices = UIElement.REL_POS_PROPERTIES.get(name)
+            if indices is not None:
+                if rel_pos is None:
+                    rel_pos = list(self.rel_pos)
+                for i, component in zip(indices, value):
+                    rel_pos[i] = component
+
+            elif name == "alpha":
+                self.alpha = min(max(int(round(value[0])), 0), 255)
+
+            elif name == "fill":
+                self.fill(clamp_color([int(round(c)) for c in value]))
+                self.update()
+
+            else:
+                setattr(self, name, value[0])
+
+        if rel_pos is not None and tuple(rel_pos) != tuple(self.rel_pos):
+            self.rel_pos = tuple(rel_pos)
+
+    def fill(self, color):
+        """Fills self.surf with color, update has to be called afterwards"""
+
+        assert self.surf is not self.shared_surf, "Attempted to fill a shared surface"
+        self.surf.fill(color)
+
+    def mark_dirty(self):
+        """Flags self as changed and its ancestors as having a changed descendant"""
+
+        self.dirty = True
+
+        # Ancestors composite self, so their composites are stale as well
+        node = self.parent
+        while isinstance(node, UIElement) and not (node.subtree_dirty and node.stale):
+            node.subtree_dirty = True
+            node.stale = True
+            node = node.parent
+
+        if node is not None:
+            node.subtree_dirty = True
+
+    def collect_dirty(self, rects: List[pygame.Rect]):
+        """Appends the screen areas that changed since the last call and clears dirty flags"""
+
+        if self.dirty:
+            self.dirty = False
+
+            if self.presented_rect:
+                rects.append(self.presented_rect)
+            self.presented_rect = None
+
+            if self.rect is not None:
+                self.update_rect()
+                if self.visible:
+                    self.presented_rect = self.rect.copy()
+                    rects.append(self.presented_rect)
+
+        if self.subtree_dirty:
+            self.subtree_dirty = False
+            for child in self.children:
+                child.collect_dirty(rects)
+
+    def clear_dirty(self):
+        """Clears dirty flags of self and descendants without collecting any areas"""
+
+        self.dirty = False
+        if self.subtree_dirty:
+            self.subtree_dirty = False
+            for child in self.children:
+                child.clear_dirty()
+
     def set_parent(self, parent):
 
+        self.detach()
+
         self.parent: Union[Scene, UIElement] = parent
-        self.parent.children.append(self)
+        insert_by_priority(self.parent.children, self)
+        self.mark_dirty()
+        self.invalidate_position()
+        self.set_scene(parent if isinstance(parent, Scene) else parent.scene)
+
+    def detach(self):
+        """Removes self (and its subtree) from its parent and scene"""
+
+        parent = self.parent
+        if parent is None:
+            return
+
+        parent.children.remove(self)
+
+        # Whatever self covered has to be redrawn
+        if isinstance(parent, UIElement):
+            parent.stale = True
+            parent.mark_dirty()
+
+        elif self.presented_rect:
+            parent.removed_rects.append(self.presented_rect)
+            parent.subtree_dirty = True
+
+        self.presented_rect = None
+        self.parent = None
+        self.invalidate_position()
+        self.set_scene(None)
+
+    def set_scene(self, scene):
+        """Moves self and descendants into scene, keeping its descendant views and event dispatcher up to date"""
+
+        if scene is self.scene:
+            return
+
+        if self.scene is not None:
+            self.scene.untrack(self)
+            self.scene.screen.dispatcher.unregister(self)
+
+        self.scene = scene
+        if scene is not None:
+            scene.track(self)
+            self.update_registration()
+
+        for child in self.children:
+            child.set_scene(scene)
+
+    def update_registration(self):
+        """Registers self for events if any handlers are bound, unregisters otherwise"""
+
+        if self.scene is None:
+            return
+
+        if any(self.handlers.values()):
+            self.scene.handled[self] = None
+            self.scene.screen.dispatcher.register(self)
+        else:
+            self.scene.handled.pop(self, None)
+            self.scene.screen.dispatcher.unregister(self)
 
     def get_descendants(self):
 
@@ -118,6 +538,13 @@ class UIElement:
             descendants.extend(child.get_descendants())
         return descendants
 
+    def iter_descendants(self) -> Iterator:
+        """Yields descendants depth first without building intermediate lists"""
+
+        for child in self.children:
+            yield child
+            yield from child.iter_descendants()
+
     def offset(self, offset: XYComplex):
 
         self.rel_pos = tuple(self.rel_pos[i] + c for i, c in enumerate(offset))
@@ -133,31 +560,64 @@ class UIElement:
             pos.yOffset - self.surf.get_height()/2
         )
 
+    def invalidate_position(self):
+        """Drops the cached absolute position of self and all descendants"""
+
+        # A cached descendant always implies a cached ancestor, so an uncached node has no cached descendants
+        if self._abs_pos is None:
+            return
+
+        self._abs_pos = None
+        for child in self.children:
+            child.invalidate_position()
+
     def calculate_absolute_position(self):
 
-        # Calculate absolute position of parents in their parents up to top
-        position_chain: List[XYSimple] = []
-        current_object = self
-        while isinstance(current_object, UIElement):
-            position_chain.append(convert_absolute(current_object.rel_pos, current_object.parent.surf))
+        # Absolute position is the position in the parent plus the parent's absolute position, cached until invalidated.
+        # Blits truncate positions to whole pixels at every level of the tree, so the position is truncated the same way
+        if self._abs_pos is None:
+            x, y = convert_absolute(self.rel_pos, self.parent.surf)
+            parent_x, parent_y = self.parent_origin()
+            self._abs_pos = XYSimple(parent_x + int(x), parent_y + int(y))
+
+        return self._abs_pos
 
-            current_object = current_object.parent
+    def parent_origin(self) -> XYSimple:
+        """Screen position of the parent's surface, where positions in the parent are measured from"""
 
-        # Sum up position_chain to get absolute position of self by unzipping to get list of x and y values and then sum
-        individual_xy = list(zip(*position_chain))
-        return XYSimple(sum(individual_xy[0]), sum(individual_xy[1]))
+        if isinstance(self.parent, UIElement):
+            return self.parent.calculate_absolute_position()
+        return XYSimple(0, 0)
 
     def update_rect(self):
 
         self.rect = self.surf.get_rect()
         self.rect.topleft = self.calculate_absolute_position()
+        self.index_rect()
+
+    def index_rect(self):
+        """Keeps the event dispatcher's index in sync with self.rect, called whenever rect is recalculated"""
+
+        if self.scene is not None:
+            self.scene.screen.dispatcher.move(self)
 
     def update(self):
 
         assert self.surf, "Attempted to update without surface"
 
-        self.c_surf = self.surf.copy()
+        # Children positioned with scales move when self is resized
+        if self.c_surf is not None and self.c_surf.get_size() != self.surf.get_size():
+            for child in self.children:
+                child.invalidate_position()
+
+        # Shared surfaces are never drawn on, so they can be reset from without a private copy
+        self.c_surf = self.surf if self.surf is self.shared_surf else self.surf.copy()
+        if self.counters is not None and self.c_surf is not self.surf:
+            self.counters.copies += 1
+        self.revision += 1
         self.update_rect()
+        self.stale = True
+        self.mark_dirty()
 
     def draw_children(self, reset_surf=True):
 
@@ -167,14 +627,45 @@ class UIElement:
         if not self.visible:
             return
 
-        if reset_surf:
+        if self.retained:
+            # Cached composite is still current, it is blitted as is by draw
+            if not self.stale:
+                return
+            self.stale = False
+
+            # Leaves never had anything composited onto them, so there is nothing to reset
+            if reset_surf and (self.children or self._backbuffer is not None):
+                self.reset_surf()
+
+        elif reset_surf:
             # Reset self.surf by overriding it with c_surf
             self.surf = self.c_surf.copy()
+            if self.counters is not None:
+                self.counters.copies += 1
 
-        self.children.sort(key=lambda c: c.priority)       # Sort children in order based off of priority
+        # Children are kept in order based off of priority
         for child in self.children:
             child.draw_seq()
 
+    def reset_surf(self):
+        """Restores self.surf to c_surf, in retained mode by overwriting the backbuffer in place"""
+
+        self.revision += 1
+        if self.counters is not None:
+            self.counters.copies += 1       # Resetting the backbuffer in place copies every pixel all the same
+
+        if not self.retained:
+            self.surf = self.c_surf.copy()
+
+        # Backbuffer is only allocated again after self.surf was replaced or resized
+        elif self.surf is not self._backbuffer or self.surf.get_size() != self.c_surf.get_size():
+            self.surf = self._backbuffer = self.c_surf.copy()
+
+        else:
+            # Blending onto a cleared surface with BLEND_RGBA_MAX copies pixels exactly, alpha included
+            self.surf.fill((0, 0, 0, 0))
+            self.surf.blit(self.c_surf, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+
     def draw(self):
 
         assert self.surf, "Attempted to render UIElement without surface"
@@ -184,7 +675,23 @@ class UIElement:
         if not self.visible:
             return
 
-        self.parent.surf.blit(self.surf, convert_absolute(self.rel_pos, self.parent.surf))
+        self.blit_to_parent(self.surf, convert_absolute(self.rel_pos, self.parent.surf))
+
+    def blit_to_parent(self, surf, pos):
+        """Blits surf onto the parent's surface at pos, faded by self.alpha"""
+
+        if self.counters is not None:
+            self.counters.draws += 1
+
+        if self._alpha == 255:
+            self.parent.surf.blit(surf, pos)
+            return
+
+        # Surfaces may be shared (assets, cached rotations), so their own alpha is restored after blitting
+        previous = surf.get_alpha()
+        surf.set_alpha(self._alpha)
+        self.parent.surf.blit(surf, pos)
+        surf.set_alpha(previous)
 
     def draw_seq(self):
 
@@ -196,44 +703,55 @@ class UIElement:
         """Bind handler to mouse button down event takes in self and event"""
 
         self.handlers['mbd'] = handler
+        self.update_registration()
 
     def bind_mover(self, handler):
         """Bind handler to mouse over event takes in self and event"""
 
         self.handlers['mover'] = handler
+        self.update_registration()
 
     def bind_menter(self, handler):
 
         self.handlers['menter'] = handler
+        self.update_registration()
 
     def bind_mexit(self, handler):
 
         self.handlers['mexit'] = handler
+        self.update_registration()
 
     def bind_u(self, handler):
         """Universal event handler function takes in self and event"""
 
         self.handlers['uevent'].append(handler)
+        self.update_registration()
 
     def unbind_mbd(self):
 
         self.handlers['mbd'] = None
+        self.update_registration()
 
     def unbind_mover(self):
 
         self.handlers['mover'] = None
+        self.update_registration()
 
     def unbind_menter(self):
 
         self.handlers['menter'] = None
+        self.update_registration()
 
     def unbind_mexit(self):
 
         self.handlers['mexit'] = None
+        self.update_registration()
 
     def unbind_u(self, index=-1):
 
-        return self.handlers['uevent'].pop(index)
+        handler = self.handlers['uevent'].pop(index)
+        self.update_registration()
+        return handler
 
     def handle_event(self, event, tick=None):
 
@@ -299,18 +817,31 @@ class ScrollingFrame(UIElement):
         self.bind_mexit(self._mexit)
 
     def _menter(self, *_):
-        print("menter")
+
+        if __debug__ and EVENTS.level <= DEBUG:
+            EVENTS.debug("Mouse entered %s", self)
         self.mouse_over = True
 
     def _mexit(self, *_):
-        print("mexit")
+
+        if __debug__ and EVENTS.level <= DEBUG:
+            EVENTS.debug("Mouse exited %s", self)
         self.mouse_over = False
 
+    def collect_dirty(self, rects: List[pygame.Rect]):
+        """Contents are scrolled, so any change inside redraws the whole window"""
+
+        if self.subtree_dirty:
+            self.clear_dirty()
+            self.dirty = True
+        super().collect_dirty(rects)
+
     def update_rect(self):
         """Overrides update_rect of parent - rect is not self.surf's rect, it is self.window's rect"""
 
         self.rect = self.window.get_rect()
         self.rect.topleft = self.calculate_absolute_position()
+        self.index_rect()
 
     def update(self):
 
@@ -360,7 +891,7 @@ class ScrollingFrame(UIElement):
                     self.window
                 )
             )
-        self.parent.surf.blit(self.window, convert_absolute(self.rel_pos, self.parent.surf))
+        self.blit_to_parent(self.window, convert_absolute(self.rel_pos, self.parent.surf))
 
     def scroll_handler(self, uie, event, tick):
 
@@ -383,6 +914,7 @@ class ScrollingFrame(UIElement):
                     )
 
             self.scroll()
+            self.mark_dirty()
 
     def scroll(self):
 
@@ -400,20 +932,29 @@ class Option(UIElement):
 
 class Text(UIElement):
 
-    def __init__(self, pos: XYComplex, size: XYSimple, text, fill_color, font, *font_args, render_priority=1):
+    def __init__(self, pos: XYComplex, size: XYSimple, text, fill_color, font, *font_args, render_priority=1, glyphs=False):
         # noinspection
         super().__init__(pos, None, fill_color, render_priority)
 
         self._text = text
         self.font = font
         self.font_args = list(font_args)
+        self.glyphs = glyphs        # Compose text from cached glyphs, for text that changes often (counters, HUD)
         self.text_surf = None
+        self.owns_text_surf = False     # Whether text_surf was rendered for self alone, rather than shared by TEXT_CACHE
         self.surf = pygame.Surface(size, pygame.SRCALPHA)
         self.draw_text()
 
     def render_text(self):
 
-        self.text_surf = self.font.render(str(self._text), *self.font_args)
+        # Renders are cached, so text_surf may be shared and is only drawn into again if self owns it
+        if self.glyphs:
+            target = self.text_surf if self.owns_text_surf else None
+            self.text_surf = GLYPH_ATLAS.render(self.font, str(self._text), *self.font_args, target=target)
+            self.owns_text_surf = True
+        else:
+            self.text_surf = TEXT_CACHE.render(self.font, str(self._text), *self.font_args)
+            self.owns_text_surf = False
 
     def blit_text(self):
 
@@ -426,6 +967,11 @@ class Text(UIElement):
              int(self.surf.get_height() / 2) - int(self.text_surf.get_height() / 2))
         )     # Blit text to center of button;
 
+    def fill(self, color):
+
+        self.fill_color = color
+        self.blit_text()
+
     def draw_text(self):
         """Renders and blits text surf on final surf"""
 
@@ -446,33 +992,84 @@ class Text(UIElement):
 
 class Image(UIElement):
 
-    def __init__(self, pos: XYComplex, image_path, render_priority=1):
-        super().__init__(pos, pygame.image.load(image_path).convert_alpha(), render_priority)
+    def __init__(self, pos: XYComplex, image_path, render_priority=1, size=None):
+        # No image path = no surface, for elements that are simulated but never drawn (see GameObject.headless)
+        super().__init__(pos, ASSETS.load(image_path, size) if image_path is not None else None, render_priority)
 
+        # Image surfaces come from the shared asset cache, replace self.surf instead of drawing on it
         self.image_path = image_path
+        self.shared_surf = self.surf
 
 
 class Sprite(Image, pygame.sprite.Sprite):
 
-    def __init__(self, pos: XYComplex, image_path, anchor=1, render_priority=1):
-        super().__init__(pos, image_path, render_priority)
+    def __init__(self, pos: XYComplex, image_path, anchor=1, render_priority=1, size=None):
+        super().__init__(pos, image_path, render_priority, size)
 
         self.anchor = anchor
-        self.rot = 0  # Sprite rotation
+        self._rot = 0  # Sprite rotation
 
-    def update_rect(self):
+        self.rotation_cache = ROTATION_CACHE    # None = rotate exactly, the cache quantizes angles
+        self._rotated = None                    # (key, rotated surf, rect) of the last exact rotation
+
+    @property
+    def rot(self):
+
+        return self._rot
+
+    @rot.setter
+    def rot(self, value):
+
+        if value != self._rot:
+            self._rot = value
+            self.mark_dirty()
+
+    def rotated_surface(self):
+        """self.surf rotated by self.rot and its rect at (0, 0), computed at most once per rotation and revision"""
 
-        rotated_surf = pygame.transform.rotate(self.surf, self.rot)
+        # Nothing is composited onto leaves, so they look like c_surf and can share rotations of it
+        if self.rotation_cache is not None and not self.children and self.c_surf is not None:
+            if self.counters is None:
+                return self.rotation_cache.rotate(self.c_surf, self.rot)
 
-        self.rect = rotated_surf.get_rect()
+            misses = self.rotation_cache.cache.misses
+            rotated = self.rotation_cache.rotate(self.c_surf, self.rot)
+            self.counters.rotations += self.rotation_cache.cache.misses - misses
+            return rotated
+
+        key = (self.surf, self.rot, self.revision)
+        if self._rotated is None or self._rotated[0] != key:
+            rotated_surf = pygame.transform.rotate(self.surf, self.rot)
+            if self.counters is not None:
+                self.counters.rotations += 1
+            self._rotated = (key, rotated_surf, rotated_surf.get_rect())
+
+        return self._rotated[1], self._rotated[2]
+
+    def draw_offset(self) -> XYSimple:
+        """Offset from rel_pos that self is drawn at, used to interpolate between simulation steps"""
+
+        return XYSimple(0, 0)
+
+    def update_rect(self):
+
+        self.rect = self.rotated_surface()[1].copy()
+        x, y = convert_absolute(self.rel_pos, self.parent.surf)
+        dx, dy = self.draw_offset()
 
         # Anchor at topleft
         if self.anchor == 0:
-            self.rect.topleft = self.calculate_absolute_position()
+            left, top = x + dx, y + dy
 
         # Anchor at mid:
-        elif self.anchor == 1:
-            self.rect.center = self.calculate_absolute_position()
+        else:
+            left, top = x + dx - self.rect.width/2, y + dy - self.rect.height/2
+
+        # Truncated like the blit in draw, a rounded rect would miss the edge the sprite was drawn on
+        origin_x, origin_y = self.parent_origin()
+        self.rect.topleft = (origin_x + int(left), origin_y + int(top))
+
+        self.index_rect()
 
     def draw(self):
         assert self.surf, "Attempted to render UIElement without surface"
@@ -482,11 +1079,12 @@ class Sprite(Image, pygame.sprite.Sprite):
         if not self.visible:
             return
 
-        rotated_surf = pygame.transform.rotate(self.surf, self.rot)
+        rotated_surf = self.rotated_surface()[0]
+        x, y = convert_absolute(self.rel_pos, self.parent.surf)
+        dx, dy = self.draw_offset()
 
         if self.anchor == 0:
-            self.parent.surf.blit(rotated_surf, convert_absolute(self.rel_pos, self.parent.surf))
+            self.blit_to_parent(rotated_surf, (x + dx, y + dy))
 
         else:
-            x, y = convert_absolute(self.rel_pos, self.parent.surf)
-            self.parent.surf.blit(rotated_surf, (x - rotated_surf.get_width()/2, y - rotated_surf.get_height()/2))
\ No newline at end of file
+            self.blit_to_parent(rotated_surf, (x + dx - rotated_surf.get_width()/2, y + dy - rotated_surf.get_height()/2))
\ No newline at end of file
@@ -1,44 +1,127 @@
 import math
+from typing import Callable, Dict, Hashable, Tuple
+
+LUT_SIZE = 256          # Entries in every easing lookup table, sampled evenly over [0, 1]
+
+_TABLES: Dict[Hashable, Tuple[float, ...]] = {}     # Shared lookup tables by curve and parameters
+
+
+def lookup_table(key: Hashable, curve: Callable[[float], float]) -> Tuple[float, ...]:
+    """Table of curve sampled at LUT_SIZE evenly spaced points of [0, 1], built once per key"""
+
+    table = _TABLES.get(key)
+    if table is None:
+        table = _TABLES[key] = tuple(curve(i / (LUT_SIZE - 1)) for i in range(LUT_SIZE))
+    return table
+
+
+def sample(table, f):
+    """Linearly interpolated value of a lookup table at f, clamped to [0, 1]"""
+
+    if f <= 0:
+        return table[0]
+    if f >= 1:
+        return table[-1]
+
+    scaled = f * (len(table) - 1)
+    lo = int(scaled)
+    return table[lo] + (table[lo + 1] - table[lo]) * (scaled - lo)
+
+
+def power_curve(power, mode):
+    """Ease in (slow start), out (slow end) or in_out (both) with f ** power"""
+
+    if mode == "in":
+        return lambda f: f ** power
+    elif mode == "out":
+        return lambda f: 1 - (1 - f) ** power
+    elif mode == "in_out":
+        return lambda f: (2 * f) ** power / 2 if f < 0.5 else 1 - (2 - 2 * f) ** power / 2
+    raise ValueError("Unknown easing mode %r" % mode)
+
+
+def bezier_table(p1, p2) -> Tuple[float, ...]:
+    """Lookup table of the CSS style cubic bezier from (0, 0) to (1, 1) with control points p1 and p2"""
+
+    def build():
+
+        # Sample the curve densely along its parameter, then resample it evenly along x
+        steps = LUT_SIZE * 8
+        points = []
+        for i in range(steps + 1):
+            s = i / steps
+            a, b, c = (1 - s) ** 2 * s * 3, (1 - s) * s ** 2 * 3, s ** 3
+            points.append((a * p1[0] + b * p2[0] + c, a * p1[1] + b * p2[1] + c))
+
+        table = []
+        j = 0
+        for i in range(LUT_SIZE):
+            x = i / (LUT_SIZE - 1)
+            while j < steps - 1 and points[j + 1][0] < x:
+                j += 1
+            (x0, y0), (x1, y1) = points[j], points[j + 1]
+            table.append(y0 if x1 == x0 else y0 + (y1 - y0) * min(max((x - x0) / (x1 - x0), 0), 1))
+        return tuple(table)
+
+    key = ("bezier", tuple(p1), tuple(p2))
+    table = _TABLES.get(key)
+    if table is None:
+        table = _TABLES[key] = build()
+    return table
+
+
+def spring_curve(frequency, damping):
+    """Damped spring released from 0 towards 1, frequency in radians per duration, damping ratio below 1"""
+
+    damped = frequency * math.sqrt(1 - damping ** 2)
+
+    def spring(f):
+        decay = math.exp(-damping * frequency * f)
+        return 1 - decay * (math.cos(damped * f) + damping * frequency / damped * math.sin(damped * f))
+
+    # Spread whatever the spring has left to settle at f = 1 over the curve so it ends exactly on 1
+    residual = 1 - spring(1)
+    return lambda f: spring(f) + residual * f
 
 
 class Interpolator:
+    """
+    Maps the fraction of a tween's duration that has elapsed to the fraction of its path covered (ease), looked up in a
+    precomputed table. Positions are evaluated directly from the tween's start and change, so tweens are seekable.
+    coefficients is the rate in pixels per second used to derive durations: distance = coefficients * time + constant
+    """
 
     def __init__(self, coefficients, constant=0):
 
         self.coefficients = coefficients
         self.constant = constant
+        self.table: Tuple[float, ...] = None    # Ease lookup table, shared by every interpolator with the same curve
 
-    def interpolate(self, animation, delta):
-
-        raise NotImplementedError()
+    def ease(self, f):
 
-    def compute_duration(self, start, end):
+        return sample(self.table, f)
 
-        raise NotImplementedError()
+    def interpolate(self, animation, delta=None):
+        """Sets animation's position to where it is at its current time, delta is only kept for compatibility"""
 
-    def compute_coefficients(self, duration):
+        eased = self.ease(animation.t / animation.end_t if animation.end_t > 0 else 1)
+        animation.pos = [s + c * eased for s, c in zip(animation.start_pos, animation.change)]
 
-        raise NotImplementedError()
+    def compute_duration(self, distance):
+        """Milliseconds to cover distance, the length of a tween's path in any number of dimensions"""
 
-    @staticmethod
-    def find_change(start, to, dist):
+        # distance = coefficient * time + constant
+        # distance - constant = coefficient * time
+        # (distance - constant)/coefficient = time
+        time = (distance - self.constant)/self.coefficients
+        return time * 1000
 
-        w = to[0] - start[0]
-        h = to[1] - start[1]
-        if w == 0 and h == 0:
-            dx = 0
-            dy = 0
-        elif w == 0:
-            dx = 0
-            dy = dist
-        elif h == 0:
-            dx = dist
-            dy = 0
-        else:
-            dx = math.sqrt((dist ** 2 * w ** 2) / (h ** 2 + w ** 2))
-            dy = dx * h / w
+    def compute_coefficients(self, duration, distance):
+        """Rate that covers distance in duration milliseconds, interpolators may be shared so their own is left alone"""
 
-        return dx, dy
+        if duration > 0:
+            return (distance - self.constant) / (duration / 1000)
+        return self.coefficients
 
 
 class LinearInterpolator(Interpolator):
@@ -46,36 +129,46 @@ class LinearInterpolator(Interpolator):
     def __init__(self, rate: int, constant=0):
         super(LinearInterpolator, self).__init__(rate, constant)
 
-    def interpolate(self, animation, delta):
+        self.table = lookup_table("linear", lambda f: f)
 
-        dist = self.coefficients * (delta/1000) + self.constant
+    def ease(self, f):
 
-        # Special cases: if the movement is only horizontally or vertically
-        # No movement
-        if animation.end_pos == animation.start_pos:
-            return
+        return min(max(f, 0), 1)
 
-        # Vertical movement only (x stays constant)
-        elif animation.end_pos[0] - animation.start_pos[0] == 0:
-            animation.pos[1] += dist
 
-        # Horizontal movement only
-        elif animation.end_pos[1] - animation.start_pos[1] == 0:
-            animation.pos[0] += dist
+class PowerInterpolator(Interpolator):
 
-        # Both horizontal and vertical movement
-        else:
-            dx, dy = Interpolator.find_change(animation.start_pos, animation.end_pos, dist)
-            animation.pos[0] += dx
-            animation.pos[1] += dy
+    def __init__(self, rate, power, mode="in_out", constant=0):
+        super().__init__(rate, constant)
 
-    def compute_duration(self, start, end):
+        self.table = lookup_table(("power", power, mode), power_curve(power, mode))
 
-        # distance = coefficient * time + constant
-        # distance - constant = coefficient * time
-        # (distance - constant)/coefficient = time
-        time = (math.sqrt((end[0]-start[0])**2 + (end[1]-start[1])**2) - self.constant)/self.coefficients
-        return time * 1000
 
-    def compute_coefficients(self, duration):
-        pass
+class QuadInterpolator(PowerInterpolator):
+
+    def __init__(self, rate, mode="in_out", constant=0):
+        super().__init__(rate, 2, mode, constant)
+
+
+class CubicInterpolator(PowerInterpolator):
+
+    def __init__(self, rate, mode="in_out", constant=0):
+        super().__init__(rate, 3, mode, constant)
+
+
+class BezierInterpolator(Interpolator):
+
+    def __init__(self, rate, p1=(0.25, 0.1), p2=(0.25, 1), constant=0):
+        super().__init__(rate, constant)
+
+        assert 0 <= p1[0] <= 1 and 0 <= p2[0] <= 1, "Control point x coordinates must be within [0, 1]"
+        self.table = bezier_table(p1, p2)
+
+
+class SpringInterpolator(Interpolator):
+
+    def __init__(self, rate, frequency=20, damping=0.35, constant=0):
+        super().__init__(rate, constant)
+
+        assert 0 < damping < 1, "Spring damping ratio must be within (0, 1)"
+        self.table = lookup_table(("spring", frequency, damping), spring_curve(frequency, damping))
@@ -0,0 +1,188 @@
+"""
+Object pools for instances created and discarded many times per second (projectiles, effects, damage numbers)
+
+A Pool preallocates instances of one type and hands released ones out again instead of constructing new ones, so
+sustained spawning allocates nothing and leaves no garbage behind. Hooks reset an instance's state when it is acquired
+and when it is released, preallocated instances are released once too. An ElementPool holds UIElements: released
+elements are parked, hidden and inactive but still attached to their parent, so acquiring one again under the same
+parent leaves the parent's children, the scene's descendant views and the event dispatcher untouched.
+
+    numbers = POOLS.register(ElementPool(Text, 32, scene, factory=make_number, acquire=show_number))
+    number = numbers.acquire(scene, "-25", (0, x, 0, y))     # show_number(number, "-25", (0, x, 0, y))
+    ...
+    numbers.release(number)
+
+POOLS.stats() reports every registered pool's hit rate, the share of acquires served without constructing.
+"""
+
+from typing import Callable, Dict, Hashable, List, Set, Union
+from .graphics import Scene, UIElement
+
+
+class Pool:
+
+    def __init__(self, kind: type, capacity=0, factory: Callable = None, acquire: Callable = None,
+                 release: Callable = None):
+
+        self.kind = kind
+        self.factory = factory if factory is not None else kind     # Constructs an instance without arguments
+        self.on_acquire = acquire       # Called with the instance and acquire's arguments, readies it for its new use
+        self.on_release = release       # Called with the instance when it is released, e.g. to drop references
+
+        self.free: List = []
+        self.free_ids: Set[int] = set()     # ids of the free instances, to catch instances released twice
+        self.in_use = 0
+
+        self.hits = 0                   # Acquires served from the free list
+        self.misses = 0                 # Acquires that had to construct
+
+        self.reserve(capacity)
+
+    def reserve(self, count):
+        """Constructs instances until at least count are free, each passed to the release hook like released ones"""
+
+        while len(self.free) < count:
+            instance = self.create()
+            if self.on_release is not None:
+                self.on_release(instance)
+
+            self.free.append(instance)
+            self.free_ids.add(id(instance))
+
+    def create(self):
+
+        return self.factory()
+
+    def take(self):
+
+        if self.free:
+            self.hits += 1
+            instance = self.free.pop()
+            self.free_ids.discard(id(instance))
+        else:
+            self.misses += 1
+            instance = self.create()
+
+        self.in_use += 1
+        return instance
+
+    def acquire(self, *args, **kwargs):
+
+        instance = self.take()
+        if self.on_acquire is not None:
+            self.on_acquire(instance, *args, **kwargs)
+        return instance
+
+    def release(self, instance):
+        """Returns instance to the pool, it must not be used until acquired again"""
+
+        if id(instance) in self.free_ids:
+            raise ValueError("Attempted to release %r, which is already free" % (instance,))
+        if self.on_release is not None:
+            self.on_release(instance)
+
+        self.in_use -= 1
+        self.free.append(instance)
+        self.free_ids.add(id(instance))
+
+    @property
+    def hit_rate(self) -> Union[float, None]:
+
+        acquires = self.hits + self.misses
+        return self.hits / acquires if acquires else None
+
+    def stats(self) -> Dict:
+
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate, "in_use": self.in_use,
+                "free": len(self.free)}
+
+    def reset_stats(self):
+
+        self.hits = self.misses = 0
+
+
+def park(element: UIElement):
+    """Hides element and stops it from handling events without detaching it"""
+
+    element.visible = False
+    element.active = False
+    element.mouse_inside = False
+
+
+def unpark(element: UIElement):
+
+    element.visible = True
+    element.active = True
+
+
+class ElementPool(Pool):
+    """
+    Pool of UIElements acquired into a parent. Parked elements are still drawn over (skipped as invisible) and listed
+    in their scene's descendants, the price of never removing them from their parent's children
+    """
+
+    def __init__(self, kind: type, capacity=0, parent: Union[Scene, UIElement] = None, factory: Callable = None,
+                 acquire: Callable = None, release: Callable = None):
+
+        self.parent = parent            # Elements are created parked in parent, so acquiring them into it is free
+        super().__init__(kind, capacity, factory, acquire, release)
+
+    def create(self) -> UIElement:
+
+        element = self.factory()
+        if self.parent is not None:
+            element.set_parent(self.parent)
+        park(element)
+        return element
+
+    def acquire(self, parent: Union[Scene, UIElement, None], *args, **kwargs) -> UIElement:
+        """Element shown in parent (where it was parked if None), the acquire hook is called once it is attached"""
+
+        element = self.take()
+
+        # Elements only change parents when acquired into a different one than they were parked in
+        if parent is not None and element.parent is not parent:
+            element.set_parent(parent)
+        unpark(element)
+
+        if self.on_acquire is not None:
+            self.on_acquire(element, *args, **kwargs)
+        return element
+
+    def release(self, element: UIElement):
+
+        park(element)
+        super().release(element)
+
+    def drain(self):
+        """Detaches and drops every free element, e.g. before their scene is discarded"""
+
+        for element in self.free:
+            element.detach()
+        self.free.clear()
+        self.free_ids.clear()
+
+
+class Pools:
+    """Registered pools by key (their kind by default), for looking them up and reporting on them together"""
+
+    def __init__(self):
+
+        self.pools: Dict[Hashable, Pool] = {}
+
+    def register(self, pool: Pool, key: Hashable = None) -> Pool:
+
+        self.pools[key if key is not None else pool.kind] = pool
+        return pool
+
+    def get(self, key: Hashable) -> Pool:
+
+        return self.pools[key]
+
+    def stats(self) -> Dict[str, Dict]:
+
+        return {getattr(key, "__name__", str(key)): pool.stats() for key, pool in self.pools.items()}
+
+
+# Shared registry, pools register here to be reported on (e.g. by the profiler's export)
+POOLS = Pools()
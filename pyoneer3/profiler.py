@@ -0,0 +1,247 @@
+"""
+Per-phase frame profiling
+
+A Profiler splits every frame into named phases with laps: begin_frame starts the clock and each lap(phase) charges
+the time since the previous lap to that phase. Screen.render and Screen.present lap layout, compose and present on
+their own when the screen has a profiler. The last capacity frames are kept in a ring buffer and can be exported to
+CSV or JSON, or graphed on screen by a ProfilerOverlay.
+
+    profiler = Profiler()
+    screen.profiler = profiler
+
+    profiler.begin_frame()
+    ...                         # Dispatch events
+    profiler.lap("events")
+    ...                         # Simulate
+    profiler.lap("simulate")
+    screen.render(BLACK)        # Laps layout and compose
+    screen.present()            # Laps present
+    profiler.end_frame()
+
+Elements opt into counters for draw calls, surface copies and rotations with Profiler.watch. JSON exports include the
+hit rates of the pools registered with pool.POOLS.
+"""
+
+import csv
+import json
+import time
+import pygame
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+from .fonts import FONTS
+from .graphics import Scene, Text, UIElement
+from .pool import POOLS
+
+PHASES = ("events", "simulate", "layout", "compose", "present")
+
+# Graph color of each phase, by position in the profiler's phases
+PHASE_COLORS = ((90, 160, 255), (255, 170, 60), (170, 110, 255), (90, 220, 120), (240, 80, 80), (200, 200, 200))
+
+Frame = Tuple[int, float, Tuple[float, ...]]        # (frame number, total milliseconds, milliseconds per phase)
+
+
+class ElementCounters:
+
+    __slots__ = ("draws", "copies", "rotations")
+
+    def __init__(self):
+
+        self.draws = 0          # Blits of the element onto its parent
+        self.copies = 0         # Surface copies made by update and compositing
+        self.rotations = 0      # Rotated surfaces computed (cache misses only)
+
+    def as_dict(self) -> Dict[str, int]:
+
+        return {"draws": self.draws, "copies": self.copies, "rotations": self.rotations}
+
+
+class Profiler:
+
+    def __init__(self, capacity=600, phases=PHASES):
+
+        self.phases = tuple(phases)
+        self.index = {phase: i for i, phase in enumerate(self.phases)}
+        self.frames: Deque[Frame] = deque(maxlen=capacity)
+        self.frame_count = 0
+        self.enabled = True
+
+        self._times = [0.0] * len(self.phases)
+        self._start = None              # perf_counter at begin_frame, None outside of a frame
+        self._last = None               # perf_counter at the last lap
+
+        self.watched: Dict[UIElement, None] = {}    # Elements with counters (dict used as an ordered set)
+
+    def begin_frame(self):
+
+        if not self.enabled:
+            return
+
+        self._times = [0.0] * len(self.phases)
+        self._start = self._last = time.perf_counter()
+
+    def lap(self, phase):
+        """Charges the time since the previous lap (or begin_frame) to phase"""
+
+        if self._start is None:
+            return
+
+        now = time.perf_counter()
+        self._times[self.index[phase]] += (now - self._last) * 1000
+        self._last = now
+
+    def end_frame(self):
+
+        if self._start is None:
+            return
+
+        self.frames.append((self.frame_count, (time.perf_counter() - self._start) * 1000, tuple(self._times)))
+        self.frame_count += 1
+        self._start = None
+
+    def latest(self) -> Frame:
+
+        return self.frames[-1] if self.frames else None
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Mean, median, 99th percentile and max milliseconds of every phase and the whole frame over the buffer"""
+
+        columns = {"frame": [frame[1] for frame in self.frames]}
+        for i, phase in enumerate(self.phases):
+            columns[phase] = [frame[2][i] for frame in self.frames]
+
+        summary = {}
+        for name, samples in columns.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            pick = lambda p: ordered[min(int(p / 100 * len(ordered)), len(ordered) - 1)]
+            summary[name] = {"mean": sum(ordered) / len(ordered), "p50": pick(50), "p99": pick(99), "max": ordered[-1]}
+        return summary
+
+    # Per-element counters
+    def watch(self, element: UIElement, subtree=False):
+        """Opts element (and its descendants if subtree) into counters"""
+
+        elements = [element] + (list(element.iter_descendants()) if subtree else [])
+        for watched in elements:
+            if watched.counters is None:
+                watched.counters = ElementCounters()
+            self.watched[watched] = None
+
+    def unwatch(self, element: UIElement):
+
+        element.counters = None
+        self.watched.pop(element, None)
+
+    def hot_elements(self, count=10, key="draws") -> List[Tuple[UIElement, ElementCounters]]:
+
+        ranked = sorted(self.watched, key=lambda element: getattr(element.counters, key), reverse=True)
+        return [(element, element.counters) for element in ranked[:count]]
+
+    def reset_counters(self):
+
+        for element in self.watched:
+            element.counters = ElementCounters()
+
+    # Export
+    def export_csv(self, path):
+
+        with open(path, "w", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(("frame", "total_ms") + tuple(phase + "_ms" for phase in self.phases))
+            for number, total, times in self.frames:
+                writer.writerow((number, round(total, 4)) + tuple(round(t, 4) for t in times))
+
+    def export_json(self, path):
+
+        report = {
+            "phases": list(self.phases),
+            "summary": self.summary(),
+            "frames": [{"frame": number, "total_ms": total, "phases_ms": dict(zip(self.phases, times))}
+                       for number, total, times in self.frames],
+            "elements": [dict(element=repr(element), **counters.as_dict()) for element, counters in
+                         self.hot_elements(len(self.watched))],
+            "pools": POOLS.stats(),
+        }
+        with open(path, "w") as json_file:
+            json.dump(report, json_file, indent=2)
+
+    def export(self, path):
+        """Exports to CSV if path ends with .csv, JSON otherwise"""
+
+        if path.lower().endswith(".csv"):
+            self.export_csv(path)
+        else:
+            self.export_json(path)
+
+
+class ProfilerOverlay(Scene):
+    """
+    Scrolling graph of per-phase frame times drawn above every other scene. The graph scrolls by one bar per refresh
+    and only draws the newest frame, so it is cheap to keep on
+    """
+
+    def __init__(self, screen, profiler: Profiler, size=(300, 90), scale_ms=33.3, bar_width=2, active=False):
+        super().__init__(screen, active)
+
+        self.profiler = profiler
+        self.scale_ms = scale_ms            # Frame time at the top of the graph
+        self.bar_width = bar_width
+        self._drawn = -1                    # Number of the last frame drawn onto the graph
+
+        self.graph = UIElement((1, -size[0] - 10, 0, 10), pygame.Surface(size, pygame.SRCALPHA))
+        self.graph.retained = True          # Leaves are drawn from surf as is, so refresh can scroll it in place
+        self.graph.set_parent(self)
+        self.graph.surf.fill((0, 0, 0, 160))
+        self.graph.update()
+
+        self.legend = Text((1, -size[0] - 10, 0, size[1] + 12), (size[0], 18), "", (0, 0, 0, 160),
+                           FONTS.get(None, 16), True, (255, 255, 255), glyphs=True)
+        self.legend.set_parent(self)
+        self.legend.update()
+
+        self.raise_to_top()
+
+    def raise_to_top(self):
+        """Moves the overlay after every other scene of its screen, so it is drawn last"""
+
+        self.screen.scenes.remove(self)
+        self.screen.scenes.append(self)
+
+    def refresh(self):
+        """Draws frames profiled since the last refresh, call once per frame before rendering"""
+
+        if not self.active:
+            return
+
+        new_frames = [frame for frame in self.profiler.frames if frame[0] > self._drawn]
+        if not new_frames:
+            return
+
+        surf = self.graph.surf
+        width, height = surf.get_size()
+        for number, total, times in new_frames[-(width // self.bar_width):]:
+            surf.scroll(-self.bar_width, 0)
+            surf.fill((0, 0, 0, 160), (width - self.bar_width, 0, self.bar_width, height))
+
+            # Stack phases from the bottom up
+            y = height
+            for i, phase_time in enumerate(times):
+                bar_height = min(int(phase_time / self.scale_ms * height), y)
+                if bar_height:
+                    y -= bar_height
+                    surf.fill(PHASE_COLORS[i % len(PHASE_COLORS)], (width - self.bar_width, y, self.bar_width, bar_height))
+
+            # 60 fps budget line
+            surf.fill((255, 255, 255, 90), (width - self.bar_width, height - int(1000 / 60 / self.scale_ms * height),
+                                             self.bar_width, 1))
+            self._drawn = number
+
+        # Drawn onto the graph's own surface, so only its area has to be presented again
+        self.graph.revision += 1
+        self.graph.mark_dirty()
+
+        number, total, times = new_frames[-1]
+        self.legend.text = "%.1f ms  " % total + "  ".join(
+            "%s %.1f" % (phase[:3], t) for phase, t in zip(self.profiler.phases, times))
+        self.legend.update()
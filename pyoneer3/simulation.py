@@ -0,0 +1,40 @@
+class FixedTimestep:
+    """
+    Advances a simulation in fixed steps regardless of frame rate, so it neither stalls on idle frames nor
+    speeds up when frames are fast. Elapsed time is accumulated and consumed one step at a time, whatever is
+    left over becomes alpha, the fraction of a step that rendering should interpolate by.
+    """
+
+    def __init__(self, step, dt=1000/60, max_steps=5):
+
+        self.step = step                # Called with dt once per simulation step
+        self.dt = dt                    # Step length in milliseconds
+        self.max_steps = max_steps      # Most steps run per advance, excess time is dropped to avoid a spiral of death
+
+        self.accumulator = 0
+        self.alpha = 0
+        self.time = 0                   # Total simulated time in milliseconds
+        self.steps = 0                  # Total steps run
+        self.dropped = 0                # Total time dropped in milliseconds because max_steps was exceeded
+
+    def advance(self, elapsed):
+        """Runs every step due after elapsed milliseconds and returns how many were run"""
+
+        self.accumulator += elapsed
+
+        steps = 0
+        while self.accumulator >= self.dt and steps < self.max_steps:
+            self.step(self.dt)
+            self.accumulator -= self.dt
+            self.time += self.dt
+            steps += 1
+
+        # Could not catch up, keep only the partial step
+        if self.accumulator >= self.dt:
+            dropped = self.accumulator - self.accumulator % self.dt
+            self.accumulator -= dropped
+            self.dropped += dropped
+
+        self.steps += steps
+        self.alpha = self.accumulator / self.dt
+        return steps
@@ -0,0 +1,153 @@
+import math
+import pygame
+from typing import Dict, Hashable, List, Set, Tuple, Union
+
+Cell = Tuple[int, int]
+
+
+class RectGrid:
+    """Uniform grid over rects, items are stored in every cell their rect overlaps"""
+
+    def __init__(self, cell_size=64):
+
+        self.cell_size = cell_size
+        self.cells: Dict[Cell, Set[Hashable]] = {}
+        self.items: Dict[Hashable, Tuple[tuple, List[Cell]]] = {}     # Item : (indexed rect, cells it occupies)
+
+    def covered_cells(self, rect: pygame.Rect) -> List[Cell]:
+
+        size = self.cell_size
+        return [(x, y)
+                for x in range(rect.left // size, (rect.right - 1) // size + 1)
+                for y in range(rect.top // size, (rect.bottom - 1) // size + 1)]
+
+    def move(self, item, rect: pygame.Rect):
+        """Inserts item or moves it to rect, nothing is done if rect did not change"""
+
+        key = tuple(rect)
+        entry = self.items.get(item)
+        if entry and entry[0] == key:
+            return
+
+        if entry:
+            self._remove_cells(item, entry[1])
+
+        cells = self.covered_cells(rect) if rect.w > 0 and rect.h > 0 else []
+        for cell in cells:
+            self.cells.setdefault(cell, set()).add(item)
+        self.items[item] = (key, cells)
+
+    def remove(self, item):
+
+        entry = self.items.pop(item, None)
+        if entry:
+            self._remove_cells(item, entry[1])
+
+    def _remove_cells(self, item, cells):
+
+        for cell in cells:
+            bucket = self.cells[cell]
+            bucket.discard(item)
+            if not bucket:
+                del self.cells[cell]
+
+    def query_point(self, pos) -> Set[Hashable]:
+        """Items whose cells contain pos, callers still have to test the exact rect"""
+
+        return self.cells.get((int(pos[0]) // self.cell_size, int(pos[1]) // self.cell_size), set())
+
+
+class PointHash:
+    """Uniform grid over points, cleared and refilled wholesale, answering nearest and radius queries"""
+
+    def __init__(self, cell_size=128):
+
+        self.cell_size = cell_size
+        self.cells: Dict[Cell, List[Tuple[Hashable, float, float]]] = {}
+        self.count = 0
+
+        # Bounds of occupied cells, nearest neighbour searches never look past them
+        self.min_cell = None
+        self.max_cell = None
+
+    def clear(self):
+
+        self.cells.clear()
+        self.count = 0
+        self.min_cell = None
+        self.max_cell = None
+
+    def insert(self, item, x, y):
+
+        cell = (int(x // self.cell_size), int(y // self.cell_size))
+        self.cells.setdefault(cell, []).append((item, x, y))
+        self.count += 1
+
+        if self.min_cell is None:
+            self.min_cell = self.max_cell = cell
+        else:
+            self.min_cell = (min(self.min_cell[0], cell[0]), min(self.min_cell[1], cell[1]))
+            self.max_cell = (max(self.max_cell[0], cell[0]), max(self.max_cell[1], cell[1]))
+
+    def nearest(self, x, y, max_dist=math.inf, accept=None) -> Tuple[Union[Hashable, None], float]:
+        """Nearest item closer than max_dist (optionally only items accept returns True for), or (None, max_dist)"""
+
+        best, best_dist = None, max_dist
+        if not self.count:
+            return best, best_dist
+
+        cx, cy = int(x // self.cell_size), int(y // self.cell_size)
+        max_ring = max(cx - self.min_cell[0], self.max_cell[0] - cx, cy - self.min_cell[1], self.max_cell[1] - cy)
+
+        # Searching rings of cells costs more than a linear scan once they outnumber the items
+        if (2 * max_ring + 1) ** 2 > self.count:
+            for bucket in self.cells.values():
+                best, best_dist = self._nearest_in(bucket, x, y, best, best_dist, accept)
+            return best, best_dist
+
+        for ring in range(max_ring + 1):
+
+            # Items in later rings are at least ring cells away
+            if best_dist <= (ring - 1) * self.cell_size:
+                break
+
+            for cell in self._ring_cells(cx, cy, ring):
+                bucket = self.cells.get(cell)
+                if bucket:
+                    best, best_dist = self._nearest_in(bucket, x, y, best, best_dist, accept)
+
+        return best, best_dist
+
+    def query_radius(self, x, y, radius) -> List[Tuple[Hashable, float]]:
+        """All items within radius of (x, y) as (item, distance) pairs"""
+
+        size = self.cell_size
+        found = []
+        for cx in range(int((x - radius) // size), int((x + radius) // size) + 1):
+            for cy in range(int((y - radius) // size), int((y + radius) // size) + 1):
+                for item, ix, iy in self.cells.get((cx, cy), ()):
+                    dist = math.hypot(ix - x, iy - y)
+                    if dist <= radius:
+                        found.append((item, dist))
+        return found
+
+    @staticmethod
+    def _nearest_in(bucket, x, y, best, best_dist, accept):
+
+        for item, ix, iy in bucket:
+            dist = math.hypot(ix - x, iy - y)
+            if dist < best_dist and (accept is None or accept(item)):
+                best, best_dist = item, dist
+        return best, best_dist
+
+    @staticmethod
+    def _ring_cells(cx, cy, ring):
+
+        if ring == 0:
+            return [(cx, cy)]
+
+        cells = [(x, cy - ring) for x in range(cx - ring, cx + ring + 1)]
+        cells += [(x, cy + ring) for x in range(cx - ring, cx + ring + 1)]
+        cells += [(cx - ring, y) for y in range(cy - ring + 1, cy + ring)]
+        cells += [(cx + ring, y) for y in range(cy - ring + 1, cy + ring)]
+        return cells
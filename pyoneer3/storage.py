@@ -0,0 +1,14 @@
+# Structure-of-arrays slot storage
+# Owners keep one NumPy array per field, indexed by slot, and grow all of them together when their slots run out
+
+import numpy as np
+
+
+def grow_arrays(owner, names):
+    """Doubles the length of owner's arrays named names, keeping their contents"""
+
+    for name in names:
+        array = getattr(owner, name)
+        grown = np.zeros((len(array) * 2,) + array.shape[1:], dtype=array.dtype)
+        grown[:len(array)] = array
+        setattr(owner, name, grown)
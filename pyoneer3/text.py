@@ -0,0 +1,78 @@
+import pygame
+from typing import Dict, Tuple
+from .cache import LRUCache, surface_bytes
+
+
+def color_key(color):
+
+    return None if color is None else tuple(color)
+
+
+class TextCache:
+    """Rendered strings keyed by (font, string, antialias, color, background), least recently used evicted first"""
+
+    def __init__(self, max_bytes=16 * 2**20):
+
+        self.cache = LRUCache(max_bytes, surface_bytes)
+
+    def render(self, font: pygame.font.Font, text, antialias, color, background=None) -> pygame.Surface:
+        """Same as font.render, the returned surface is shared and must not be drawn on"""
+
+        key = (font, text, bool(antialias), color_key(color), color_key(background))
+
+        surf = self.cache.get(key)
+        if surf is None:
+            surf = font.render(text, antialias, color, background)
+            self.cache.put(key, surf)
+        return surf
+
+    def clear(self):
+
+        self.cache.clear()
+
+
+class GlyphAtlas:
+    """
+    Single character surfaces per (font, antialias, color, background), composed into strings without calling the
+    rasterizer again. Meant for frequently changing strings (counters, HUD numbers), kerning is not applied.
+    """
+
+    def __init__(self):
+
+        self.glyphs: Dict[Tuple, Dict[str, pygame.Surface]] = {}
+
+    def glyph(self, font: pygame.font.Font, char, antialias, color, background=None) -> pygame.Surface:
+
+        style = (font, bool(antialias), color_key(color), color_key(background))
+        glyphs = self.glyphs.setdefault(style, {})
+
+        surf = glyphs.get(char)
+        if surf is None:
+            surf = glyphs[char] = font.render(char, antialias, color, background)
+        return surf
+
+    def render(self, font: pygame.font.Font, text, antialias, color, background=None,
+               target: pygame.Surface = None) -> pygame.Surface:
+        """Composes text from glyphs, drawing into target instead of a new surface if it has the right size"""
+
+        glyphs = [self.glyph(font, char, antialias, color, background) for char in text]
+        size = (sum(glyph.get_width() for glyph in glyphs), font.get_height())
+
+        if target is None or target.get_size() != size:
+            target = pygame.Surface(size, pygame.SRCALPHA)
+        target.fill(background if background is not None else (0, 0, 0, 0))
+
+        x = 0
+        for glyph in glyphs:
+            target.blit(glyph, (x, 0))
+            x += glyph.get_width()
+        return target
+
+    def clear(self):
+
+        self.glyphs.clear()
+
+
+# Shared by every Text element
+TEXT_CACHE = TextCache()
+GLYPH_ATLAS = GlyphAtlas()
@@ -0,0 +1,140 @@
+import heapq
+from itertools import count
+from typing import Callable, List, Tuple, Union
+
+
+class TimerHandle:
+    """A timer registered with a Scheduler, used to check, reset or cancel it"""
+
+    __slots__ = ("scheduler", "callback", "delay", "interval", "due", "entry")
+
+    def __init__(self, scheduler, callback, delay, interval):
+
+        self.scheduler: Scheduler = scheduler
+        self.callback: Union[Callable[[], None], None] = callback
+        self.delay = delay              # Milliseconds from scheduling until the first expiry
+        self.interval = interval        # Milliseconds between repeats, None = fires once
+        self.due = None                 # Scheduler time of the next expiry
+        self.entry = None               # Id of the heap entry that is current, None = not pending
+
+    @property
+    def pending(self):
+
+        return self.entry is not None
+
+    @property
+    def remaining(self):
+
+        return max(self.due - self.scheduler.time, 0) if self.pending else 0
+
+    def reset(self, delay=None):
+        """Reschedules the timer to expire delay (its original delay by default) milliseconds from now"""
+
+        self.scheduler.push(self, self.delay if delay is None else delay)
+
+    def cancel(self):
+
+        self.scheduler.cancel(self)
+
+
+class Scheduler:
+    """
+    Timers in a min-heap keyed on due time, so advancing costs O(expired timers) however many are pending. Cancelled
+    and reset timers leave their old entries behind, they are skipped when popped and compacted once they pile up.
+    Timers that expire in the same advance are collected first and dispatched together in due order.
+    """
+
+    def __init__(self):
+
+        self.time = 0                   # Milliseconds advanced so far
+        self.heap: List[Tuple[float, int, TimerHandle]] = []       # (due, entry id, handle)
+        self.entries = count()
+        self.pending = 0                # Timers with a current entry, the rest of the heap is stale
+
+        self.dispatched = 0
+
+    def schedule(self, delay, callback: Union[Callable[[], None], None] = None, interval=None) -> TimerHandle:
+        """
+        Calls callback (if any) delay milliseconds from now, then every interval milliseconds if one is given. Timers
+        without a callback only mark when something becomes ready again (e.g. a reload), check them with pending
+        """
+
+        assert interval is None or interval > 0, "Repeating timers need a positive interval"
+
+        handle = TimerHandle(self, callback, delay, interval)
+        self.push(handle, delay)
+        return handle
+
+    def push(self, handle: TimerHandle, delay):
+
+        if handle.entry is None:
+            self.pending += 1
+
+        handle.due = self.time + delay
+        handle.entry = next(self.entries)
+        heapq.heappush(self.heap, (handle.due, handle.entry, handle))
+        self._compact()
+
+    def cancel(self, handle: TimerHandle):
+
+        if handle.entry is not None:
+            handle.entry = None
+            self.pending -= 1
+            self._compact()
+
+    def _compact(self):
+
+        # Rebuild the heap from current entries once stale ones outnumber them
+        if len(self.heap) > 2 * self.pending + 16:
+            self.heap = [entry for entry in self.heap if entry[1] == entry[2].entry]
+            heapq.heapify(self.heap)
+
+    def advance(self, elapsed) -> int:
+        """Moves time forward by elapsed milliseconds, firing every timer that expired, and returns how many did"""
+
+        self.time += elapsed
+        fired = 0
+
+        # Callbacks may compact the heap, so self.heap is looked up again after dispatching
+        while self.heap and self.heap[0][0] <= self.time:
+
+            heap = self.heap
+            expired = []
+            while heap and heap[0][0] <= self.time:
+                _, entry, handle = heapq.heappop(heap)
+                if entry == handle.entry:
+                    expired.append(handle)
+
+            # Repeating timers are rescheduled before any callback runs, so callbacks are free to cancel or reset them
+            for handle in expired:
+                if handle.interval is None:
+                    handle.entry = None
+                    self.pending -= 1
+                else:
+                    handle.due += handle.interval
+                    handle.entry = next(self.entries)
+                    heapq.heappush(heap, (handle.due, handle.entry, handle))
+
+            for handle in expired:
+                if handle.callback is not None:
+                    handle.callback()
+            fired += len(expired)
+
+        self.dispatched += fired
+        return fired
+
+    def clear(self):
+
+        for _, entry, handle in self.heap:
+            handle.entry = None
+        self.heap.clear()
+        self.pending = 0
+        self.time = 0
+
+    def __len__(self):
+
+        return self.pending
+
+
+# Shared by every GameObject, advanced once per simulation step by gameplay.step_world
+SCHEDULER = Scheduler()
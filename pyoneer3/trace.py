@@ -0,0 +1,144 @@
+"""
+Tracing for pyoneer3 and gameplay
+
+Trace calls go to named channels, each with a level. Records below a channel's level are dropped before their
+message is formatted, and records that pass are kept unformatted in a ring buffer so the latest ones can be dumped
+after a crash. Sinks (e.g. echo to stdout) see records as they are traced.
+
+    CONTROLS = TRACER.channel("gameplay.controls")
+
+    # Running with python -O removes the whole block, otherwise it costs one attribute lookup and comparison
+    if __debug__ and CONTROLS.level <= DEBUG:
+        CONTROLS.debug("heading %s", heading)
+
+    TRACER.set_level("gameplay", DEBUG)     # Channels are hierarchical by their dotted names
+    TRACER.echo()                           # Print traced records as they happen
+"""
+
+import sys
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Tuple
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+
+Record = Tuple[float, str, int, str, tuple]     # (time, channel name, level, message format, format arguments)
+
+
+def format_record(record: Record) -> str:
+
+    timestamp, name, level, message, args = record
+    return "%10.3f %-7s %s: %s" % (timestamp, LEVEL_NAMES.get(level, level), name, message % args if args else message)
+
+
+class Channel:
+
+    __slots__ = ("name", "level", "tracer")
+
+    def __init__(self, name, level, tracer):
+
+        self.name = name
+        self.level = level          # Records below this level are dropped
+        self.tracer: Tracer = tracer
+
+    def log(self, level, message, *args):
+
+        if level >= self.level:
+            self.tracer.emit((time.perf_counter(), self.name, level, message, args))
+
+    def debug(self, message, *args):
+
+        if self.level <= DEBUG:
+            self.tracer.emit((time.perf_counter(), self.name, DEBUG, message, args))
+
+    def info(self, message, *args):
+
+        if self.level <= INFO:
+            self.tracer.emit((time.perf_counter(), self.name, INFO, message, args))
+
+    def warning(self, message, *args):
+
+        if self.level <= WARNING:
+            self.tracer.emit((time.perf_counter(), self.name, WARNING, message, args))
+
+    def error(self, message, *args):
+
+        if self.level <= ERROR:
+            self.tracer.emit((time.perf_counter(), self.name, ERROR, message, args))
+
+
+class Tracer:
+
+    def __init__(self, capacity=4096, level=WARNING):
+
+        self.level = level                          # Level of channels without a level of their own
+        self.levels: Dict[str, int] = {}            # Levels set by (dotted) channel name prefix
+        self.channels: Dict[str, Channel] = {}
+        self.buffer: Deque[Record] = deque(maxlen=capacity)
+        self.sinks: List[Callable[[Record], None]] = []
+
+    def channel(self, name) -> Channel:
+
+        channel = self.channels.get(name)
+        if channel is None:
+            channel = self.channels[name] = Channel(name, self.resolve_level(name), self)
+        return channel
+
+    def resolve_level(self, name) -> int:
+        """Level of the longest matching prefix of name set with set_level"""
+
+        while True:
+            if name in self.levels:
+                return self.levels[name]
+            if "." not in name:
+                return self.level
+            name = name.rsplit(".", 1)[0]
+
+    def set_level(self, name, level):
+        """Sets the level of a channel and the channels below it (e.g. "gameplay" covers "gameplay.controls")"""
+
+        if name is None:
+            self.level = level
+        else:
+            self.levels[name] = level
+
+        for channel in self.channels.values():
+            channel.level = self.resolve_level(channel.name)
+
+    def emit(self, record: Record):
+
+        self.buffer.append(record)
+        for sink in self.sinks:
+            sink(record)
+
+    def echo(self, stream=None, level=DEBUG) -> Callable[[Record], None]:
+        """Writes records of level and above to stream (stdout by default) as they are traced, returns the sink"""
+
+        def sink(record):
+            if record[2] >= level:
+                (stream or sys.stdout).write(format_record(record) + "\n")
+
+        self.sinks.append(sink)
+        return sink
+
+    def dump(self, stream=None, last=None):
+        """Writes the buffered records (only the last ones if given) to stream, stderr by default"""
+
+        stream = stream or sys.stderr
+        records = list(self.buffer)[-last:] if last else self.buffer
+        for record in records:
+            stream.write(format_record(record) + "\n")
+
+    def clear(self):
+
+        self.buffer.clear()
+
+
+# Shared by pyoneer3 and gameplay
+TRACER = Tracer()
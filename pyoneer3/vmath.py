@@ -1,50 +1,66 @@
 # Vector math
+# Results are lists, 2D vectors take fast paths that skip the generic loops. Use pyoneer3.vmath_batch for many vectors
+# at once
 
 import math
 
 
 def add(vector1, vector2):
 
+    if len(vector1) == len(vector2) == 2:
+        return [vector1[0] + vector2[0], vector1[1] + vector2[1]]
+
     assert len(vector1) == len(vector2), "Cannot sum two vectors of unequal length"
-    return [vector1[i] + vector2[i] for i in range(len(vector1))]
+    return [a + b for a, b in zip(vector1, vector2)]
 
 
 def sub(vector1, vector2):
 
+    if len(vector1) == len(vector2) == 2:
+        return [vector1[0] - vector2[0], vector1[1] - vector2[1]]
+
     assert len(vector1) == len(vector2), "Cannot subtract two vectors of unequal length"
-    return [vector1[i] - vector2[i] for i in range(len(vector1))]
+    return [a - b for a, b in zip(vector1, vector2)]
 
 
 def mult(vector1, vector2):
 
+    if len(vector1) == len(vector2) == 2:
+        return [vector1[0] * vector2[0], vector1[1] * vector2[1]]
+
     assert len(vector1) == len(vector2), "Cannot multiply two vectors of unequal length"
-    return [vector1[i] * vector2[i] for i in range(len(vector1))]
+    return [a * b for a, b in zip(vector1, vector2)]
 
 
 def dot(vector1, vector2):
 
+    if len(vector1) == len(vector2) == 2:
+        return vector1[0] * vector2[0] + vector1[1] * vector2[1]
+
     assert len(vector1) == len(vector2), "Cannot take the dot product two vectors of unequal length"
-    return sum(vector1[i] * vector2[i] for i in range(len(vector1)))
+    return sum(a * b for a, b in zip(vector1, vector2))
 
 
 def magnitude(vector):
 
-    squares = [x**2 for x in vector]
-    return math.sqrt(sum(squares))
+    return math.hypot(*vector)
 
 
 def normalize(vector):
 
-    m = magnitude(vector)
-    return [x/m for x in vector]
+    m = math.hypot(*vector)
+    if len(vector) == 2:
+        return [vector[0] / m, vector[1] / m]
+    return [x / m for x in vector]
 
 
 def angle_between(heading, point, precomp_dist=None):
 
-    dist = precomp_dist if precomp_dist else math.sqrt(point[0]**2 + point[1]**2)
+    dist = precomp_dist if precomp_dist else math.hypot(point[0], point[1])
 
-    projection = dot(point, heading)
+    projection = point[0] * heading[0] + point[1] * heading[1]
 
-    angle = math.degrees(math.acos(projection/dist))
+    # Rounding can push the cosine just past +-1
+    angle = math.degrees(math.acos(min(max(projection/dist, -1), 1)))
 
     return dist, projection, angle
@@ -0,0 +1,117 @@
+# Vector math on many vectors at once
+# Batched counterparts of pyoneer3.vmath taking (N, 2) NumPy arrays (or anything np.asarray accepts), so a value can
+# be computed for a whole fleet in a few array operations instead of one Python call per ship
+
+import numpy as np
+
+
+def as_vectors(vectors) -> np.ndarray:
+
+    return np.asarray(vectors, dtype=float).reshape(-1, 2)
+
+
+def sub(vectors1, vectors2) -> np.ndarray:
+    """Row-wise differences vectors1 - vectors2"""
+
+    return as_vectors(vectors1) - as_vectors(vectors2)
+
+
+def pairwise_sub(vectors1, vectors2) -> np.ndarray:
+    """(N, M, 2) array of every vectors2[j] - vectors1[i], e.g. the position of each target relative to each ship"""
+
+    return as_vectors(vectors2)[None, :, :] - as_vectors(vectors1)[:, None, :]
+
+
+def dot(vectors1, vectors2) -> np.ndarray:
+
+    vectors1, vectors2 = as_vectors(vectors1), as_vectors(vectors2)
+    return vectors1[:, 0] * vectors2[:, 0] + vectors1[:, 1] * vectors2[:, 1]
+
+
+def cross(vectors1, vectors2) -> np.ndarray:
+    """z component of the cross products, positive where vectors2 is counterclockwise from vectors1 (y up)"""
+
+    vectors1, vectors2 = as_vectors(vectors1), as_vectors(vectors2)
+    return vectors1[:, 0] * vectors2[:, 1] - vectors1[:, 1] * vectors2[:, 0]
+
+
+def magnitude(vectors) -> np.ndarray:
+
+    vectors = as_vectors(vectors)
+    return np.hypot(vectors[:, 0], vectors[:, 1])
+
+
+def normalize(vectors) -> np.ndarray:
+    """Unit vectors, zero vectors stay zero"""
+
+    vectors = as_vectors(vectors)
+    lengths = magnitude(vectors)
+    return np.divide(vectors, lengths[:, None], out=np.zeros_like(vectors), where=lengths[:, None] > 0)
+
+
+def angle_between(headings, points, precomp_dist=None):
+    """(distances, projections, unsigned angles in degrees) of points onto unit headings, as vmath.angle_between"""
+
+    points = as_vectors(points)
+    dist = magnitude(points) if precomp_dist is None else np.asarray(precomp_dist, dtype=float)
+    projection = dot(points, headings)
+
+    cosine = np.divide(projection, dist, out=np.ones_like(projection), where=dist > 0)
+    angle = np.degrees(np.arccos(np.clip(cosine, -1, 1)))
+
+    return dist, projection, angle
+
+
+def signed_angle(headings, vectors) -> np.ndarray:
+    """Angles in degrees within (-180, 180] from each heading to each vector, positive counterclockwise (y up)"""
+
+    return np.degrees(np.arctan2(cross(headings, vectors), dot(headings, vectors)))
+
+
+def ship_headings(rot) -> np.ndarray:
+    """Unit headings of ships rotated by rot degrees, computed the same way as GameObject.calculate_ship_heading"""
+
+    rot = np.asarray(rot, dtype=float)
+    with np.errstate(divide="ignore"):
+        inverse_slope = 1 / np.tan(np.radians(90 + rot))
+
+    forward = (-90 < rot) & (rot < 90)
+    ones = np.ones(len(rot))
+    headings = np.where(forward[:, None],
+                        np.stack((inverse_slope, -ones), axis=1),
+                        np.stack((-inverse_slope, ones), axis=1))
+    # hypot like vmath.normalize, the norm of np.linalg rounds differently far more often
+    return headings / np.hypot(headings[:, 0], headings[:, 1])[:, None]
+
+
+def nearest(points, others=None, chunk=1024):
+    """
+    Index into others (points itself by default, excluding each point) of the nearest other point to every point and
+    the distance to it. Distances are computed in chunks of rows to bound memory at len(others) * chunk
+    """
+
+    points = as_vectors(points)
+    exclude_self = others is None
+    others = points if exclude_self else as_vectors(others)
+
+    indices = np.full(len(points), -1, dtype=int)
+    distances = np.full(len(points), np.inf)
+    if not len(others):
+        return indices, distances
+
+    for start in range(0, len(points), chunk):
+        block = points[start:start + chunk]
+        differences = others[None, :, :] - block[:, None, :]
+        squared = differences[:, :, 0] ** 2 + differences[:, :, 1] ** 2
+
+        if exclude_self:
+            rows = np.arange(len(block))
+            squared[rows, rows + start] = np.inf
+
+        closest = np.argmin(squared, axis=1)
+        indices[start:start + chunk] = closest
+        distances[start:start + chunk] = np.sqrt(squared[np.arange(len(block)), closest])
+
+    # Points without any other point keep -1
+    indices[np.isinf(distances)] = -1
+    return indices, distances
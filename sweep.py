@@ -0,0 +1,201 @@
+"""
+Parameter sweeps over headless battles
+
+Every combination of the grid's values is fought with several seeds across all cores (see battles.py). Each finished
+run is appended to a JSON lines file as soon as it comes in, and runs already in the file are skipped, so an
+interrupted sweep continues where it stopped when started again with the same file.
+
+    python sweep.py fire_rate.jsonl --grid 0.FIRERATE=15,30,60 --grid 0.RANGE=200,250,300 --seeds 20
+    python sweep.py counts.jsonl --grid 1.count=3,4,5 --grid mass=1,2
+
+Grid parameters apply to every team, or to one team when prefixed with its index ("1.count"):
+    count, thrust, gun              Fleet composition (see battles.FLEET)
+    health, mass, turn_rate, max_turn_rate
+    FIRERATE, RANGE, DAMAGE, ...    GUN_STATS entries of the team's gun, fought as a copy of the gun
+    max_time, dt                    Battle length and step, no team prefix
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+from battles import FLEET
+from battles import run_battle
+from battles import run_battles
+from gameplay import GameObject
+from typing import Dict, Iterable, List, Set, Tuple
+
+FLEET_PARAMETERS = ("count", "thrust", "gun")
+STAT_PARAMETERS = ("health", "mass", "turn_rate", "max_turn_rate")
+BATTLE_PARAMETERS = ("max_time", "dt")
+
+
+def parse_value(value: str):
+
+    for kind in (int, float):
+        try:
+            return kind(value)
+        except ValueError:
+            pass
+    return value
+
+
+def parse_grid(assignments: List[str]) -> Dict[str, list]:
+    """NAME=V1,V2,... assignments as {name: values}"""
+
+    grid = {}
+    for assignment in assignments:
+        name, values = assignment.split("=", 1)
+        grid[name] = [parse_value(value) for value in values.split(",")]
+    return grid
+
+
+def grid_points(grid: Dict[str, list]) -> Iterable[Dict]:
+
+    for values in itertools.product(*grid.values()):
+        yield dict(zip(grid, values))
+
+
+def battle_config(params: Dict, seed, teams=2) -> Dict:
+    """run_battle keyword arguments of one grid point"""
+
+    health, mass, (turn_rate, max_turn_rate) = FLEET["stats"]
+    fleets = [dict(FLEET) for _ in range(teams)]
+    stats = [{"health": health, "mass": mass, "turn_rate": turn_rate, "max_turn_rate": max_turn_rate}
+             for _ in range(teams)]
+    gun_overrides = [{} for _ in range(teams)]
+    config = {"seed": seed}
+
+    for name, value in params.items():
+        team, _, key = name.rpartition(".")
+        scope = [int(team)] if team else range(teams)
+
+        if key in BATTLE_PARAMETERS and not team:
+            config[key] = value
+        elif key in FLEET_PARAMETERS:
+            for i in scope:
+                fleets[i][key] = value
+        elif key in STAT_PARAMETERS:
+            for i in scope:
+                stats[i][key] = value
+        elif key.isupper():
+            for i in scope:
+                gun_overrides[i][key] = value
+        else:
+            raise ValueError("Unknown sweep parameter %s" % name)
+
+    # Teams with changed gun stats fight with their own copy of the gun, so the other teams keep the original
+    gun_stats = {}
+    for i, (fleet, overrides) in enumerate(zip(fleets, gun_overrides)):
+        if overrides:
+            gun = "%s@%d" % (fleet["gun"], i)
+            gun_stats[gun] = dict(GameObject.GUN_STATS[fleet["gun"]], **overrides)
+            fleet["gun"] = gun
+
+    for fleet, team_stats in zip(fleets, stats):
+        fleet["stats"] = (team_stats["health"], team_stats["mass"],
+                          (team_stats["turn_rate"], team_stats["max_turn_rate"]))
+
+    config.update(fleets=fleets, gun_stats=gun_stats)
+    return config
+
+
+def run_key(params: Dict, seed) -> str:
+
+    return json.dumps([params, seed], sort_keys=True)
+
+
+def run_task(task: Tuple[Dict, int, int]) -> Dict:
+    """Fights one run in a worker and returns its compact record"""
+
+    params, seed, teams = task
+    result = run_battle(**battle_config(params, seed, teams))
+    return {
+        "params": params,
+        "seed": seed,
+        "winner": result["winner"],
+        "ttk_ms": result["time_ms"] if result["winner"] is not None else None,     # Time until one team was left
+        "shots": [team["shots"] for team in result["teams"]],
+        "survivors": [team["survivors"] for team in result["teams"]],
+    }
+
+
+def completed_runs(path) -> Set[str]:
+    """Keys of the runs in a results file, dropping a last line cut off by an interrupted sweep"""
+
+    if not os.path.exists(path):
+        return set()
+
+    with open(path, "rb+") as results_file:
+        data = results_file.read()
+        end = data.rfind(b"\n") + 1
+        if end != len(data):
+            results_file.truncate(end)
+
+    return {run_key(record["params"], record["seed"])
+            for record in (json.loads(line) for line in data[:end].splitlines() if line.strip())}
+
+
+def summarize(records: Iterable[Dict], teams=2) -> List[Dict]:
+    """Win rates, draws, mean time-to-kill and shots of every grid point, in the order they first appear"""
+
+    points: Dict[str, List[Dict]] = {}
+    for record in records:
+        points.setdefault(json.dumps(record["params"], sort_keys=True), []).append(record)
+
+    summary = []
+    for runs in points.values():
+        decided = [run["ttk_ms"] for run in runs if run["winner"] is not None]
+        summary.append({
+            "params": runs[0]["params"],
+            "runs": len(runs),
+            "win_rate": [sum(run["winner"] == team for run in runs) / len(runs) for team in range(teams)],
+            "draw_rate": 1 - len(decided) / len(runs),
+            "mean_ttk_ms": sum(decided) / len(decided) if decided else None,
+            "mean_shots": [sum(run["shots"][team] for run in runs) / len(runs) for team in range(teams)],
+        })
+    return summary
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("results", help="JSON lines file runs are appended to and resumed from")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=V1,V2,...",
+                        help="Values of a parameter to sweep, may be repeated")
+    parser.add_argument("--seeds", type=int, default=10, help="Runs per grid point, seeded 0 to seeds - 1")
+    parser.add_argument("--teams", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    grid = parse_grid(args.grid)
+    points = list(grid_points(grid))
+    for params in points:
+        battle_config(params, 0, args.teams)     # Reject unknown parameters before starting any workers
+
+    done = completed_runs(args.results)
+    tasks = [(params, seed, args.teams) for params in points for seed in range(args.seeds)
+             if run_key(params, seed) not in done]
+    total = len(points) * args.seeds
+    print("%d runs, %d already done" % (total, total - len(tasks)), file=sys.stderr)
+
+    with open(args.results, "a") as results_file:
+        for finished, record in enumerate(run_battles(tasks, args.workers, ordered=False, run=run_task), 1):
+            results_file.write(json.dumps(record) + "\n")
+            results_file.flush()
+            print("\r%d/%d" % (total - len(tasks) + finished, total), end="", file=sys.stderr)
+    print(file=sys.stderr)
+
+    # Summarize this grid's runs, including those from earlier sessions
+    keys = {run_key(params, seed) for params in points for seed in range(args.seeds)}
+    with open(args.results) as results_file:
+        records = [record for record in map(json.loads, results_file)
+                   if run_key(record["params"], record["seed"]) in keys]
+
+    for point in summarize(records, args.teams):
+        print(json.dumps(point))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+from pyoneer3.animation import AnimationService, Translation
+from pyoneer3.interpolation import CubicInterpolator, LinearInterpolator, QuadInterpolator
+import pytest
+import random
+
+
+FRAME = 1000/60
+
+
+def translations(count, seed, interpolators=(LinearInterpolator,)):
+    """Arguments of count random translations, each with its own interpolator"""
+
+    rng = random.Random(seed)
+    return [([rng.uniform(-500, 500), rng.uniform(-500, 500)], [rng.uniform(-500, 500), rng.uniform(-500, 500)],
+             rng.uniform(100, 1500), rng.choice(interpolators)) for _ in range(count)]
+
+
+def play(batched, arguments, frames=120):
+    """Positions of every translation after each frame, and the order their callbacks fired in"""
+
+    service = AnimationService(batched=batched)
+    finished = []
+    playing = []
+    for i, (start, end, duration, interpolator) in enumerate(arguments):
+        translation = Translation(list(start), list(end), duration, interpolator(200),
+                                  lambda i=i: finished.append(i))
+        translation.start()
+        service.add_animation(translation)
+        playing.append(translation)
+
+    positions = []
+    for frame in range(frames):
+        if frame == 20:
+            playing[0].pause()
+        elif frame == 40:
+            playing[0].start()
+        service.update(FRAME)
+        positions.append([list(translation.pos) for translation in playing])
+
+    return positions, finished
+
+
+def assert_same_playback(arguments):
+
+    positions, finished = play(False, arguments)
+    batched_positions, batched_finished = play(True, arguments)
+
+    assert batched_finished == finished
+    for frame, (expected, batched) in enumerate(zip(positions, batched_positions)):
+        for i, (expected_pos, batched_pos) in enumerate(zip(expected, batched)):
+            assert batched_pos == pytest.approx(expected_pos), "translation %d differs on frame %d" % (i, frame)
+
+
+def test_batch_matches_per_animation_updates():
+
+    assert_same_playback(translations(50, 1))
+
+
+def test_batch_matches_per_animation_updates_with_easing():
+
+    assert_same_playback(translations(50, 2, (LinearInterpolator, QuadInterpolator, CubicInterpolator)))
+
+
+def test_batch_grows_past_its_capacity():
+
+    arguments = translations(200, 3)
+    assert_same_playback(arguments)
+
+    positions, finished = play(True, arguments)
+    assert sorted(finished) == list(range(len(arguments)))
+    assert positions[-1] == [end for _, end, _, _ in arguments]
@@ -0,0 +1,105 @@
+from pyoneer3.animation import Translation, Tween
+from pyoneer3.graphics import UIElement
+from pyoneer3.interpolation import (BezierInterpolator, CubicInterpolator, LinearInterpolator, QuadInterpolator,
+                                    SpringInterpolator, power_curve, sample)
+import pygame
+import pytest
+
+
+@pytest.mark.parametrize("interpolator", [LinearInterpolator(100), QuadInterpolator(100, "in"),
+                                          CubicInterpolator(100, "out"), BezierInterpolator(100),
+                                          SpringInterpolator(100)])
+def test_eases_start_and_end_on_the_path(interpolator):
+
+    assert interpolator.ease(0) == pytest.approx(0)
+    assert interpolator.ease(1) == pytest.approx(1)
+
+
+@pytest.mark.parametrize("mode", ["in", "out", "in_out"])
+def test_lookup_tables_follow_their_curve(mode):
+
+    curve = power_curve(3, mode)
+    table = CubicInterpolator(100, mode).table
+
+    for i in range(101):
+        assert sample(table, i / 100) == pytest.approx(curve(i / 100), abs=1e-4)
+
+
+def test_translations_are_evaluated_from_their_time():
+
+    translation = Translation([10, 20], [110, -80], 1000, QuadInterpolator(100, "in"), lambda: None)
+    translation.start()
+
+    translation.update(250)
+    assert translation.pos == pytest.approx([10 + 100 * 0.25 ** 2, 20 - 100 * 0.25 ** 2], abs=1e-3)
+
+    translation.seek(500)
+    assert translation.pos == pytest.approx([10 + 100 * 0.5 ** 2, 20 - 100 * 0.5 ** 2], abs=1e-3)
+    assert translation.start_pos == [10, 20]
+
+
+def test_reversed_translations_play_back_to_their_start():
+
+    finished = []
+    translation = Translation([0, 0], [30, 40], 1000, LinearInterpolator(50), lambda: finished.append(True))
+    translation.start()
+
+    translation.update(600)
+    translation.reverse()
+    translation.update(400)
+    assert translation.pos == pytest.approx([6, 8])
+
+    translation.update(200)
+    assert finished
+    assert translation.pos == [0, 0]
+
+
+def test_paused_translations_do_not_advance():
+
+    translation = Translation([0, 0], [100, 0], 1000, LinearInterpolator(100), lambda: None)
+    translation.start()
+    translation.update(100)
+    translation.pause()
+    translation.update(100)
+
+    assert translation.t == 100
+    assert translation.pos == pytest.approx([10, 0])
+
+
+def test_duration_of_1d_tween():
+
+    element = UIElement((0, 0, 0, 0), pygame.Surface((10, 10)))
+    tween = Tween(element, "alpha", 0, None, LinearInterpolator(100), start=255)
+
+    # 255 alpha at 100 per second
+    assert tween.end_t == 2550
+
+    tween.start()
+    tween.update(1275)
+    assert tween.pos == [127.5]
+
+
+def test_duration_of_3d_translation():
+
+    translation = Translation([0, 0, 0], [20, 30, 60], None, LinearInterpolator(70), lambda: None)
+
+    # |(20, 30, 60)| = 70
+    assert translation.end_t == 1000
+
+
+def test_duration_of_2d_translation():
+
+    translation = Translation([10, 10], [40, 50], None, LinearInterpolator(25), lambda: None)
+
+    assert translation.end_t == 2000
+
+
+def test_durations_leave_shared_interpolators_alone():
+
+    interpolator = LinearInterpolator(100)
+    timed = Translation([0], [50], 1000, interpolator, lambda: None)
+    untimed = Translation([0], [300], None, interpolator, lambda: None)
+
+    assert timed.rate == 50
+    assert interpolator.coefficients == 100
+    assert untimed.end_t == 3000
@@ -0,0 +1,53 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from battles import FLEET, run_battle, run_battle_config, run_battles
+from gameplay import GameObject
+
+# The game's guns reload once a minute, battles with them rarely end
+FAST_FLEET = dict(FLEET, thrust=0.001)
+FAST_GUNS = {"FIGHTER_GUN_MK1": {"FIRERATE": 0.5}}
+
+
+def outcome(result):
+
+    return result["winner"], result["steps"], result["teams"]
+
+
+def test_battles_are_deterministic():
+
+    assert outcome(run_battle(seed=3, max_time=20000)) == outcome(run_battle(seed=3, max_time=20000))
+
+
+def test_gun_stats_are_restored():
+
+    gun_stats = GameObject.GUN_STATS
+    run_battle(seed=0, max_time=1000, gun_stats={"FIGHTER_GUN_MK1": {"DAMAGE": 1000}})
+
+    assert GameObject.GUN_STATS is gun_stats
+    assert GameObject.GUN_STATS["FIGHTER_GUN_MK1"]["DAMAGE"] == 25
+
+
+def test_pooled_battles_match_serial_ones():
+
+    configs = [{"seed": seed, "max_time": 5000} for seed in range(3)]
+
+    assert [outcome(result) for result in run_battles(configs, workers=2)] == \
+        [outcome(run_battle_config(config)) for config in configs]
+
+
+def test_battle_with_fast_reloads_has_a_winner():
+
+    result = run_battle((FAST_FLEET, FAST_FLEET), seed=1, gun_stats=FAST_GUNS)
+
+    assert result["winner"] == 0
+    assert result["teams"][1]["survivors"] == 0
+    assert result["time_ms"] < 120000
+
+
+def test_physics_backends_fight_the_same_battle():
+
+    result = run_battle((FAST_FLEET, FAST_FLEET), seed=1, gun_stats=FAST_GUNS)
+    batched = run_battle((FAST_FLEET, FAST_FLEET), seed=1, gun_stats=FAST_GUNS, physics=True)
+
+    assert outcome(batched) == outcome(result)
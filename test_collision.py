@@ -0,0 +1,76 @@
+from pyoneer3.collision import Body, BroadPhase
+import pygame
+import pytest
+import random
+
+
+def brute_force_hit(bodies, x0, y0, x1, y1, group=None):
+    """Fraction of the segment at which it first enters any body not of group, by testing every body"""
+
+    entries = [body.segment_entry(x0, y0, x1, y1) for body in bodies if group is None or body.group != group]
+    entries = [t for t in entries if t is not None]
+    return min(entries) if entries else None
+
+
+def ship_mask(width, height):
+    """Mask of a triangle, so segments can cross the mask's box without hitting it"""
+
+    surf = pygame.Surface((width, height), pygame.SRCALPHA)
+    pygame.draw.polygon(surf, (255, 255, 255), ((width // 2, 0), (width - 1, height - 1), (0, height - 1)))
+    return pygame.mask.from_surface(surf)
+
+
+def scattered_bodies(count, seed, masks=()):
+
+    rng = random.Random(seed)
+    bodies = []
+    for i in range(count):
+        x, y = rng.uniform(0, 2000), rng.uniform(0, 2000)
+        if masks and i % 2:
+            bodies.append(Body(i, i % 3, x, y, mask=rng.choice(masks)))
+        else:
+            bodies.append(Body(i, i % 3, x, y, radius=rng.uniform(2, 40)))
+    return bodies
+
+
+def segments(count, seed, max_length):
+
+    rng = random.Random(seed)
+    for _ in range(count):
+        x0, y0 = rng.uniform(-100, 2100), rng.uniform(-100, 2100)
+        yield x0, y0, x0 + rng.uniform(-max_length, max_length), y0 + rng.uniform(-max_length, max_length)
+
+
+@pytest.mark.parametrize("max_length", [5, 60, 400])
+@pytest.mark.parametrize("cell_size", [16, 64, 256])
+def test_first_hit_matches_a_brute_force_check(max_length, cell_size):
+
+    bodies = scattered_bodies(300, cell_size, (ship_mask(30, 40), ship_mask(80, 24)))
+    broad_phase = BroadPhase(cell_size)
+    broad_phase.rebuild(bodies)
+
+    hits = 0
+    for i, segment in enumerate(segments(1000, max_length, max_length)):
+        group = i % 4 if i % 4 < 3 else None
+        body, t = broad_phase.first_hit(*segment, group=group)
+        expected = brute_force_hit(bodies, *segment, group=group)
+
+        assert t == expected
+        if body is not None:
+            hits += 1
+            assert body.group != group or group is None
+            assert body.segment_entry(*segment) == t
+
+    # The segments have to hit something for the comparison to mean anything
+    assert hits > 20
+
+
+def test_first_hit_misses():
+
+    broad_phase = BroadPhase()
+    assert broad_phase.first_hit(0, 0, 100, 100) == (None, None)
+
+    broad_phase.rebuild([Body("ship", 0, 50, 50, radius=10)])
+    assert broad_phase.first_hit(0, 100, 100, 100) == (None, None)
+    assert broad_phase.first_hit(0, 0, 100, 100, group=0) == (None, None)
+    assert broad_phase.first_hit(0, 0, 100, 100)[0].item == "ship"
@@ -0,0 +1,82 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from pyoneer3.graphics import Image, Scene, Screen, Sprite, UIElement
+import pygame
+
+
+pygame.init()
+pygame.display.set_mode((400, 300))
+
+BACKGROUND = (0, 0, 0)
+
+
+def full_redraw(scene):
+
+    # Draws the scene's tree onto a fresh surface without touching its dirty flags
+    surf = pygame.Surface(scene.surf.get_size())
+    surf.fill(BACKGROUND)
+    scene_surf, scene.surf = scene.surf, surf
+    scene.draw()
+    scene.surf = scene_surf
+    return surf
+
+
+def build(screen):
+
+    scene = Scene(screen, active=True)
+
+    frame = UIElement((0, 10.5, 0, 10.5), pygame.Surface((120, 80)))
+    frame.surf.fill((40, 40, 120))
+    frame.set_parent(scene)
+    frame.update()
+
+    block = UIElement((0, 5.3, 0, 7.6), pygame.Surface((20, 15)))
+    block.surf.fill((255, 0, 0))
+    block.set_parent(frame)
+    block.update()
+
+    image = Image((0, 150.2, 0, 60.9), "brick.png", size=(32, 32))
+    image.set_parent(scene)
+    image.update()
+
+    sprite = Sprite((0, 250.7, 0, 150.1), "fighter_sprite_turretless.png", size=(None, 40))
+    sprite.set_parent(scene)
+    sprite.update()
+
+    return scene, frame, block, image, sprite
+
+
+def run(retained):
+
+    UIElement.retained = retained
+    try:
+        screen = Screen(pygame.Surface((400, 300)), dirty_rects=True)
+        scene, frame, block, image, sprite = build(screen)
+
+        for i in range(60):
+            # Fractional steps, so positions keep landing between pixels
+            frame.offset((0, 1.7, 0, 0.9))
+            block.offset((0, 0.35, 0, -0.45))
+            image.offset((0, -1.3, 0, 0.7))
+            sprite.offset((0, -0.8, 0, -1.1))
+            sprite.rot += 7.3
+            if i % 10 == 0:
+                block.visible = not block.visible
+
+            screen.render(BACKGROUND)
+            expected = full_redraw(scene)
+            assert screen.screen.get_view("2").raw == expected.get_view("2").raw, "frame %d differs" % i
+
+    finally:
+        UIElement.retained = False
+
+
+def test_dirty_rects_match_full_redraw():
+
+    run(False)
+
+
+def test_dirty_rects_match_full_redraw_retained():
+
+    run(True)
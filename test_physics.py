@@ -0,0 +1,79 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from gameplay import GameObject, reset_world, step_world
+import physics
+
+
+def make_ship(team, position, rot, rot_vel=0):
+
+    ship = GameObject(
+        team,
+        GameObject.ACTIVE,
+        GameObject.FIGHTER,
+        target_types=[],
+        stats=(100, 1, (10, 60)),
+        sprite_path="fighter_sprite_turretless.png",
+        sprite_size=(None, 30),
+        turrets=[[(0.5, 0.5), "FIGHTER_GUN_MK1", False, 0, 60, True]],
+        thrusters=[[(0.5, 1), 0.05, False]]
+    )
+    ship.rel_pos = (0, position[0], 0, position[1])
+    ship.rot = rot
+    ship.rot_vel = rot_vel
+    return ship
+
+
+def headless(test):
+
+    def run(*args):
+        headless = GameObject.headless
+        GameObject.headless = True
+        try:
+            reset_world()
+            return test(*args)
+        finally:
+            physics.disable()
+            reset_world()
+            GameObject.headless = headless
+
+    return run
+
+
+@headless
+def wrapped_rotation(batched):
+
+    ship = make_ship(0, (100, 100), -179.5, -1)       # Alone, so it has no target to steer towards
+    if batched:
+        physics.enable()
+
+    step_world(1000/60)
+    if batched:
+        GameObject.physics_world.sync()
+    return ship.rot
+
+
+def test_rotation_wraps_below_minus_180():
+
+    assert wrapped_rotation(False) == 179.5
+    assert wrapped_rotation(True) == 179.5
+
+
+@headless
+def fight(batched, steps=600):
+
+    ships = [make_ship(0, (100, 100), 30), make_ship(1, (400, 250), -120), make_ship(0, (150, 300), 170),
+             make_ship(1, (350, 50), 80), make_ship(0, (50, 200), -60), make_ship(1, (300, 300), 5)]
+    if batched:
+        physics.enable()
+
+    for _ in range(steps):
+        step_world(1000/60)
+    if batched:
+        GameObject.physics_world.sync()
+    return [(ship.rel_pos, tuple(ship.vel), ship.rot, ship.health) for ship in ships]
+
+
+def test_backends_step_alike():
+
+    assert fight(False) == fight(True)
@@ -0,0 +1,121 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from gameplay import GameObject, reset_world
+from pyoneer3.graphics import Scene, Screen, UIElement
+from pyoneer3.pool import ElementPool, Pool
+import pygame
+import pytest
+
+
+pygame.init()
+pygame.display.set_mode((400, 300))
+
+
+def make_ship():
+
+    return GameObject(
+        0,
+        GameObject.ACTIVE,
+        GameObject.FIGHTER,
+        target_types=[],
+        stats=(100, 1, (10, 60)),
+        sprite_path="fighter_sprite_turretless.png",
+        sprite_size=(None, 30),
+        turrets=[[(0.5, 0.5), "FIGHTER_GUN_MK1", False, 0, 60, True]],
+        thrusters=[[(0.5, 1), 0.05, False]]
+    )
+
+
+def test_released_instances_are_reused():
+
+    acquired = []
+    released = []
+    pool = Pool(list, 2, acquire=lambda instance, value: acquired.append(value), release=released.append)
+
+    first, second = pool.acquire(1), pool.acquire(2)
+    third = pool.acquire(3)
+    assert (pool.hits, pool.misses, pool.in_use) == (2, 1, 3)
+    assert acquired == [1, 2, 3]
+
+    pool.release(second)
+    assert released[-1] is second
+    assert pool.acquire(4) is second
+    assert pool.stats() == {"hits": 3, "misses": 1, "hit_rate": 0.75, "in_use": 3, "free": 0}
+
+
+def test_elements_stay_parked_in_their_parent():
+
+    scene = Scene(Screen(pygame.Surface((400, 300))), active=True)
+    pool = ElementPool(UIElement, 3, scene, factory=lambda: UIElement((0, 0, 0, 0), pygame.Surface((10, 10))))
+    children = list(scene.children)
+    assert len(children) == 3
+    assert not any(element.visible for element in children)
+
+    element = pool.acquire(None)
+    assert element.visible and element.active
+    assert element.parent is scene
+
+    pool.release(element)
+    assert not element.visible and not element.active
+    assert scene.children == children
+
+
+def test_released_ships_respawn():
+
+    reset_world()
+    scene = Scene(Screen(pygame.Surface((400, 300))), active=True)
+    ships = ElementPool(GameObject, 0, scene, factory=make_ship, acquire=GameObject.respawn,
+                        release=GameObject.retire)
+
+    try:
+        ship = ships.acquire(None, 1, (100, 100))
+        assert ship in GameObject.GAME_OBJECTS
+
+        ships.release(ship)
+        assert ship not in GameObject.GAME_OBJECTS
+
+        assert ships.acquire(None, 0, (200, 100)) is ship
+        assert ship in GameObject.GAME_OBJECTS
+        assert ship.team == 0
+
+    finally:
+        ships.drain()
+        reset_world()
+
+
+def test_reserved_ships_are_retired():
+
+    reset_world()
+    scene = Scene(Screen(pygame.Surface((400, 300))), active=True)
+    ships = ElementPool(GameObject, 4, scene, factory=make_ship, acquire=GameObject.respawn,
+                        release=GameObject.retire)
+
+    try:
+        assert len(ships.free) == 4
+        assert not GameObject.GAME_OBJECTS
+        assert not GameObject.scheduler.pending
+
+        ship = ships.acquire(None, 1, (100, 100))
+        assert ship.alive() and ship.visible
+        assert GameObject.scheduler.pending
+
+        ships.release(ship)
+        assert not GameObject.GAME_OBJECTS
+        assert not GameObject.scheduler.pending
+
+    finally:
+        ships.drain()
+        reset_world()
+
+
+def test_release_twice():
+
+    pool = Pool(list, 2)
+    instance = pool.acquire()
+    pool.release(instance)
+
+    with pytest.raises(ValueError):
+        pool.release(instance)
+    assert pool.in_use == 0
+    assert len(pool.free) == 2
@@ -0,0 +1,146 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from gameplay import GameObject, UnitIndex, reset_world
+from pyoneer3.spatial import PointHash
+import math
+import pytest
+import random
+
+
+CORVETTE = GameObject.FIGHTER + 1      # A second unit type, for target_types filters
+
+
+def scattered(count, seed, spread=2000):
+
+    rng = random.Random(seed)
+    return [(i, rng.uniform(-spread, spread), rng.uniform(-spread, spread)) for i in range(count)]
+
+
+def filled(points, cell_size=128):
+
+    point_hash = PointHash(cell_size)
+    for item, x, y in points:
+        point_hash.insert(item, x, y)
+    return point_hash
+
+
+@pytest.mark.parametrize("count", [1, 10, 500])
+def test_nearest_matches_a_linear_scan(count):
+
+    points = scattered(count, count)
+    point_hash = filled(points)
+
+    for _, x, y in scattered(50, -count, spread=2500):
+        item, dist = point_hash.nearest(x, y)
+        expected = min(math.hypot(px - x, py - y) for _, px, py in points)
+        assert dist == pytest.approx(expected)
+        assert math.hypot(points[item][1] - x, points[item][2] - y) == pytest.approx(expected)
+
+
+def test_nearest_skips_items_it_does_not_accept():
+
+    points = scattered(200, 1)
+    point_hash = filled(points)
+
+    for _, x, y in scattered(20, 2):
+        item, dist = point_hash.nearest(x, y, accept=lambda i: i % 2 == 0)
+        expected = min(math.hypot(px - x, py - y) for i, px, py in points if i % 2 == 0)
+        assert item % 2 == 0
+        assert dist == pytest.approx(expected)
+
+
+def test_nearest_within_max_dist():
+
+    point_hash = filled([("a", 0, 0), ("b", 300, 0)])
+
+    assert point_hash.nearest(250, 0, max_dist=40) == (None, 40)
+    assert point_hash.nearest(250, 0, max_dist=60) == ("b", 50)
+    assert filled([]).nearest(0, 0) == (None, math.inf)
+
+
+@pytest.mark.parametrize("radius", [0, 50, 128, 700])
+def test_query_radius_matches_a_linear_scan(radius):
+
+    points = scattered(300, 3)
+    point_hash = filled(points)
+
+    for _, x, y in scattered(20, 4):
+        found = dict(point_hash.query_radius(x, y, radius))
+        expected = {i: math.hypot(px - x, py - y) for i, px, py in points if math.hypot(px - x, py - y) <= radius}
+        assert found == pytest.approx(expected)
+
+
+@pytest.fixture
+def world():
+
+    headless = GameObject.headless
+    GameObject.headless = True
+    reset_world()
+    yield
+    reset_world()
+    GameObject.headless = headless
+
+
+def make_unit(team, position, unit_type=GameObject.FIGHTER, target_types=()):
+
+    unit = GameObject(
+        team,
+        GameObject.ACTIVE,
+        unit_type,
+        target_types=list(target_types),
+        stats=(100, 1, (10, 60)),
+        sprite_path="fighter_sprite_turretless.png",
+        sprite_size=(None, 30)
+    )
+    unit.rel_pos = (0, position[0], 0, position[1])
+    return unit
+
+
+def test_unit_index_filters_by_team_and_target_types(world):
+
+    hunter = make_unit(0, (0, 0), target_types=[CORVETTE])
+    make_unit(0, (10, 0), unit_type=CORVETTE)                # Same team
+    make_unit(1, (20, 0))                                   # Not a target type
+    corvette = make_unit(1, (30, 0), unit_type=CORVETTE)
+    far_corvette = make_unit(1, (300, 0), unit_type=CORVETTE)
+
+    index = UnitIndex()
+    index.rebuild(GameObject.GAME_OBJECTS)
+
+    assert index.nearest_enemy(hunter) == (corvette, 30)
+    assert sorted(index.enemies_in_range(hunter, 300), key=lambda found: found[1]) == [(corvette, 30),
+                                                                                      (far_corvette, 300)]
+    assert index.enemies_in_range(hunter, 29) == []
+
+
+def test_unit_index_skips_units_destroyed_since_the_rebuild(world):
+
+    hunter = make_unit(0, (0, 0))
+    near = make_unit(1, (30, 0))
+    far = make_unit(1, (60, 0))
+
+    index = UnitIndex()
+    index.rebuild(GameObject.GAME_OBJECTS)
+    near.kill()
+
+    assert index.nearest_enemy(hunter) == (far, 60)
+    assert index.enemies_in_range(hunter, 100) == [(far, 60)]
+
+
+def by_enemy(found):
+
+    return id(found[0])
+
+
+def test_linear_range_query_matches_the_index(world):
+
+    rng = random.Random(5)
+    units = [make_unit(i % 2, (rng.uniform(0, 1000), rng.uniform(0, 1000))) for i in range(60)]
+
+    index = UnitIndex()
+    index.rebuild(GameObject.GAME_OBJECTS)
+
+    for unit in units:
+        assert sorted(unit.enemies_in_range(250), key=by_enemy) == sorted(index.enemies_in_range(unit, 250),
+                                                                          key=by_enemy)
@@ -0,0 +1,113 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from gameplay import GameObject, reset_world
+import math
+import pytest
+
+
+TICK = 1000/60
+
+
+@pytest.fixture
+def world():
+
+    headless = GameObject.headless
+    GameObject.headless = True
+    reset_world()
+    yield
+    reset_world()
+    GameObject.headless = headless
+
+
+def make_ship(team, position, rot=0, vel=(0, 0), turret_rot=0):
+
+    ship = GameObject(
+        team,
+        GameObject.ACTIVE,
+        GameObject.FIGHTER,
+        target_types=[],
+        stats=(100, 1, (10, 60)),
+        sprite_path="fighter_sprite_turretless.png",
+        sprite_size=(None, 30),
+        turrets=[[(0.5, 0.5), "FIGHTER_GUN_MK1", False, turret_rot, 60, True]],
+        thrusters=[[(0.5, 1), 0.05, False]]
+    )
+    ship.rel_pos = (0, position[0], 0, position[1])
+    ship.rot = rot
+    ship.vel = vel
+    return ship
+
+
+def steer(ship, target_offset):
+    """Runs one step of ship's controls against an enemy at target_offset from it"""
+
+    make_ship(1 - ship.team, (ship.rel_pos[1] + target_offset[0], ship.rel_pos[3] + target_offset[1]))
+    ship.update_ship_controls(TICK)
+
+
+# Ships at rot 0 point up (negative y), positive rotations turn them left (counterclockwise on screen)
+
+def test_heading_convention(world):
+
+    _, heading = make_ship(0, (0, 0), rot=0).calculate_ship_heading()
+    assert heading == pytest.approx((0, -1))
+
+    _, heading = make_ship(0, (0, 0), rot=45).calculate_ship_heading()
+    assert heading == pytest.approx((-math.sqrt(0.5), -math.sqrt(0.5)))
+
+
+@pytest.mark.parametrize("target_offset, turn", [
+    ((100, 0), -1),         # Right
+    ((-100, 0), 1),         # Left
+    ((100, 100), -1),       # Behind on the right
+    ((-100, 100), 1),       # Behind on the left
+    ((5, -100), -1),        # Slightly right, within 10 degrees
+    ((-5, -100), 1),        # Slightly left, within 10 degrees
+])
+def test_ships_turn_towards_their_target(world, target_offset, turn):
+
+    ship = make_ship(0, (200, 200))
+    steer(ship, target_offset)
+
+    assert ship.rot_vel * turn > 0
+
+
+@pytest.mark.parametrize("target_offset, turret_rot", [
+    ((100, -100), -45),     # Ahead on the right
+    ((-100, -100), 45),     # Ahead on the left
+])
+def test_turrets_aim_at_their_target(world, target_offset, turret_rot):
+
+    ship = make_ship(0, (200, 200))
+    steer(ship, target_offset)
+
+    turret = ship.turrets[0]
+    assert turret[0][3] == pytest.approx(turret_rot)
+    assert not turret[2]        # Only aimed after this step, turrets fire on the next one
+
+    ship.update_ship_controls(TICK)
+    assert turret[0][3] == pytest.approx(turret_rot)
+    assert turret[2]
+
+
+def test_turrets_turn_at_most_their_turn_rate(world):
+
+    ship = make_ship(0, (200, 200))
+    steer(ship, (0, 100))       # Straight behind, the turret turns 60 degrees per step
+
+    assert abs(ship.turrets[0][0][3]) == 60
+
+
+@pytest.mark.parametrize("vel, thrust", [
+    ((0, 0), True),             # At rest
+    ((0, 1), True),             # Pointed at the target but moving away from it
+    ((1, 0), True),             # Pointed at the target but drifting sideways
+    ((0, -1), False),           # Already flying at the target
+])
+def test_ships_thrust_towards_their_target(world, vel, thrust):
+
+    ship = make_ship(0, (200, 200), vel=vel)
+    steer(ship, (0, -100))
+
+    assert ship.thrusters[0][2] == thrust
@@ -0,0 +1,49 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from gameplay import GameObject, reset_world, step_world
+
+
+def make_ship(team, position, rot):
+
+    ship = GameObject(
+        team,
+        GameObject.ACTIVE,
+        GameObject.FIGHTER,
+        target_types=[],
+        stats=(100, 1, (10, 60)),
+        sprite_path="fighter_sprite_turretless.png",
+        sprite_size=(None, 30),
+        turrets=[[(0.5, 0.5), "FIGHTER_GUN_MK1", False, 0, 60, True]],
+        thrusters=[[(0.5, 1), 0.05, False]]
+    )
+    ship.rel_pos = (0, position[0], 0, position[1])
+    ship.rot = rot
+    return ship
+
+
+def fight(ships, steps=600):
+    """States of ships, spawned in the given order, after steps of step_world"""
+
+    headless = GameObject.headless
+    GameObject.headless = True
+    try:
+        reset_world()
+        spawned = [make_ship(*ship) for ship in ships]
+        for _ in range(steps):
+            step_world(1000/60)
+        return [(ship.rel_pos, ship.vel, ship.rot, ship.rot_vel) for ship in spawned]
+
+    finally:
+        reset_world()
+        GameObject.headless = headless
+
+
+def test_steps_do_not_depend_on_tick_order():
+
+    ships = [(0, (100, 100), 30), (1, (400, 250), -120), (0, (150, 300), 170), (1, (350, 50), 80)]
+
+    states = fight(ships)
+    reversed_states = fight(ships[::-1])
+
+    assert states == reversed_states[::-1]
@@ -0,0 +1,41 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from pyoneer3.graphics import Text
+import pygame
+
+
+pygame.init()
+pygame.display.set_mode((100, 100))
+
+FONT = pygame.font.Font(None, 20)
+
+
+def pixels(surf):
+
+    return pygame.image.tobytes(surf, "RGBA")
+
+
+def test_glyph_renders_leave_shared_renders_alone():
+
+    shared = Text((0, 0, 0, 0), (100, 30), "10", (0, 0, 0, 0), FONT, True, (255, 255, 255))
+    toggled = Text((0, 0, 0, 0), (100, 30), "10", (0, 0, 0, 0), FONT, True, (255, 255, 255))
+    assert toggled.text_surf is shared.text_surf
+    before = pixels(shared.text_surf)
+
+    # Same size text, so a shared surface would be drawn into as the target
+    toggled.glyphs = True
+    toggled.text = "11"
+    toggled.text = "01"
+
+    assert toggled.text_surf is not shared.text_surf
+    assert pixels(shared.text_surf) == before
+
+
+def test_glyph_renders_reuse_their_own_surface():
+
+    counter = Text((0, 0, 0, 0), (100, 30), "10", (0, 0, 0, 0), FONT, True, (255, 255, 255), glyphs=True)
+    text_surf = counter.text_surf
+
+    counter.text = "01"
+    assert counter.text_surf is text_surf
@@ -0,0 +1,102 @@
+from pyoneer3.timers import Scheduler
+import random
+
+
+def test_timers_fire_in_due_order():
+
+    scheduler = Scheduler()
+    fired = []
+    rng = random.Random(0)
+    delays = [rng.randrange(0, 1000) for _ in range(200)]
+    for i, delay in enumerate(delays):
+        scheduler.schedule(delay, lambda i=i: fired.append(i))
+
+    scheduler.advance(1000)
+
+    # Timers due at the same time fire in the order they were scheduled
+    assert fired == sorted(range(len(delays)), key=lambda i: (delays[i], i))
+    assert len(scheduler) == 0
+
+
+def test_timers_only_fire_once_due():
+
+    scheduler = Scheduler()
+    fired = []
+    for delay in (10, 20, 30):
+        scheduler.schedule(delay, lambda delay=delay: fired.append(delay))
+
+    assert scheduler.advance(9) == 0
+    assert scheduler.advance(11) == 2
+    assert fired == [10, 20]
+    assert scheduler.advance(10) == 1
+    assert fired == [10, 20, 30]
+
+
+def test_repeating_timers_fire_once_per_interval():
+
+    scheduler = Scheduler()
+    fired = []
+    handle = scheduler.schedule(10, lambda: fired.append(scheduler.time), interval=25)
+
+    for _ in range(10):
+        scheduler.advance(10)
+
+    # Due at 10, 35, 60 and 85, each seen by the advance that reaches it
+    assert fired == [10, 40, 60, 90]
+    assert handle.pending
+    assert handle.remaining == 10
+
+
+def test_cancelled_and_reset_timers():
+
+    scheduler = Scheduler()
+    fired = []
+    cancelled = scheduler.schedule(10, lambda: fired.append("cancelled"))
+    reset = scheduler.schedule(10, lambda: fired.append("reset"))
+    kept = scheduler.schedule(15, lambda: fired.append("kept"))
+
+    cancelled.cancel()
+    scheduler.advance(5)
+    reset.reset(20)
+
+    scheduler.advance(10)
+    assert fired == ["kept"]
+    assert not cancelled.pending and reset.pending
+
+    scheduler.advance(10)
+    assert fired == ["kept", "reset"]
+
+
+def test_callbacks_can_schedule_and_cancel_timers():
+
+    scheduler = Scheduler()
+    fired = []
+
+    def chain(i):
+        fired.append((scheduler.time, i))
+        if i < 3:
+            scheduler.schedule(0, lambda: chain(i + 1))
+
+    repeating = scheduler.schedule(10, lambda: repeating.cancel() if scheduler.time >= 30 else None, interval=10)
+    scheduler.schedule(20, lambda: chain(0))
+
+    scheduler.advance(100)
+    assert fired == [(100, 0), (100, 1), (100, 2), (100, 3)]
+    assert not repeating.pending
+    assert len(scheduler) == 0
+
+
+def test_order_survives_compaction():
+
+    scheduler = Scheduler()
+    fired = []
+    handles = [scheduler.schedule(100 + i, lambda i=i: fired.append(i)) for i in range(50)]
+
+    # Resetting every timer many times leaves enough stale entries behind to compact the heap
+    for _ in range(5):
+        for handle in handles[::-1]:
+            handle.reset()
+
+    assert len(scheduler.heap) < 5 * len(handles)
+    scheduler.advance(200)
+    assert fired == list(range(50))
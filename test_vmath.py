@@ -0,0 +1,50 @@
+from pyoneer3 import vmath
+import math
+import pytest
+
+
+@pytest.mark.parametrize("operation, expected", [
+    (vmath.add, [4, 6]),
+    (vmath.sub, [-2, -2]),
+    (vmath.mult, [3, 8]),
+])
+def test_results_are_lists(operation, expected):
+
+    result = operation((1, 2), [3, 4])
+    assert result == expected and type(result) is list
+
+    result[0] += 1      # Callers may update results in place
+    assert result[0] == expected[0] + 1
+
+
+def test_3d_vectors():
+
+    assert vmath.add([1, 2, 3], [4, 5, 6]) == [5, 7, 9]
+    assert vmath.sub([1, 2, 3], [4, 5, 6]) == [-3, -3, -3]
+    assert vmath.dot([1, 2, 3], [4, 5, 6]) == 32
+    assert vmath.normalize([2, 3, 6]) == pytest.approx([2 / 7, 3 / 7, 6 / 7])
+
+
+def test_unequal_lengths():
+
+    with pytest.raises(AssertionError):
+        vmath.add([1, 2], [1, 2, 3])
+    with pytest.raises(AssertionError):
+        vmath.dot([1, 2, 3], [1, 2])
+
+
+def test_normalize():
+
+    assert vmath.normalize((3, 4)) == [0.6, 0.8]
+    assert vmath.magnitude((3, 4)) == 5
+
+
+def test_angle_between():
+
+    dist, projection, angle = vmath.angle_between((0, -1), (100, 0))
+    assert (dist, projection) == (100, 0)
+    assert angle == pytest.approx(90)
+
+    # Rounding can push the cosine past 1
+    assert vmath.angle_between((0.6, 0.8), (3 * 1e-8, 4 * 1e-8))[2] == pytest.approx(0, abs=1e-6)
+    assert not math.isnan(vmath.angle_between((1, 0), (-1, 0))[2])